@@ -1,58 +1,42 @@
+import click
 from flask import Flask
 from flask_cors import CORS
-from flasgger import Swagger
 
 from config import Config
-from app.extensions import db, migrate
+from app.extensions import init_migrate
+from app.utils.compression import init_compression
+from app.utils.database import init_database
 from app.utils.errors import register_error_handlers
+from app.utils.json_provider import init_json
 from app.utils.logging import init_logging, register_access_logging
-
-SWAGGER_CONFIG = {
-    "headers": [],
-    "specs": [
-        {
-            "endpoint": "openapi",
-            "route": "/api/openapi.json",
-        }
-    ],
-    "static_url_path": "/flasgger_static",
-    "swagger_ui": True,
-    "specs_route": "/api/docs",
-}
-
-SWAGGER_TEMPLATE = {
-    "openapi": "3.0.3",
-    "info": {
-        "title": "RPG Platform API",
-        "version": "1.0.0",
-        "description": "Tabletop RPG campaign management API",
-    },
-    "servers": [{"url": "/"}],
-    "components": {
-        "securitySchemes": {
-            "bearerAuth": {
-                "type": "http",
-                "scheme": "bearer",
-                "bearerFormat": "JWT",
-            }
-        }
-    },
-}
+from app.utils.metrics import init_metrics
+from app.utils.openapi import init_openapi
+from app.utils.query_stats import init_query_stats
+from app.utils.response_cache import init_response_cache
 
 
 def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
+    init_json(app)
 
     # Logging
-    init_logging()
+    init_logging(sse=app.config["LOG_VIEWER"])
+    init_metrics(app)
+    init_query_stats(app)
     register_access_logging(app)
 
+    # Response compression — registered after access logging so it runs
+    # first (after_request hooks run in reverse) and is included in timings
+    init_compression(app)
+    init_response_cache(app)
+
     # Extensions
-    db.init_app(app)
-    migrate.init_app(app, db)
+    init_database(app)
+    if click.get_current_context(silent=True) is not None:
+        # Built by `flask …` (or another click CLI); web workers skip alembic
+        init_migrate(app)
     CORS(app)
-    Swagger(app, config=SWAGGER_CONFIG, template=SWAGGER_TEMPLATE)
 
     # Error handlers
     register_error_handlers(app)
@@ -79,8 +63,15 @@ def create_app(config_class=Config):
     from app.api.overlays import overlays_bp
     app.register_blueprint(overlays_bp)
 
-    from app.api.logs import logs_bp
-    app.register_blueprint(logs_bp)
+    if app.config["LOG_VIEWER"]:
+        from app.api.logs import logs_bp
+        app.register_blueprint(logs_bp)
+
+    from app.api.metrics import metrics_bp
+    app.register_blueprint(metrics_bp)
+
+    # OpenAPI spec (prebuilt by `flask build-openapi`) and optional docs UI
+    init_openapi(app)
 
     # CLI commands
     from app.seed.commands import register_commands
@@ -128,6 +128,40 @@ def get_campaign(campaign_id: str) -> tuple[Response, int] | Response:
     return jsonify({"campaign": campaign})
 
 
+@campaigns_bp.route("/api/campaigns/<campaign_id>/dashboard")
+@jwt_required
+def get_dashboard(campaign_id: str) -> tuple[Response, int] | Response:
+    """
+    Get a campaign with its characters, overlay counts and ruleset in one call.
+
+    Uses a fixed number of queries regardless of party size. Characters are
+    summaries (see /api/characters/summaries); next_cursor pages past 100.
+    ---
+    tags:
+      - Campaigns
+    security:
+      - bearerAuth: []
+    parameters:
+      - name: campaign_id
+        in: path
+        required: true
+        schema:
+          type: string
+          format: uuid
+    responses:
+      200:
+        description: Campaign, ruleset metadata, character summaries and overlay counts
+      401:
+        description: Not authenticated
+      404:
+        description: Campaign not found
+    """
+    dashboard = campaign_service.get_dashboard(campaign_id, request.current_user.id)
+    if dashboard is None:
+        return jsonify({"error": "Campaign not found"}), 404
+    return jsonify(dashboard)
+
+
 @campaigns_bp.route("/api/campaigns/<campaign_id>", methods=["PUT"])
 @jwt_required
 def update_campaign(campaign_id: str) -> tuple[Response, int] | Response:
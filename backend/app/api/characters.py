@@ -1,11 +1,58 @@
 from flask import Blueprint, Response, request, jsonify
 
-from app.services import character_service
+from app.services import character_service, stats_service
 from app.utils.auth import jwt_required
 
 characters_bp = Blueprint("characters", __name__)
 
 
+def _if_match_version() -> int | None:
+    """Version named by the If-Match header.
+
+    Returns None when the header is absent or ``*``. A header that names no
+    version ETag yields 0, which never matches a stored version. Weak tags
+    count: compressed responses carry the version as a weak ETag.
+    """
+    if_match = request.if_match
+    tags = if_match.as_set(include_weak=True)
+    if if_match.star_tag or not tags:
+        return None
+    for tag in tags:
+        if tag.isdigit():
+            return int(tag)
+    return 0
+
+
+def _conflict(e: character_service.VersionConflictError,
+              expected: int | None) -> tuple[Response, int]:
+    """412 when the client's If-Match was stale, 409 for a lost race without one."""
+    response = jsonify({
+        "error": "Version conflict",
+        "detail": str(e),
+        "version": e.current_version,
+    })
+    response.set_etag(str(e.current_version))
+    return response, 412 if expected is not None else 409
+
+
+def _with_etag(response: Response, version: int) -> Response:
+    response.set_etag(str(version))
+    return response
+
+
+def _hydrate_requested() -> bool:
+    return request.args.get("hydrate", "").lower() == "true"
+
+
+def _with_entities(body: dict, characters: list[dict]) -> dict:
+    """Add side-loaded entities to a response body when ?hydrate=true."""
+    if _hydrate_requested():
+        body["entities"] = character_service.hydrate_characters(
+            characters, request.current_user.id
+        )
+    return body
+
+
 @characters_bp.route("/api/characters")
 @jwt_required
 def list_all_characters() -> Response:
@@ -17,6 +64,14 @@ def list_all_characters() -> Response:
       - Characters
     security:
       - bearerAuth: []
+    parameters:
+      - name: hydrate
+        in: query
+        required: false
+        schema:
+          type: boolean
+          default: false
+        description: Side-load the items and spells referenced by equipment and spells
     responses:
       200:
         description: List of user's characters with campaign names
@@ -24,7 +79,88 @@ def list_all_characters() -> Response:
         description: Not authenticated
     """
     characters = character_service.list_all_characters(request.current_user.id)
-    return jsonify({"characters": characters})
+    return jsonify(_with_entities({"characters": characters}, characters))
+
+
+@characters_bp.route("/api/characters/summaries")
+@jwt_required
+def list_character_summaries() -> tuple[Response, int] | Response:
+    """
+    List lightweight character summaries, cursor-paginated.
+
+    Returns names, levels, campaign and a few core stats without the
+    character's JSON blobs. Pass next_cursor back as cursor for the next
+    page.
+    ---
+    tags:
+      - Characters
+    security:
+      - bearerAuth: []
+    parameters:
+      - name: campaign_id
+        in: query
+        required: false
+        schema:
+          type: string
+          format: uuid
+      - name: sort
+        in: query
+        required: false
+        schema:
+          type: string
+          enum: [name, level, updated_at, campaign]
+          default: name
+      - name: order
+        in: query
+        required: false
+        schema:
+          type: string
+          enum: [asc, desc]
+          default: asc
+      - name: limit
+        in: query
+        required: false
+        schema:
+          type: integer
+          default: 50
+          maximum: 100
+      - name: cursor
+        in: query
+        required: false
+        schema:
+          type: string
+    responses:
+      200:
+        description: One page of character summaries
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                characters:
+                  type: array
+                  items:
+                    type: object
+                next_cursor:
+                  type: string
+                  nullable: true
+      400:
+        description: Invalid sort, order or cursor
+      401:
+        description: Not authenticated
+    """
+    try:
+        result = character_service.list_character_summaries(
+            request.current_user.id,
+            campaign_id=request.args.get("campaign_id"),
+            sort=request.args.get("sort", "name"),
+            order=request.args.get("order", "asc"),
+            limit=request.args.get("limit", 50, type=int),
+            cursor=request.args.get("cursor"),
+        )
+    except ValueError as e:
+        return jsonify({"error": "Invalid query", "detail": str(e)}), 400
+    return jsonify(result)
 
 
 @characters_bp.route("/api/campaigns/<campaign_id>/characters")
@@ -45,6 +181,13 @@ def list_characters(campaign_id: str) -> tuple[Response, int] | Response:
         schema:
           type: string
           format: uuid
+      - name: hydrate
+        in: query
+        required: false
+        schema:
+          type: boolean
+          default: false
+        description: Side-load the items and spells referenced by equipment and spells
     responses:
       200:
         description: List of characters
@@ -60,7 +203,53 @@ def list_characters(campaign_id: str) -> tuple[Response, int] | Response:
     except LookupError as e:
         return jsonify({"error": str(e)}), 404
 
-    return jsonify({"characters": characters})
+    return jsonify(_with_entities({"characters": characters}, characters))
+
+
+@characters_bp.route("/api/campaigns/<campaign_id>/party")
+@jwt_required
+def get_party(campaign_id: str) -> tuple[Response, int] | Response:
+    """
+    Get derived stats for every character in a campaign.
+
+    Sorted by initiative, highest first. Served from the per-character
+    stats cache; only stale characters are recomputed.
+    ---
+    tags:
+      - Characters
+    security:
+      - bearerAuth: []
+    parameters:
+      - name: campaign_id
+        in: path
+        required: true
+        schema:
+          type: string
+          format: uuid
+      - name: refresh
+        in: query
+        required: false
+        schema:
+          type: boolean
+          default: false
+        description: Recompute every character, even if cached
+    responses:
+      200:
+        description: Party members with HP and derived stats
+      401:
+        description: Not authenticated
+      404:
+        description: Campaign not found
+    """
+    try:
+        party = stats_service.get_party_stats(
+            campaign_id,
+            request.current_user.id,
+            refresh=request.args.get("refresh", "").lower() == "true",
+        )
+    except LookupError as e:
+        return jsonify({"error": str(e)}), 404
+    return jsonify({"party": party})
 
 
 @characters_bp.route("/api/campaigns/<campaign_id>/characters", methods=["POST"])
@@ -98,6 +287,8 @@ def create_character(campaign_id: str) -> tuple[Response, int] | Response:
                 default: pc
               level:
                 type: integer
+                minimum: 1
+                maximum: 20
                 default: 1
               core_data:
                 type: object
@@ -134,7 +325,7 @@ def create_character(campaign_id: str) -> tuple[Response, int] | Response:
     except LookupError as e:
         return jsonify({"error": str(e)}), 404
     except ValueError as e:
-        return jsonify({"error": "Missing required fields", "detail": str(e)}), 400
+        return jsonify({"error": "Invalid character", "detail": str(e)}), 400
 
     return jsonify({"character": character}), 201
 
@@ -157,20 +348,96 @@ def get_character(character_id: str) -> tuple[Response, int] | Response:
         schema:
           type: string
           format: uuid
+      - name: If-None-Match
+        in: header
+        required: false
+        schema:
+          type: string
+        description: ETag from a previous response; 304 if unchanged
+      - name: hydrate
+        in: query
+        required: false
+        schema:
+          type: boolean
+          default: false
+        description: Side-load the items and spells referenced by equipment and spells
     responses:
       200:
-        description: Character details
+        description: Character details (ETag header carries the version)
+      304:
+        description: Not modified since the given ETag
       401:
         description: Not authenticated
       404:
         description: Character not found
     """
+    hydrate = _hydrate_requested()
+    # Hydrated entities can change without a version bump, so only plain
+    # reads are conditional
+    if request.if_none_match and not hydrate:
+        version = character_service.get_character_version(
+            character_id, request.current_user.id
+        )
+        if version is None:
+            return jsonify({"error": "Character not found"}), 404
+        if request.if_none_match.contains_weak(str(version)):
+            return _with_etag(Response(status=304), version)
+
     character = character_service.get_character(
         character_id, request.current_user.id
     )
     if character is None:
         return jsonify({"error": "Character not found"}), 404
-    return jsonify({"character": character})
+    if hydrate:
+        return jsonify(_with_entities({"character": character}, [character]))
+    return _with_etag(jsonify({"character": character}), character["version"])
+
+
+@characters_bp.route("/api/characters/<character_id>/stats")
+@jwt_required
+def get_character_stats(character_id: str) -> tuple[Response, int] | Response:
+    """
+    Get a character's derived stats.
+
+    Ability modifiers, proficiency bonus, saving throws, AC, initiative,
+    speed, hit dice, spellcasting and slot tables, computed from the
+    character and its referenced class, species and items. Cached per
+    character version.
+    ---
+    tags:
+      - Characters
+    security:
+      - bearerAuth: []
+    parameters:
+      - name: character_id
+        in: path
+        required: true
+        schema:
+          type: string
+          format: uuid
+      - name: refresh
+        in: query
+        required: false
+        schema:
+          type: boolean
+          default: false
+        description: Recompute even if cached
+    responses:
+      200:
+        description: Derived stats with the version they describe
+      401:
+        description: Not authenticated
+      404:
+        description: Character not found
+    """
+    result = stats_service.get_character_stats(
+        character_id,
+        request.current_user.id,
+        refresh=request.args.get("refresh", "").lower() == "true",
+    )
+    if result is None:
+        return jsonify({"error": "Character not found"}), 404
+    return jsonify(result)
 
 
 @characters_bp.route("/api/characters/<character_id>", methods=["PUT"])
@@ -191,6 +458,12 @@ def update_character(character_id: str) -> tuple[Response, int] | Response:
         schema:
           type: string
           format: uuid
+      - name: If-Match
+        in: header
+        required: false
+        schema:
+          type: string
+        description: ETag the write is based on; rejected with 412 if stale
     requestBody:
       required: true
       content:
@@ -205,6 +478,8 @@ def update_character(character_id: str) -> tuple[Response, int] | Response:
                 enum: [pc, npc]
               level:
                 type: integer
+                minimum: 1
+                maximum: 20
               core_data:
                 type: object
               class_data:
@@ -222,21 +497,102 @@ def update_character(character_id: str) -> tuple[Response, int] | Response:
         description: Not authenticated
       404:
         description: Character not found
+      409:
+        description: Lost a race with a concurrent write
+      412:
+        description: If-Match version is stale
     """
     data = request.get_json()
     if not data:
         return jsonify({"error": "Request body required"}), 400
 
+    expected = _if_match_version()
     try:
         character = character_service.update_character(
-            character_id, request.current_user.id, data
+            character_id, request.current_user.id, data, expected
         )
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
+    except character_service.VersionConflictError as e:
+        return _conflict(e, expected)
 
     if character is None:
         return jsonify({"error": "Character not found"}), 404
-    return jsonify({"character": character})
+    return _with_etag(jsonify({"character": character}), character["version"])
+
+
+@characters_bp.route("/api/characters/<character_id>", methods=["PATCH"])
+@jwt_required
+def patch_character(character_id: str) -> tuple[Response, int] | Response:
+    """
+    Partially update a character with a JSON Merge Patch (RFC 7396).
+
+    Objects merge recursively, null removes a key, and arrays or scalars
+    replace the stored value. Only the blobs the patch touches are
+    rewritten; the response echoes the effective change, not the full
+    character.
+    ---
+    tags:
+      - Characters
+    security:
+      - bearerAuth: []
+    parameters:
+      - name: character_id
+        in: path
+        required: true
+        schema:
+          type: string
+          format: uuid
+      - name: If-Match
+        in: header
+        required: false
+        schema:
+          type: string
+        description: ETag the write is based on; rejected with 412 if stale
+    requestBody:
+      required: true
+      content:
+        application/merge-patch+json:
+          schema:
+            type: object
+            example:
+              core_data:
+                hp_current: 7
+                conditions: null
+        application/json:
+          schema:
+            type: object
+    responses:
+      200:
+        description: Patch applied; changed holds the effective merge patch
+      400:
+        description: Invalid patch
+      401:
+        description: Not authenticated
+      404:
+        description: Character not found
+      409:
+        description: Lost a race with a concurrent write
+      412:
+        description: If-Match version is stale
+    """
+    patch = request.get_json(silent=True)
+    if not isinstance(patch, dict) or not patch:
+        return jsonify({"error": "Merge patch object required"}), 400
+
+    expected = _if_match_version()
+    try:
+        result = character_service.patch_character(
+            character_id, request.current_user.id, patch, expected
+        )
+    except ValueError as e:
+        return jsonify({"error": "Invalid patch", "detail": str(e)}), 400
+    except character_service.VersionConflictError as e:
+        return _conflict(e, expected)
+
+    if result is None:
+        return jsonify({"error": "Character not found"}), 404
+    return _with_etag(jsonify(result), result["version"])
 
 
 @characters_bp.route("/api/characters/<character_id>", methods=["DELETE"])
@@ -257,6 +613,12 @@ def delete_character(character_id: str) -> tuple[Response, int]:
         schema:
           type: string
           format: uuid
+      - name: If-Match
+        in: header
+        required: false
+        schema:
+          type: string
+        description: ETag the write is based on; rejected with 412 if stale
     responses:
       204:
         description: Character deleted
@@ -264,10 +626,16 @@ def delete_character(character_id: str) -> tuple[Response, int]:
         description: Not authenticated
       404:
         description: Character not found
+      412:
+        description: If-Match version is stale
     """
-    deleted = character_service.delete_character(
-        character_id, request.current_user.id
-    )
+    expected = _if_match_version()
+    try:
+        deleted = character_service.delete_character(
+            character_id, request.current_user.id, expected
+        )
+    except character_service.VersionConflictError as e:
+        return _conflict(e, expected)
     if not deleted:
         return jsonify({"error": "Character not found"}), 404
     return jsonify(''), 204
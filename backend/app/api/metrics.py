@@ -0,0 +1,43 @@
+"""Prometheus metrics endpoint for per-route request latency."""
+
+from flask import Blueprint, Response
+
+from app.utils import logging as app_logging
+from app.utils.auth import jwt_required
+from app.utils.metrics import render_prometheus
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+@metrics_bp.route("/api/metrics")
+@jwt_required
+def metrics() -> Response:
+    """
+    Export request metrics in Prometheus text format.
+
+    Per-route latency histograms, estimated p50/p95/p99 latency and
+    status-code counters, merged across all workers when METRICS_DIR is set.
+
+    ---
+    tags:
+      - Metrics
+    security:
+      - bearerAuth: []
+    responses:
+      200:
+        description: Prometheus text exposition (version 0.0.4)
+        content:
+          text/plain:
+            schema:
+              type: string
+      401:
+        description: Not authenticated
+    """
+    handler = app_logging.queue_handler
+    body = render_prometheus({
+        "rpg_log_records_dropped_total": (
+            "Log records dropped by this worker because the log queue was full.",
+            handler.dropped if handler else 0,
+        ),
+    })
+    return Response(body, mimetype="text/plain; version=0.0.4")
@@ -1,4 +1,4 @@
-from flask import Blueprint, Response, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 
 from app.services import overlay_service
 from app.utils.auth import jwt_required
@@ -80,7 +80,10 @@ def create_overlay() -> tuple[Response, int] | Response:
                 enum: [modify, homebrew, disable]
               overlay_data:
                 type: object
-                description: Data to merge over base entity
+                description: >
+                  Data to deep-merge over the base entity. {"$delete": true}
+                  removes a key, {"$append": [...]} extends a list, and
+                  {"$merge": [...], "$key": "name"} merges list items by key.
               campaign_id:
                 type: string
                 format: uuid
@@ -94,6 +97,8 @@ def create_overlay() -> tuple[Response, int] | Response:
         description: Not authenticated
       404:
         description: Ruleset not found
+      409:
+        description: The entity already has an overlay in this scope
     """
     data = request.get_json()
     if not data:
@@ -102,9 +107,11 @@ def create_overlay() -> tuple[Response, int] | Response:
     try:
         overlay = overlay_service.create_overlay(request.current_user.id, data)
     except ValueError as e:
-        return jsonify({"error": "Missing required fields", "detail": str(e)}), 400
+        return jsonify({"error": "Invalid overlay", "detail": str(e)}), 400
     except LookupError as e:
         return jsonify({"error": str(e)}), 404
+    except overlay_service.OverlayConflictError as e:
+        return jsonify({"error": "Conflict", "detail": str(e)}), 409
 
     return jsonify({"overlay": overlay}), 201
 
@@ -195,3 +202,204 @@ def delete_overlay(overlay_id: str) -> tuple[Response, int]:
     if not deleted:
         return jsonify({"error": "Overlay not found"}), 404
     return jsonify(''), 204
+
+
+def _bulk_write(upserts: list, deletes: list | None) -> tuple[Response, int] | Response:
+    try:
+        result = overlay_service.bulk_write_overlays(
+            request.current_user.id, upserts, deletes
+        )
+    except ValueError as e:
+        return jsonify({"error": "Invalid batch", "detail": str(e)}), 400
+    except LookupError as e:
+        return jsonify({"error": str(e)}), 404
+    except overlay_service.OverlayConflictError as e:
+        return jsonify({"error": "Conflict", "detail": str(e)}), 409
+    return jsonify(result)
+
+
+@overlays_bp.route("/api/overlays/batch", methods=["POST"])
+@jwt_required
+def batch_overlays() -> tuple[Response, int] | Response:
+    """
+    Upsert and delete many overlays in one transaction.
+
+    Upserts match existing overlays on (ruleset_id, entity_type, source_key,
+    campaign_id). All items are validated first; any error rejects the whole
+    batch and nothing is written.
+
+    ---
+    tags:
+      - Overlays
+    security:
+      - bearerAuth: []
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema:
+            type: object
+            properties:
+              upsert:
+                type: array
+                items:
+                  type: object
+                  required: [ruleset_id, entity_type, source_key, overlay_type]
+                  properties:
+                    ruleset_id:
+                      type: string
+                      format: uuid
+                    entity_type:
+                      type: string
+                    source_key:
+                      type: string
+                    overlay_type:
+                      type: string
+                      enum: [modify, homebrew, disable]
+                    overlay_data:
+                      type: object
+                    campaign_id:
+                      type: string
+                      format: uuid
+              delete:
+                type: array
+                items:
+                  type: string
+                  format: uuid
+                description: Overlay ids to delete (unknown ids are ignored)
+    responses:
+      200:
+        description: Created, updated and deleted counts plus the upserted overlays
+      400:
+        description: Validation error (detail names the failing item)
+      401:
+        description: Not authenticated
+      404:
+        description: Ruleset or campaign not found
+      409:
+        description: A concurrent request created one of the overlays; retry
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not (data.get("upsert") or data.get("delete")):
+        return jsonify({"error": "upsert or delete required"}), 400
+    return _bulk_write(data.get("upsert") or [], data.get("delete"))
+
+
+@overlays_bp.route("/api/overlays/import", methods=["POST"])
+@jwt_required
+def import_overlays() -> tuple[Response, int] | Response:
+    """
+    Import an overlay export, upserting every overlay in one transaction.
+
+    Accepts the document produced by GET /api/overlays/export, so homebrew
+    can be shared between users. A top-level campaign_id (or null) rescopes
+    every imported overlay, since the exporter's campaign ids are not the
+    importer's. If that would give two overlays the same entity and scope
+    (a global and a campaign overlay for one entity), the import is
+    rejected with every colliding pair named.
+
+    ---
+    tags:
+      - Overlays
+    security:
+      - bearerAuth: []
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema:
+            type: object
+            required: [overlays]
+            properties:
+              overlays:
+                type: array
+                items:
+                  type: object
+              campaign_id:
+                type: string
+                format: uuid
+                nullable: true
+                description: Scope for all imported overlays (null for global)
+    responses:
+      200:
+        description: Created and updated counts plus the imported overlays
+      400:
+        description: Validation error or colliding overlays after rescoping
+      401:
+        description: Not authenticated
+      404:
+        description: Ruleset or campaign not found
+      409:
+        description: A concurrent request created one of the overlays; retry
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get("overlays"), list):
+        return jsonify({"error": "overlays array required"}), 400
+
+    overlays = data["overlays"]
+    if "campaign_id" in data:
+        try:
+            overlays = overlay_service.rescope_overlays(overlays, data["campaign_id"])
+        except ValueError as e:
+            return jsonify({"error": "Invalid import", "detail": str(e)}), 400
+    return _bulk_write(overlays, None)
+
+
+@overlays_bp.route("/api/overlays/export")
+@jwt_required
+def export_overlays() -> Response:
+    """
+    Stream the current user's overlays as an importable JSON document.
+
+    Rows are read and written in batches, so large homebrew collections
+    do not have to fit in memory. Overlays carry no ids or owner, so the
+    exporter can post the document to /api/overlays/import as-is.
+    Campaign-scoped overlays keep the exporter's campaign_id; another user
+    importing them must send a top-level campaign_id (or null) to rescope
+    them, or the import fails with 404 Campaign not found.
+
+    ---
+    tags:
+      - Overlays
+    security:
+      - bearerAuth: []
+    parameters:
+      - name: ruleset_id
+        in: query
+        schema:
+          type: string
+          format: uuid
+      - name: campaign_id
+        in: query
+        schema:
+          type: string
+          format: uuid
+      - name: entity_type
+        in: query
+        schema:
+          type: string
+    responses:
+      200:
+        description: 'Export document ({"overlays": [...]})'
+      401:
+        description: Not authenticated
+    """
+    overlays = overlay_service.export_overlays(
+        user_id=request.current_user.id,
+        ruleset_id=request.args.get("ruleset_id"),
+        campaign_id=request.args.get("campaign_id"),
+        entity_type=request.args.get("entity_type"),
+    )
+    dumps = current_app.json.dumps
+
+    def generate():
+        yield '{"overlays": ['
+        for i, overlay in enumerate(overlays):
+            yield ("," if i else "") + dumps(overlay)
+        yield "]}"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="application/json",
+        headers={"Content-Disposition": 'attachment; filename="overlays.json"'},
+    )
@@ -1,7 +1,11 @@
+import json
+
 from flask import Blueprint, Response, request, jsonify
 
 from app.services import ruleset_service
 from app.utils.auth import jwt_required
+from app.utils.json_provider import raw_dumps, raw_jsonify
+from app.utils.response_cache import versioned_response
 
 rulesets_bp = Blueprint("rulesets", __name__)
 
@@ -127,6 +131,23 @@ def list_entities(ruleset_id: str) -> tuple[Response, int] | Response:
           type: integer
           default: 50
           maximum: 100
+      - name: campaign_id
+        in: query
+        schema:
+          type: string
+          format: uuid
+        description: >
+          List the campaign's view: hide entities disabled by overlays and
+          include homebrew-only entries (flagged homebrew: true) unless a
+          specific source is requested
+      - name: match
+        in: query
+        schema:
+          type: string
+        description: >
+          JSON object the entity data must contain, e.g.
+          {"level": 3, "school": {"name": "Evocation"}}. Nested objects
+          match recursively; arrays are not supported
     responses:
       200:
         description: Paginated entity list
@@ -147,10 +168,12 @@ def list_entities(ruleset_id: str) -> tuple[Response, int] | Response:
                   type: integer
                 per_page:
                   type: integer
+      400:
+        description: Invalid match filter
       401:
         description: Not authenticated
       404:
-        description: Ruleset not found
+        description: Ruleset or campaign not found
     """
     entity_type = request.args.get("type", "")
     search = request.args.get("search", "")
@@ -158,14 +181,23 @@ def list_entities(ruleset_id: str) -> tuple[Response, int] | Response:
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 50, type=int)
 
-    result = ruleset_service.list_entities(
-        ruleset_id,
-        entity_type=entity_type,
-        search=search,
-        source=source,
-        page=page,
-        per_page=per_page,
-    )
+    try:
+        match = json.loads(request.args["match"]) if "match" in request.args else None
+        result = ruleset_service.list_entities(
+            ruleset_id,
+            entity_type=entity_type,
+            search=search,
+            source=source,
+            page=page,
+            per_page=per_page,
+            user_id=request.current_user.id,
+            campaign_id=request.args.get("campaign_id"),
+            match=match,
+        )
+    except ValueError as e:
+        return jsonify({"error": f"Invalid match filter: {e}"}), 400
+    except LookupError as e:
+        return jsonify({"error": str(e)}), 404
     if result is None:
         return jsonify({"error": "Ruleset not found"}), 404
     return jsonify(result)
@@ -209,7 +241,12 @@ def get_entity(ruleset_id: str, entity_id: str) -> tuple[Response, int] | Respon
         description: Campaign scope for overlay resolution
     responses:
       200:
-        description: Entity details with optional overlay data
+        description: >
+          Entity details with optional overlay data. Base (non-effective)
+          reads carry a weak ETag and are served pre-compressed when the
+          client accepts gzip, br or zstd.
+      304:
+        description: Not modified (If-None-Match matched the ETag)
       401:
         description: Not authenticated
       404:
@@ -218,16 +255,29 @@ def get_entity(ruleset_id: str, entity_id: str) -> tuple[Response, int] | Respon
     effective = request.args.get("effective", "").lower() == "true"
     campaign_id = request.args.get("campaign_id")
 
+    if not effective:
+        # Base entities only change on reseed: serve a pre-compressed body,
+        # loading and rendering the entity only on a cache miss
+        version = ruleset_service.get_entity_version(ruleset_id, entity_id)
+        if version is None:
+            return jsonify({"error": "Entity not found"}), 404
+
+        def render() -> bytes:
+            entity = ruleset_service.get_entity(ruleset_id, entity_id, raw_data=True)
+            return raw_dumps({"entity": entity}).encode()
+
+        return versioned_response("entity", entity_id, version, render)
+
     entity = ruleset_service.get_entity(
         ruleset_id,
         entity_id,
-        user_id=request.current_user.id if effective else None,
+        user_id=request.current_user.id,
         campaign_id=campaign_id,
-        effective=effective,
+        effective=True,
     )
     if entity is None:
         return jsonify({"error": "Entity not found"}), 404
-    return jsonify({"entity": entity})
+    return raw_jsonify({"entity": entity})
 
 
 @rulesets_bp.route("/api/rulesets/<ruleset_id>/sources")
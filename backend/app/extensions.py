@@ -1,5 +1,17 @@
+from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 
-db = SQLAlchemy()
-migrate = Migrate()
+from app.utils.database import RoutingSession
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+
+
+def init_migrate(app: Flask) -> None:
+    """Register Flask-Migrate and its ``flask db`` commands.
+
+    Flask-Migrate imports alembic and mako (about a fifth of a second), so
+    create_app() only calls this when the app is built for a CLI command.
+    """
+    from flask_migrate import Migrate
+
+    Migrate(app, db)
@@ -2,6 +2,9 @@ from app.models.user import User
 from app.models.ruleset import Ruleset, RulesetEntity
 from app.models.campaign import Campaign
 from app.models.character import Character
-from app.models.overlay import UserOverlay
+from app.models.overlay import EffectiveEntity, UserOverlay
 
-__all__ = ["User", "Ruleset", "RulesetEntity", "Campaign", "Character", "UserOverlay"]
+__all__ = [
+    "User", "Ruleset", "RulesetEntity", "Campaign", "Character", "UserOverlay",
+    "EffectiveEntity",
+]
@@ -4,6 +4,7 @@ from datetime import datetime, timezone
 from typing import Any, TypedDict
 
 from app.extensions import db
+from app.models.types import JSONText
 
 
 class CampaignDict(TypedDict):
@@ -25,12 +26,12 @@ class Campaign(db.Model):
     __tablename__ = "campaigns"
 
     id = db.Column(db.Text, primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = db.Column(db.Text, db.ForeignKey("users.id"), nullable=False)
+    user_id = db.Column(db.Text, db.ForeignKey("users.id"), nullable=False, index=True)
     ruleset_id = db.Column(db.Text, db.ForeignKey("rulesets.id"), nullable=False)
     name = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, default="")
     status = db.Column(db.String(20), default="active")  # active, paused, completed
-    settings = db.Column(db.Text, default="{}")  # JSON
+    settings = db.Column(JSONText, default="{}")  # JSON
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc),
                            onupdate=lambda: datetime.now(timezone.utc))
@@ -43,8 +44,12 @@ class Campaign(db.Model):
         """Parse the JSON settings column."""
         return json.loads(self.settings) if self.settings else {}
 
-    def to_dict(self) -> CampaignDict:
-        """Serialize to dictionary for JSON response."""
+    def to_dict(self, character_count: int | None = None) -> CampaignDict:
+        """Serialize to dictionary for JSON response.
+
+        Args:
+            character_count: Precomputed count; skips the COUNT query.
+        """
         return {
             "id": self.id,
             "user_id": self.user_id,
@@ -55,5 +60,7 @@ class Campaign(db.Model):
             "settings": self.get_settings(),
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-            "character_count": self.characters.count(),
+            "character_count": (
+                self.characters.count() if character_count is None else character_count
+            ),
         }
@@ -4,6 +4,7 @@ from datetime import datetime, timezone
 from typing import Any, TypedDict
 
 from app.extensions import db
+from app.models.types import JSONText
 
 
 class CharacterDict(TypedDict):
@@ -13,6 +14,7 @@ class CharacterDict(TypedDict):
     name: str
     character_type: str
     level: int
+    version: int
     core_data: dict[str, Any]
     class_data: dict[str, Any]
     equipment: list[Any]
@@ -32,14 +34,28 @@ class Character(db.Model):
     name = db.Column(db.String(200), nullable=False)
     character_type = db.Column(db.String(10), default="pc")  # pc, npc
     level = db.Column(db.Integer, default=1)
-    core_data = db.Column(db.Text, default="{}")  # JSON: ability scores, hp, ac, etc.
-    class_data = db.Column(db.Text, default="{}")  # JSON: class levels, features
-    equipment = db.Column(db.Text, default="[]")  # JSON array
-    spells = db.Column(db.Text, default="[]")  # JSON array
+    core_data = db.Column(JSONText, default="{}")  # JSON: ability scores, hp, ac, etc.
+    class_data = db.Column(JSONText, default="{}")  # JSON: class levels, features
+    equipment = db.Column(JSONText, default="[]")  # JSON array
+    spells = db.Column(JSONText, default="[]")  # JSON array
+    # Bumped by SQLAlchemy on every UPDATE (version_id_col); exposed as the ETag
+    version = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+    # Cached derived stats (JSON) and the version they were computed for;
+    # deferred so ordinary reads never load them
+    derived_stats = db.deferred(db.Column(JSONText, nullable=True))
+    derived_version = db.Column(db.Integer, nullable=True)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc),
                            onupdate=lambda: datetime.now(timezone.utc))
 
+    __mapper_args__ = {"version_id_col": version}
+    __table_args__ = (
+        # Campaign listings, party/dashboard reads, per-campaign summaries
+        db.Index("ix_characters_campaign_id_user_id", "campaign_id", "user_id"),
+        # A user's characters by name: list_all_characters and summary keyset pages
+        db.Index("ix_characters_user_id_name_id", "user_id", "name", "id"),
+    )
+
     def _parse_json(self, field: str, default: Any) -> Any:
         """Parse a JSON text column, returning default on empty."""
         val = getattr(self, field)
@@ -54,6 +70,7 @@ class Character(db.Model):
             "name": self.name,
             "character_type": self.character_type,
             "level": self.level,
+            "version": self.version,
             "core_data": self._parse_json("core_data", {}),
             "class_data": self._parse_json("class_data", {}),
             "equipment": self._parse_json("equipment", []),
@@ -4,6 +4,7 @@ from datetime import datetime, timezone
 from typing import Any, TypedDict
 
 from app.extensions import db
+from app.models.types import JSONText
 
 
 class OverlayDict(TypedDict):
@@ -30,7 +31,7 @@ class UserOverlay(db.Model):
     entity_type = db.Column(db.String(50), nullable=False)
     source_key = db.Column(db.String(200), nullable=False)
     overlay_type = db.Column(db.String(20), nullable=False)  # modify, homebrew, disable
-    overlay_data = db.Column(db.Text, default="{}")  # JSON
+    overlay_data = db.Column(JSONText, default="{}")  # JSON
     campaign_id = db.Column(db.Text, db.ForeignKey("campaigns.id"), nullable=True)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc),
@@ -41,6 +42,18 @@ class UserOverlay(db.Model):
             "user_id", "ruleset_id", "entity_type", "source_key", "campaign_id",
             name="uq_user_overlay_entity",
         ),
+        # NULLs are distinct in a unique constraint, so the one above never
+        # rejects a second global overlay; this partial index does
+        db.Index("uq_user_overlay_entity_global", "user_id", "ruleset_id",
+                 "entity_type", "source_key", unique=True,
+                 sqlite_where=db.text("campaign_id IS NULL"),
+                 postgresql_where=db.text("campaign_id IS NULL")),
+        # The unique constraint's index serves overlay resolution (user, ruleset,
+        # type, source_key); this one serves listing a campaign's overlays
+        db.Index("ix_user_overlays_user_id_campaign_id_entity_type",
+                 "user_id", "campaign_id", "entity_type"),
+        # Every user's overlays on an entity, for rematerializing after a reseed
+        db.Index("ix_user_overlays_entity", "ruleset_id", "entity_type", "source_key"),
     )
 
     def get_overlay_data(self) -> dict:
@@ -61,3 +74,38 @@ class UserOverlay(db.Model):
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
+
+
+class EffectiveEntity(db.Model):
+    """Materialized overlay result for one entity in one (user, campaign) scope.
+
+    Only maintained when MATERIALIZE_OVERLAYS is on. A row exists for the
+    global scope (campaign_id NULL) when the user has global overlays on the
+    entity, and for a campaign when the user has overlays scoped to it;
+    campaigns without their own overlays read the global row.
+    """
+
+    __tablename__ = "effective_entities"
+
+    id = db.Column(db.Text, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = db.Column(db.Text, db.ForeignKey("users.id"), nullable=False)
+    entity_id = db.Column(db.Text, db.ForeignKey("ruleset_entities.id"), nullable=False)
+    campaign_id = db.Column(db.Text, db.ForeignKey("campaigns.id"), nullable=True)
+    # Overlay key of the entity, so overlay writes can find their rows
+    ruleset_id = db.Column(db.Text, nullable=False)
+    entity_type = db.Column(db.String(50), nullable=False)
+    source_key = db.Column(db.String(200), nullable=False)
+    entity_data = db.Column(JSONText, nullable=False)  # JSON, overlays merged
+    is_disabled = db.Column(db.Boolean, nullable=False, default=False)
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "entity_id", "campaign_id",
+                            name="uq_effective_entity"),
+        db.Index("ix_effective_entities_overlay_key", "ruleset_id", "entity_type",
+                 "source_key"),
+    )
+
+    def get_entity_data(self) -> dict:
+        """Parse the JSON entity_data column."""
+        return json.loads(self.entity_data)
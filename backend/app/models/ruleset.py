@@ -1,9 +1,14 @@
+import hashlib
 import uuid
 import json
 from datetime import datetime, timezone
 from typing import Any, TypedDict
 
+from sqlalchemy import event
+
 from app.extensions import db
+from app.models.types import JSONText
+from app.utils.json_provider import RawJSON
 
 
 class RulesetDict(TypedDict):
@@ -24,7 +29,7 @@ class EntityDict(TypedDict, total=False):
     source_key: str
     name: str
     document_key: str | None
-    entity_data: dict[str, Any]
+    entity_data: dict[str, Any] | RawJSON
 
 
 class Ruleset(db.Model):
@@ -36,8 +41,8 @@ class Ruleset(db.Model):
     key = db.Column(db.String(50), unique=True, nullable=False)
     name = db.Column(db.String(200), nullable=False)
     source_type = db.Column(db.String(50), nullable=False)  # 'open5e', 'file', 'manual'
-    source_config = db.Column(db.Text, default="{}")  # JSON
-    entity_types = db.Column(db.Text, default="[]")  # JSON list of entity type keys
+    source_config = db.Column(JSONText, default="{}")  # JSON
+    entity_types = db.Column(JSONText, default="[]")  # JSON list of entity type keys
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc),
                            onupdate=lambda: datetime.now(timezone.utc))
@@ -79,7 +84,10 @@ class RulesetEntity(db.Model):
     source_key = db.Column(db.String(200), nullable=False)
     name = db.Column(db.String(300), nullable=False, index=True)
     document_key = db.Column(db.String(100), nullable=True, index=True)
-    entity_data = db.Column(db.Text, nullable=False, default="{}")  # JSON
+    entity_data = db.Column(JSONText, nullable=False, default="{}")  # JSON
+    # Hash of the columns above, set on every ORM write (see
+    # entity_content_hash); versions the cached base entity responses
+    content_hash = db.Column(db.String(24), nullable=False)
 
     __table_args__ = (
         db.UniqueConstraint("ruleset_id", "entity_type", "source_key",
@@ -90,11 +98,13 @@ class RulesetEntity(db.Model):
         """Parse the JSON entity_data column."""
         return json.loads(self.entity_data) if self.entity_data else {}
 
-    def to_dict(self, include_data: bool = False) -> EntityDict:
+    def to_dict(self, include_data: bool = False, raw_data: bool = False) -> EntityDict:
         """Serialize to dictionary for JSON response.
 
         Args:
             include_data: If True, includes the full entity_data blob.
+            raw_data: With include_data, pass the stored JSON text through as
+                RawJSON instead of parsing it (for raw_jsonify responses).
         """
         result = {
             "id": self.id,
@@ -105,5 +115,30 @@ class RulesetEntity(db.Model):
             "document_key": self.document_key,
         }
         if include_data:
-            result["entity_data"] = self.get_entity_data()
+            result["entity_data"] = (
+                RawJSON(self.entity_data or "{}") if raw_data else self.get_entity_data()
+            )
         return result
+
+
+def entity_content_hash(
+    entity_type: str, source_key: str, name: str, document_key: str | None,
+    entity_data: str | None,
+) -> str:
+    """Short stable hash of an entity's content columns.
+
+    Bulk inserts that bypass the ORM must set content_hash with this.
+    """
+    content = "\x1f".join(
+        (entity_type, source_key, name, document_key or "", entity_data or "{}")
+    )
+    return hashlib.blake2b(content.encode(), digest_size=12).hexdigest()
+
+
+@event.listens_for(RulesetEntity, "before_insert")
+@event.listens_for(RulesetEntity, "before_update")
+def _set_content_hash(mapper: Any, connection: Any, target: RulesetEntity) -> None:
+    target.content_hash = entity_content_hash(
+        target.entity_type, target.source_key, target.name, target.document_key,
+        target.entity_data,
+    )
@@ -0,0 +1,137 @@
+"""Column types and JSON query helpers shared by the models and services."""
+
+import functools
+import json
+from typing import Any
+
+from sqlalchemy import Boolean, Text, and_, func, true, type_coerce
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ColumnElement
+from sqlalchemy.types import TypeDecorator
+
+# Indexes that only exist on PostgreSQL, created by migration c4a8e2f07b19.
+# They are not declared on the models, so autogenerate must ignore them.
+POSTGRES_ONLY_INDEXES = (
+    "ix_ruleset_entities_entity_data_gin",
+    "ix_ruleset_entities_name_trgm",
+)
+
+
+@functools.cache
+def _jsonb_text() -> type:
+    """The JSONB type used on PostgreSQL, built on first use.
+
+    Importing the postgresql dialect costs tens of milliseconds, which
+    SQLite deployments should not pay at startup.
+    """
+    from sqlalchemy.dialects.postgresql import JSONB
+
+    class _JSONBText(JSONB):
+        """JSONB column exchanged with Python as JSON text.
+
+        Values go to the driver as strings, which PostgreSQL casts to jsonb
+        on insert and update. Drivers that parse jsonb results hand back
+        objects, which are re-serialized so callers always see text.
+        """
+
+        def bind_processor(self, dialect: Any) -> None:
+            return None
+
+        def result_processor(self, dialect: Any, coltype: Any) -> Any:
+            def process(value: Any) -> str | None:
+                if value is None or isinstance(value, str):
+                    return value
+                return json.dumps(value)
+            return process
+
+    return _JSONBText
+
+
+class JSONText(TypeDecorator):
+    """A JSON document stored as TEXT, or as JSONB on PostgreSQL.
+
+    Python code always reads and writes the serialized JSON string (models
+    parse it in their ``get_*`` helpers), so SQLite and PostgreSQL behave
+    the same. On PostgreSQL the database can index and query inside the
+    document; note that jsonb normalizes whitespace and key order, so the
+    text read back may differ from the text written.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect: Any) -> Any:
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(_jsonb_text()())
+        return dialect.type_descriptor(Text())
+
+
+class json_contains(ColumnElement):
+    """True where a JSON column contains ``match``, compiled per dialect.
+
+    PostgreSQL uses jsonb containment (``@>``), served by a GIN index.
+    Elsewhere each leaf of ``match`` becomes a ``json_extract`` comparison.
+    ``match`` holds scalars and nested objects (no arrays); validate it with
+    check_json_match() first.
+    """
+
+    type = Boolean()
+    inherit_cache = False  # the SQL shape depends on the match document
+
+    def __init__(self, column: Any, match: dict) -> None:
+        self.column = column
+        self.match = match
+
+    @property
+    def _from_objects(self) -> list:
+        return self.column._from_objects
+
+
+def check_json_match(match: Any, path: str = "match") -> None:
+    """Validate a json_contains document.
+
+    Raises:
+        ValueError: If match is not an object of scalars and objects.
+    """
+    if not isinstance(match, dict):
+        raise ValueError(f"{path} must be an object")
+    for key, value in match.items():
+        if '"' in key:
+            raise ValueError(f"{path}: keys may not contain '\"'")
+        if isinstance(value, dict):
+            check_json_match(value, f"{path}.{key}")
+        elif isinstance(value, list):
+            raise ValueError(f"{path}.{key}: arrays are not supported")
+
+
+def _leaves(match: dict, path: str = "$") -> list[tuple[str, Any]]:
+    leaves = []
+    for key, value in match.items():
+        child = f'{path}."{key}"'
+        if isinstance(value, dict) and value:
+            leaves.extend(_leaves(value, child))
+        else:
+            leaves.append((child, value))
+    return leaves
+
+
+@compiles(json_contains)
+def _compile_json_contains(element: json_contains, compiler: Any, **kw: Any) -> str:
+    conditions = []
+    for path, value in _leaves(element.match):
+        if value is None or isinstance(value, (bool, dict)):
+            if value is None:
+                kind = "null"
+            else:
+                kind = "object" if isinstance(value, dict) else str(value).lower()
+            conditions.append(func.json_type(element.column, path) == kind)
+        else:
+            conditions.append(func.json_extract(element.column, path) == value)
+    return compiler.process(and_(true(), *conditions).self_group(), **kw)
+
+
+@compiles(json_contains, "postgresql")
+def _compile_json_contains_pg(element: json_contains, compiler: Any, **kw: Any) -> str:
+    from sqlalchemy.dialects.postgresql import JSONB
+
+    return compiler.process(type_coerce(element.column, JSONB).contains(element.match), **kw)
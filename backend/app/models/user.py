@@ -26,6 +26,9 @@ class User(db.Model):
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc),
                            onupdate=lambda: datetime.now(timezone.utc))
+    # Epoch seconds until this user's replica reads go to the primary, set
+    # after each write (read-your-writes; see app.utils.database)
+    primary_reads_until = db.Column(db.Float, nullable=True)
 
     campaigns = db.relationship("Campaign", backref="user", lazy="dynamic")
     characters = db.relationship("Character", backref="user", lazy="dynamic")
@@ -1,3 +1,5 @@
+import os
+
 import click
 from flask import Flask, current_app
 
@@ -12,6 +14,26 @@ def register_commands(app: Flask) -> None:
         flask seed-user   — Creates the default user if not already present.
         flask seed         — Runs seed-user first, then fetches Open5e data.
 
+    Materialized overlays:
+        flask materialize-overlays — Recomputes effective_entities; run it
+                                     before turning on MATERIALIZE_OVERLAYS.
+
+    Response cache:
+        flask warm-responses — Pre-compresses base entity responses into
+                               RESPONSE_CACHE_DIR (seed does this too).
+
+    Read replica:
+        flask snapshot-replica — Copies a SQLite primary into the SQLite
+                                 DATABASE_REPLICA_URL (run it periodically).
+
+    API docs:
+        flask build-openapi — Renders the OpenAPI spec into OPENAPI_SPEC_FILE
+                              (run it in the deploy build).
+
+    Benchmark data:
+        flask gen-synthetic — Generates a large offline ruleset plus users,
+                              campaigns, characters and overlays.
+
     Both commands are idempotent and safe to run repeatedly:
     - seed-user checks for existing user before creating.
     - seed upserts entities (updates existing, inserts new) by source_key.
@@ -45,3 +67,85 @@ def register_commands(app: Flask) -> None:
             seed_open5e()
         else:
             click.echo(f"Unknown source: {source}")
+
+    @app.cli.command("gen-synthetic")
+    @click.option("--key", "ruleset_key", default="synthetic", show_default=True,
+                  help="Ruleset key; an existing ruleset with this key is replaced")
+    @click.option("--entities", default=10000, show_default=True,
+                  help="Total entity rows (10k-500k is the intended range)")
+    @click.option("--sources", default=10, show_default=True, help="Source documents")
+    @click.option("--collision-rate", default=0.2, show_default=True,
+                  help="Fraction of non-default entities reusing a default-source name")
+    @click.option("--users", default=5, show_default=True)
+    @click.option("--campaigns", "campaigns_per_user", default=3, show_default=True,
+                  help="Campaigns per user")
+    @click.option("--characters", "characters_per_campaign", default=6, show_default=True,
+                  help="Characters per campaign")
+    @click.option("--overlays", "overlays_per_user", default=200, show_default=True,
+                  help="Overlays per user")
+    @click.option("--seed", default=1, show_default=True, help="RNG seed")
+    def gen_synthetic(**options) -> None:
+        """Generate a synthetic ruleset and user data for benchmarks."""
+        from app.seed.synthetic import generate_synthetic
+        generate_synthetic(**options)
+
+    @app.cli.command("materialize-overlays")
+    @click.option("--ruleset", "ruleset_key", default=None,
+                  help="Only rebuild this ruleset key (default: all)")
+    def materialize_overlays(ruleset_key: str | None) -> None:
+        """Recompute materialized effective entities from overlays."""
+        from app.models.ruleset import Ruleset
+        from app.services import effective_service
+
+        ruleset_id = None
+        if ruleset_key:
+            ruleset = Ruleset.query.filter_by(key=ruleset_key).first()
+            if not ruleset:
+                raise click.ClickException(f"Unknown ruleset: {ruleset_key}")
+            ruleset_id = ruleset.id
+        written = effective_service.rebuild(ruleset_id)
+        db.session.commit()
+        click.echo(f"Materialized {written} effective entities.")
+        if not current_app.config["MATERIALIZE_OVERLAYS"]:
+            click.echo("MATERIALIZE_OVERLAYS is off; reads still merge overlays live.")
+
+    @app.cli.command("warm-responses")
+    @click.option("--ruleset", "ruleset_key", default=None,
+                  help="Only warm this ruleset key (default: all)")
+    def warm_responses(ruleset_key: str | None) -> None:
+        """Pre-compress base entity responses into the response cache."""
+        from app.models.ruleset import Ruleset
+        from app.services import ruleset_service
+
+        if not current_app.config["RESPONSE_CACHE_DIR"]:
+            raise click.ClickException("RESPONSE_CACHE_DIR is not set; nothing would persist.")
+        query = Ruleset.query
+        if ruleset_key:
+            query = query.filter_by(key=ruleset_key)
+        rulesets = query.all()
+        if ruleset_key and not rulesets:
+            raise click.ClickException(f"Unknown ruleset: {ruleset_key}")
+        for ruleset in rulesets:
+            warmed = ruleset_service.warm_entity_responses(ruleset.id)
+            click.echo(f"{ruleset.key}: pre-compressed {warmed} entity responses.")
+
+    @app.cli.command("snapshot-replica")
+    def snapshot_replica() -> None:
+        """Copy the SQLite primary database into the SQLite replica."""
+        from app.utils.database import snapshot_sqlite_replica
+
+        try:
+            path = snapshot_sqlite_replica(current_app)
+        except ValueError as e:
+            raise click.ClickException(str(e)) from None
+        click.echo(f"Replica snapshot written to {path}")
+
+    @app.cli.command("build-openapi")
+    @click.option("--output", default=None,
+                  help="Output file (default: OPENAPI_SPEC_FILE)")
+    def build_openapi(output: str | None) -> None:
+        """Render the OpenAPI spec from the route docstrings into a file."""
+        from app.utils.openapi import write_spec
+
+        path = write_spec(current_app, output)
+        click.echo(f"OpenAPI spec written to {path} ({os.path.getsize(path)} bytes)")
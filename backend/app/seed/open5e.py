@@ -1,9 +1,13 @@
 import json
+from typing import Callable
+
 import click
 import requests
+from flask import current_app
 
 from app.extensions import db
 from app.models.ruleset import Ruleset, RulesetEntity
+from app.services import effective_service, ruleset_service, stats_service
 
 OPEN5E_BASE = "https://api.open5e.com/v2"
 
@@ -49,8 +53,13 @@ def fetch_all_pages(endpoint: str, limit: int = 100) -> list[dict]:
     return results
 
 
-def seed_open5e() -> None:
-    """Seed D&D 5e SRD data from Open5e v2 API."""
+def seed_open5e(fetch: Callable[[str], list[dict]] = fetch_all_pages) -> None:
+    """Seed D&D 5e SRD data from Open5e v2 API.
+
+    Args:
+        fetch: Returns every result for an endpoint path. Defaults to the live
+            API; benchmarks pass a replay of recorded pages instead.
+    """
     click.echo("Seeding D&D 5e data from Open5e v2 API...")
 
     ruleset = Ruleset.query.filter_by(key="dnd-5e-srd").first()
@@ -72,7 +81,8 @@ def seed_open5e() -> None:
     for config in ENTITY_CONFIGS:
         entity_type = config["type"]
         click.echo(f"\nFetching {entity_type}s...")
-        items = fetch_all_pages(config["endpoint"])
+        items = fetch(config["endpoint"])
+        changed = []
         click.echo(f"  Got {len(items)} {entity_type}s")
 
         for item in items:
@@ -88,8 +98,13 @@ def seed_open5e() -> None:
             document_key = item.get("document", {}).get("key") if isinstance(item.get("document"), dict) else None
 
             if existing:
+                entity_data = json.dumps(item)
+                # jsonb (PostgreSQL) reformats stored text, so confirm a
+                # text mismatch on the parsed data
+                if existing.entity_data != entity_data and existing.get_entity_data() != item:
+                    changed.append((ruleset.id, entity_type, existing.source_key))
+                    existing.entity_data = entity_data
                 existing.name = name
-                existing.entity_data = json.dumps(item)
                 existing.document_key = document_key
             else:
                 entity = RulesetEntity(
@@ -101,14 +116,23 @@ def seed_open5e() -> None:
                     document_key=document_key,
                 )
                 db.session.add(entity)
+                changed.append((ruleset.id, entity_type, entity.source_key))
 
             total += 1
 
+        # Overlays may target changed or newly seeded entities, and cached
+        # character stats may read them
+        effective_service.refresh(changed)
+        stats_service.invalidate(changed)
         db.session.commit()
 
     # Rebuild source metadata from seeded entities
     _rebuild_source_config(ruleset)
 
+    if current_app.config.get("RESPONSE_CACHE_DIR"):
+        warmed = ruleset_service.warm_entity_responses(ruleset.id)
+        click.echo(f"Pre-compressed {warmed} entity responses")
+
     click.echo(f"\nDone! Seeded {total} entities total.")
 
 
@@ -0,0 +1,383 @@
+"""Synthetic dataset generator for benchmarks and load tests.
+
+Builds an Open5e-shaped ruleset of arbitrary size without network access,
+plus users, campaigns, characters and overlays that reference it. Output is
+deterministic for a given ``seed`` so benchmark runs are comparable.
+
+Rows are written with executemany-style bulk inserts in batches; a 500k
+entity ruleset takes on the order of a minute on SQLite.
+"""
+
+import json
+import random
+import uuid
+from datetime import datetime, timezone
+from typing import Any
+
+import bcrypt
+import click
+from sqlalchemy import insert
+
+from app.extensions import db
+from app.models.campaign import Campaign
+from app.models.character import Character
+from app.models.overlay import EffectiveEntity, UserOverlay
+from app.models.ruleset import Ruleset, RulesetEntity, entity_content_hash
+from app.models.user import User
+from app.seed.open5e import ENTITY_CONFIGS, _rebuild_source_config
+from app.services import effective_service
+
+SYNTHETIC_PASSWORD = "synthetic"
+
+_BATCH_SIZE = 5000
+
+# The first two mirror the real Open5e official documents so the smart
+# default source (srd-2024) and priority ordering behave as in production.
+_OFFICIAL_DOCS = [
+    ("srd-2024", "System Reference Document 5.2", "Wizards of the Coast"),
+    ("srd-2014", "System Reference Document 5.1", "Wizards of the Coast"),
+]
+
+_ADJECTIVES = [
+    "Ancient", "Arcane", "Blazing", "Crimson", "Dread", "Eldritch", "Frost", "Gilded",
+    "Hollow", "Iron", "Jade", "Lunar", "Mystic", "Obsidian", "Radiant", "Shadow",
+    "Storm", "Sunken", "Thorned", "Verdant", "Wailing", "Withered", "Young", "Zealous",
+]
+_NOUNS = [
+    "Ash", "Bastion", "Blade", "Chorus", "Crown", "Drake", "Ember", "Fang", "Gale",
+    "Golem", "Hound", "Lance", "Maw", "Oath", "Pact", "Rune", "Serpent", "Shard",
+    "Sigil", "Spire", "Tide", "Veil", "Ward", "Wyrm",
+]
+_ABILITIES = ["strength", "dexterity", "constitution", "intelligence", "wisdom", "charisma"]
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _name(rng: random.Random, index: int) -> str:
+    return f"{rng.choice(_ADJECTIVES)} {rng.choice(_NOUNS)} {index}"
+
+
+def _document(key: str, name: str, publisher: str) -> dict[str, Any]:
+    return {
+        "key": key,
+        "name": name,
+        "display_name": name,
+        "publisher": {"key": publisher.lower().replace(" ", "-"), "name": publisher},
+        "gamesystem": {"key": "5e-2024" if key == "srd-2024" else "5e-2014"},
+    }
+
+
+def _entity_data(
+    rng: random.Random, entity_type: str, key: str, name: str, document: dict[str, Any]
+) -> dict[str, Any]:
+    """Build an entity blob roughly the size and shape of the Open5e v2 payload."""
+    data: dict[str, Any] = {
+        "key": key,
+        "name": name,
+        "document": document,
+        "desc": " ".join(rng.choice(_NOUNS).lower() for _ in range(rng.randint(20, 120))),
+    }
+    if entity_type == "creature":
+        data.update({
+            "size": {"name": rng.choice(["Small", "Medium", "Large", "Huge"])},
+            "type": {"name": rng.choice(["Beast", "Dragon", "Fiend", "Undead"])},
+            "armor_class": rng.randint(10, 22),
+            "hit_points": rng.randint(5, 400),
+            "hit_dice": f"{rng.randint(1, 30)}d{rng.choice([6, 8, 10, 12])}",
+            "challenge_rating_decimal": rng.choice([0.25, 0.5, 1, 2, 5, 10, 17, 24]),
+            "speed": {"walk": rng.choice([20, 30, 40]), "fly": rng.choice([0, 60, 80])},
+            "ability_scores": {a: rng.randint(3, 30) for a in _ABILITIES},
+            "saving_throws": {a: rng.randint(-1, 14) for a in _ABILITIES if rng.random() < 0.4},
+            "skill_bonuses": {"perception": rng.randint(0, 15), "stealth": rng.randint(0, 10)},
+            "resistances_and_immunities": {
+                "damage_immunities": rng.sample(["fire", "cold", "poison", "acid"], 2),
+                "condition_immunities": rng.sample(["charmed", "frightened", "poisoned"], 1),
+            },
+            "actions": [
+                {
+                    "name": f"{rng.choice(_NOUNS)} Strike",
+                    "desc": " ".join(rng.choice(_NOUNS).lower() for _ in range(30)),
+                    "attacks": [{
+                        "to_hit_mod": rng.randint(2, 15),
+                        "damage_die_count": rng.randint(1, 4),
+                        "damage_die_type": rng.choice(["D6", "D8", "D10", "D12"]),
+                        "damage_type": {"name": rng.choice(["Slashing", "Fire", "Cold"])},
+                    }],
+                }
+                for _ in range(rng.randint(2, 8))
+            ],
+            "traits": [
+                {"name": f"{rng.choice(_ADJECTIVES)} Aura", "desc": "aura " * 20}
+                for _ in range(rng.randint(0, 4))
+            ],
+        })
+    elif entity_type == "spell":
+        data.update({
+            "level": rng.randint(0, 9),
+            "school": {"name": rng.choice(["Evocation", "Abjuration", "Necromancy"])},
+            "casting_time": rng.choice(["action", "bonus-action", "reaction", "1 minute"]),
+            "range_text": rng.choice(["Self", "Touch", "60 feet", "120 feet"]),
+            "duration": rng.choice(["instantaneous", "1 minute", "1 hour"]),
+            "concentration": rng.random() < 0.4,
+            "verbal": True,
+            "somatic": rng.random() < 0.7,
+            "material": rng.random() < 0.3,
+            "higher_level": "more " * rng.randint(0, 30),
+        })
+    elif entity_type == "item":
+        data.update({
+            "category": {"name": rng.choice(["Weapon", "Armor", "Adventuring Gear"])},
+            "cost": str(rng.randint(1, 5000)),
+            "weight": str(rng.randint(0, 60)),
+            "rarity": {"name": rng.choice(["Common", "Uncommon", "Rare", "Legendary"])},
+            "armor_class": rng.choice([None, 11, 14, 16, 18]),
+        })
+    elif entity_type == "class":
+        data.update({
+            "hit_dice": rng.choice(["D6", "D8", "D10", "D12"]),
+            "saving_throws": rng.sample(_ABILITIES, 2),
+            "features": [
+                {"name": f"{rng.choice(_NOUNS)} Feature", "desc": "feature " * 25}
+                for _ in range(rng.randint(5, 20))
+            ],
+        })
+    return data
+
+
+def _bulk_insert(model: type, rows: list[dict[str, Any]]) -> None:
+    for start in range(0, len(rows), _BATCH_SIZE):
+        db.session.execute(insert(model), rows[start:start + _BATCH_SIZE])
+
+
+def generate_synthetic(
+    ruleset_key: str = "synthetic",
+    entities: int = 10000,
+    sources: int = 10,
+    collision_rate: float = 0.2,
+    users: int = 5,
+    campaigns_per_user: int = 3,
+    characters_per_campaign: int = 6,
+    overlays_per_user: int = 200,
+    seed: int = 1,
+) -> Ruleset:
+    """Create a synthetic ruleset with users, campaigns, characters and overlays.
+
+    Args:
+        ruleset_key: Unique key for the generated ruleset. An existing ruleset
+            with this key is deleted first, along with its synthetic users.
+        entities: Total entity rows, spread evenly over the Open5e entity types.
+        sources: Number of source documents (at least the two official SRDs).
+        collision_rate: Fraction of non-default-source entities that reuse a
+            name from the default source, exercising smart-default dedup.
+        users: Synthetic users (``<ruleset_key>-user-<n>``, password ``synthetic``).
+        campaigns_per_user: Campaigns per user.
+        characters_per_campaign: Characters per campaign.
+        overlays_per_user: Overlays per user, a mix of global and
+            campaign-scoped modify/disable/homebrew.
+        seed: RNG seed; identical arguments produce identical data.
+
+    Returns:
+        The created Ruleset.
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    sources = max(sources, len(_OFFICIAL_DOCS))
+
+    _delete_synthetic(ruleset_key)
+
+    docs = [_document(*d) for d in _OFFICIAL_DOCS]
+    for i in range(len(_OFFICIAL_DOCS), sources):
+        docs.append(_document(f"synth-doc-{i}", f"Synthetic Compendium {i}", f"Publisher {i % 5}"))
+
+    entity_types = [c["type"] for c in ENTITY_CONFIGS]
+    ruleset = Ruleset(
+        id=_uuid(rng),
+        key=ruleset_key,
+        name=f"Synthetic ({entities} entities)",
+        source_type="manual",
+        source_config=json.dumps({"synthetic": {"seed": seed, "entities": entities}}),
+        entity_types=json.dumps(entity_types),
+    )
+    db.session.add(ruleset)
+    db.session.flush()
+
+    # -- entities ------------------------------------------------------------
+    click.echo(f"Generating {entities} entities across {sources} sources...")
+    default_names: dict[str, list[str]] = {t: [] for t in entity_types}
+    keys_by_type: dict[str, list[str]] = {t: [] for t in entity_types}
+    rows: list[dict[str, Any]] = []
+    for i in range(entities):
+        entity_type = entity_types[i % len(entity_types)]
+        # Roughly half the rows live in the default source, like Open5e
+        doc = docs[0] if rng.random() < 0.5 else rng.choice(docs[1:])
+        if doc is not docs[0] and default_names[entity_type] and rng.random() < collision_rate:
+            name = rng.choice(default_names[entity_type])
+        else:
+            name = _name(rng, i)
+        if doc is docs[0]:
+            default_names[entity_type].append(name)
+        source_key = f"{doc['key']}_{entity_type}_{i}"
+        keys_by_type[entity_type].append(source_key)
+        entity_id = _uuid(rng)
+        entity_data = json.dumps(_entity_data(rng, entity_type, source_key, name, doc))
+        rows.append({
+            "id": entity_id,
+            "ruleset_id": ruleset.id,
+            "entity_type": entity_type,
+            "source_key": source_key,
+            "name": name,
+            "document_key": doc["key"],
+            "entity_data": entity_data,
+            "content_hash": entity_content_hash(
+                entity_type, source_key, name, doc["key"], entity_data
+            ),
+        })
+        if len(rows) >= _BATCH_SIZE:
+            _bulk_insert(RulesetEntity, rows)
+            rows = []
+    _bulk_insert(RulesetEntity, rows)
+    db.session.commit()
+
+    # -- users, campaigns, characters -----------------------------------------
+    click.echo(f"Generating {users} users with campaigns, characters and overlays...")
+    # bcrypt is deliberately slow — hash once and share it across synthetic users
+    password_hash = bcrypt.hashpw(SYNTHETIC_PASSWORD.encode("utf-8"), bcrypt.gensalt()).decode()
+    user_rows, campaign_rows, character_rows, overlay_rows = [], [], [], []
+    for u in range(users):
+        user_id = _uuid(rng)
+        user_rows.append({
+            "id": user_id,
+            "username": f"{ruleset_key}-user-{u}",
+            "email": f"{ruleset_key}-user-{u}@synthetic.local",
+            "password_hash": password_hash,
+            "created_at": now,
+            "updated_at": now,
+        })
+        campaign_ids = []
+        for c in range(campaigns_per_user):
+            campaign_id = _uuid(rng)
+            campaign_ids.append(campaign_id)
+            campaign_rows.append({
+                "id": campaign_id,
+                "user_id": user_id,
+                "ruleset_id": ruleset.id,
+                "name": f"{_name(rng, c)} Campaign",
+                "description": "Synthetic campaign",
+                "status": "active",
+                "settings": json.dumps({"house_rules": rng.random() < 0.5}),
+                "created_at": now,
+                "updated_at": now,
+            })
+            for n in range(characters_per_campaign):
+                character_rows.append(
+                    _character_row(rng, keys_by_type, campaign_id, user_id, n, now)
+                )
+
+        seen: set[tuple[str, str, str | None]] = set()
+        for _ in range(overlays_per_user):
+            entity_type = rng.choice(entity_types)
+            if not keys_by_type[entity_type]:
+                continue
+            source_key = rng.choice(keys_by_type[entity_type])
+            campaign_id = rng.choice(campaign_ids) if campaign_ids and rng.random() < 0.5 else None
+            if (entity_type, source_key, campaign_id) in seen:
+                continue
+            seen.add((entity_type, source_key, campaign_id))
+            overlay_type = rng.choices(["modify", "disable", "homebrew"], [0.7, 0.2, 0.1])[0]
+            overlay_rows.append({
+                "id": _uuid(rng),
+                "user_id": user_id,
+                "ruleset_id": ruleset.id,
+                "entity_type": entity_type,
+                "source_key": source_key,
+                "overlay_type": overlay_type,
+                "overlay_data": json.dumps(
+                    {} if overlay_type == "disable"
+                    else {"desc": "House-ruled.", "hit_points": rng.randint(5, 400)}
+                ),
+                "campaign_id": campaign_id,
+                "created_at": now,
+                "updated_at": now,
+            })
+
+    _bulk_insert(User, user_rows)
+    _bulk_insert(Campaign, campaign_rows)
+    _bulk_insert(Character, character_rows)
+    _bulk_insert(UserOverlay, overlay_rows)
+    if effective_service.enabled():
+        effective_service.rebuild(ruleset.id)
+    db.session.commit()
+
+    # Derive the sources array exactly as the Open5e seed does
+    _rebuild_source_config(ruleset)
+    click.echo(
+        f"Done! {entities} entities, {len(user_rows)} users, {len(campaign_rows)} campaigns, "
+        f"{len(character_rows)} characters, {len(overlay_rows)} overlays."
+    )
+    return ruleset
+
+
+def _character_row(
+    rng: random.Random,
+    keys_by_type: dict[str, list[str]],
+    campaign_id: str,
+    user_id: str,
+    index: int,
+    now: datetime,
+) -> dict[str, Any]:
+    def refs(entity_type: str, count: int) -> list[dict[str, str]]:
+        keys = keys_by_type.get(entity_type) or []
+        picked = rng.sample(keys, min(count, len(keys)))
+        return [{"name": k, "key": k} for k in picked]
+
+    scores = {a[:3]: rng.randint(8, 18) for a in _ABILITIES}
+    level = rng.randint(1, 20)
+    species = refs("species", 1)
+    klass = refs("class", 1)
+    return {
+        "id": _uuid(rng),
+        "campaign_id": campaign_id,
+        "user_id": user_id,
+        "name": _name(rng, index),
+        "character_type": "pc" if index < 4 else "npc",
+        "level": level,
+        "core_data": json.dumps({
+            "ability_scores": scores,
+            "species": species[0]["key"] if species else "",
+            "hp_max": 10 + level * 6,
+            "hp_current": 10 + level * 6,
+            "ac": 10 + (scores["dex"] - 10) // 2,
+            "speed": 30,
+            "proficiency_bonus": (level - 1) // 4 + 2,
+        }),
+        "class_data": json.dumps({
+            "name": klass[0]["key"] if klass else "",
+            "key": klass[0]["key"] if klass else "",
+        }),
+        "equipment": json.dumps(refs("item", rng.randint(3, 15))),
+        "spells": json.dumps(refs("spell", rng.randint(0, 20))),
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def _delete_synthetic(ruleset_key: str) -> None:
+    """Remove a previous synthetic ruleset and everything that references it."""
+    ruleset = Ruleset.query.filter_by(key=ruleset_key).first()
+    if ruleset:
+        click.echo(f"Removing existing ruleset '{ruleset_key}'...")
+        campaign_ids = db.session.query(Campaign.id).filter(Campaign.ruleset_id == ruleset.id)
+        Character.query.filter(Character.campaign_id.in_(campaign_ids)).delete(
+            synchronize_session=False
+        )
+        EffectiveEntity.query.filter_by(ruleset_id=ruleset.id).delete(synchronize_session=False)
+        UserOverlay.query.filter_by(ruleset_id=ruleset.id).delete(synchronize_session=False)
+        Campaign.query.filter_by(ruleset_id=ruleset.id).delete(synchronize_session=False)
+        RulesetEntity.query.filter_by(ruleset_id=ruleset.id).delete(synchronize_session=False)
+        db.session.delete(ruleset)
+    User.query.filter(User.email.like(f"{ruleset_key}-user-%@synthetic.local")).delete(
+        synchronize_session=False
+    )
+    db.session.commit()
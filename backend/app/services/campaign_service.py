@@ -2,11 +2,18 @@
 
 import json
 
+from sqlalchemy import func
+
 from app.extensions import db
 from app.models.campaign import Campaign
+from app.models.character import Character
+from app.models.overlay import EffectiveEntity, UserOverlay
 from app.models.ruleset import Ruleset
+from app.services import character_service
+from app.utils.database import replica_reads
 
 
+@replica_reads
 def list_campaigns(user_id: str) -> list[dict]:
     """List all campaigns for a user.
 
@@ -71,6 +78,85 @@ def get_campaign(campaign_id: str, user_id: str) -> dict | None:
     return campaign.to_dict() if campaign else None
 
 
+@replica_reads
+def get_dashboard(campaign_id: str, user_id: str) -> dict | None:
+    """Everything the campaign page shows, in three queries.
+
+    One query for the campaign, its ruleset and character count; one for
+    the character summaries; one grouped count of the overlays that apply
+    in this campaign. The query count does not grow with party size. All
+    three read from the same database, so the counts match the lists.
+
+    Args:
+        campaign_id: UUID of the campaign.
+        user_id: UUID of the requesting user.
+
+    Returns:
+        Dict with campaign, ruleset, characters (summaries, first 100),
+        next_cursor and overlays, or None if not found / not owned.
+    """
+    character_count = (
+        db.session.query(func.count(Character.id))
+        .filter(Character.campaign_id == Campaign.id)
+        .scalar_subquery()
+    )
+    row = (
+        db.session.query(Campaign, Ruleset, character_count)
+        .join(Ruleset, Campaign.ruleset_id == Ruleset.id)
+        .filter(Campaign.id == campaign_id, Campaign.user_id == user_id)
+        .first()
+    )
+    if row is None:
+        return None
+    campaign, ruleset, count = row
+
+    page = character_service.list_character_summaries(
+        user_id, campaign_id=campaign_id, limit=100
+    )
+
+    counts = (
+        db.session.query(
+            UserOverlay.campaign_id.is_not(None),
+            UserOverlay.overlay_type,
+            UserOverlay.entity_type,
+            func.count(),
+        )
+        .filter(
+            UserOverlay.user_id == user_id,
+            UserOverlay.ruleset_id == ruleset.id,
+            (UserOverlay.campaign_id.is_(None)) | (UserOverlay.campaign_id == campaign_id),
+        )
+        .group_by(
+            UserOverlay.campaign_id.is_not(None),
+            UserOverlay.overlay_type,
+            UserOverlay.entity_type,
+        )
+        .all()
+    )
+    overlays: dict = {"total": 0, "campaign": {}, "global": {}, "by_entity_type": {}}
+    by_type = overlays["by_entity_type"]
+    for is_campaign, overlay_type, entity_type, n in counts:
+        scope = overlays["campaign" if is_campaign else "global"]
+        scope[overlay_type] = scope.get(overlay_type, 0) + n
+        by_type[entity_type] = by_type.get(entity_type, 0) + n
+        overlays["total"] += n
+
+    return {
+        "campaign": campaign.to_dict(character_count=count),
+        "ruleset": {
+            "id": ruleset.id,
+            "key": ruleset.key,
+            "name": ruleset.name,
+            "source_type": ruleset.source_type,
+            "entity_types": ruleset.get_entity_types(),
+            "sources": ruleset.get_source_config().get("sources", []),
+        },
+        "characters": page["characters"],
+        "next_cursor": page["next_cursor"],
+        "overlays": overlays,
+    }
+
+
 def update_campaign(campaign_id: str, user_id: str, data: dict) -> dict | None:
     """Update a campaign's mutable fields.
 
@@ -115,6 +201,7 @@ def delete_campaign(campaign_id: str, user_id: str) -> bool:
     if not campaign:
         return False
 
+    EffectiveEntity.query.filter_by(campaign_id=campaign.id).delete(synchronize_session=False)
     db.session.delete(campaign)
     db.session.commit()
     return True
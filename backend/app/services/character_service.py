@@ -1,11 +1,20 @@
 """Character service — CRUD operations for campaign characters."""
 
+import base64
 import json
+from datetime import datetime
 from typing import Any
 
+from sqlalchemy import and_, func, or_, type_coerce
+from sqlalchemy.orm import undefer
+from sqlalchemy.orm.exc import StaleDataError
+
 from app.extensions import db
 from app.models.character import Character
 from app.models.campaign import Campaign
+from app.services import ruleset_service, stats_service
+from app.utils.database import replica_reads
+from app.utils.merge_patch import apply_merge_patch, merge_diff
 
 _JSON_FIELD_TYPES: dict[str, type] = {
     "core_data": dict,
@@ -14,6 +23,46 @@ _JSON_FIELD_TYPES: dict[str, type] = {
     "spells": list,
 }
 
+_SCALAR_FIELD_TYPES: dict[str, tuple[type, str]] = {
+    "name": (str, "a string"),
+    "character_type": (str, "a string"),
+    "level": (int, "an integer"),
+}
+
+MAX_LEVEL = 20
+
+
+class VersionConflictError(Exception):
+    """Raised when a write names a character version that is no longer current.
+
+    Attributes:
+        current_version: The version now stored, for the client to refetch.
+    """
+
+    def __init__(self, current_version: int) -> None:
+        super().__init__("Character was modified by another request")
+        self.current_version = current_version
+
+
+def _check_version(character: Character, expected_version: int | None) -> None:
+    """Raise VersionConflictError unless expected_version is None or current."""
+    if expected_version is not None and character.version != expected_version:
+        raise VersionConflictError(character.version)
+
+
+def _commit_versioned(character: Character) -> None:
+    """Commit, turning a concurrent version bump into VersionConflictError.
+
+    version_id_col makes the UPDATE match on the loaded version, so a writer
+    that committed between our read and flush makes the update hit 0 rows.
+    """
+    try:
+        db.session.commit()
+    except StaleDataError:
+        db.session.rollback()
+        current = db.session.query(Character.version).filter_by(id=character.id).scalar()
+        raise VersionConflictError(current or 0) from None
+
 
 def _validate_json_fields(data: dict[str, Any]) -> None:
     """Validate that JSON blob fields have the correct container type.
@@ -26,6 +75,22 @@ def _validate_json_fields(data: dict[str, Any]) -> None:
             raise ValueError(f"{field} must be a {expected.__name__}")
 
 
+def _validate_scalar_fields(data: dict[str, Any]) -> None:
+    """Validate the types of the scalar fields, and the level range.
+
+    Raises:
+        ValueError: If a field has the wrong type or level is out of range.
+    """
+    for field, (expected, label) in _SCALAR_FIELD_TYPES.items():
+        if field in data and (
+            not isinstance(data[field], expected) or isinstance(data[field], bool)
+        ):
+            raise ValueError(f"{field} must be {label}")
+    if "level" in data and not 1 <= data["level"] <= MAX_LEVEL:
+        raise ValueError(f"level must be between 1 and {MAX_LEVEL}")
+
+
+@replica_reads
 def list_all_characters(user_id: str) -> list[dict]:
     """List all characters for a user across all campaigns.
 
@@ -52,6 +117,221 @@ def list_all_characters(user_id: str) -> list[dict]:
     return characters
 
 
+# Stands in for a missing updated_at, so such rows sort first ascending
+_NEVER_UPDATED = datetime(1970, 1, 1)
+
+# Sort keys accepted by list_character_summaries. Each is non-NULL: a NULL
+# key fails every keyset comparison, so its row would be skipped after the
+# first page, and dialects disagree on where NULLs sort.
+_SUMMARY_SORTS = {
+    "name": lambda: Character.name,
+    "level": lambda: func.coalesce(Character.level, 0),
+    "updated_at": lambda: func.coalesce(Character.updated_at, _NEVER_UPDATED),
+    "campaign": lambda: Campaign.name,
+}
+
+# core_data fields pulled into summaries with JSON path extraction
+_SUMMARY_CORE_FIELDS = {
+    "hp_current": "as_integer",
+    "hp_max": "as_integer",
+    "ac": "as_integer",
+    "species": "as_string",
+}
+
+_SUMMARY_MAX_LIMIT = 100
+
+
+def _encode_cursor(value: Any, row_id: str) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([value, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort: str) -> tuple[Any, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, row_id = json.loads(raw)
+        if sort == "updated_at" and value is not None:
+            value = datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor") from None
+    return value, row_id
+
+
+@replica_reads
+def list_character_summaries(
+    user_id: str,
+    campaign_id: str | None = None,
+    sort: str = "name",
+    order: str = "asc",
+    limit: int = 50,
+    cursor: str | None = None,
+) -> dict[str, Any]:
+    """List lightweight character summaries with keyset pagination.
+
+    Selects scalar columns plus the class name and a few core_data fields
+    extracted in SQL, so no JSON blob is loaded or decoded in Python.
+    Pages are keyed on
+    (sort value, id), which stays stable while characters are added.
+
+    Args:
+        user_id: UUID of the character owner.
+        campaign_id: Restrict to one campaign.
+        sort: One of name, level, updated_at, campaign.
+        order: asc or desc.
+        limit: Page size (capped at 100).
+        cursor: ``next_cursor`` from the previous page.
+
+    Returns:
+        Dict with ``characters`` (summary dicts) and ``next_cursor``
+        (None on the last page).
+
+    Raises:
+        ValueError: If sort, order or cursor is invalid.
+    """
+    if sort not in _SUMMARY_SORTS:
+        raise ValueError(f"sort must be one of: {', '.join(_SUMMARY_SORTS)}")
+    if order not in ("asc", "desc"):
+        raise ValueError("order must be asc or desc")
+    limit = max(1, min(limit, _SUMMARY_MAX_LIMIT))
+
+    sort_col = _SUMMARY_SORTS[sort]()
+    core = type_coerce(Character.core_data, db.JSON)
+    extracted = [
+        getattr(core[field], cast)().label(field)
+        for field, cast in _SUMMARY_CORE_FIELDS.items()
+    ]
+    class_name = type_coerce(Character.class_data, db.JSON)["name"].as_string()
+    extracted.append(class_name.label("class_name"))
+    query = (
+        db.session.query(
+            Character.id,
+            Character.name,
+            Character.level,
+            Character.character_type,
+            Character.version,
+            Character.updated_at,
+            Character.campaign_id,
+            Campaign.name.label("campaign_name"),
+            sort_col.label("sort_key"),
+            *extracted,
+        )
+        .join(Campaign, Character.campaign_id == Campaign.id)
+        .filter(Character.user_id == user_id)
+    )
+    if campaign_id:
+        query = query.filter(Character.campaign_id == campaign_id)
+
+    if cursor:
+        value, after_id = _decode_cursor(cursor, sort)
+        if order == "asc":
+            query = query.filter(or_(
+                sort_col > value, and_(sort_col == value, Character.id > after_id)
+            ))
+        else:
+            query = query.filter(or_(
+                sort_col < value, and_(sort_col == value, Character.id < after_id)
+            ))
+
+    if order == "asc":
+        query = query.order_by(sort_col.asc(), Character.id.asc())
+    else:
+        query = query.order_by(sort_col.desc(), Character.id.desc())
+
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1].sort_key, rows[-1].id)
+
+    characters = []
+    for row in rows:
+        characters.append({
+            "id": row.id,
+            "name": row.name,
+            "level": row.level,
+            "character_type": row.character_type,
+            "version": row.version,
+            "campaign_id": row.campaign_id,
+            "campaign_name": row.campaign_name,
+            "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+            "class_name": row.class_name,
+            **{field: getattr(row, field) for field in _SUMMARY_CORE_FIELDS},
+        })
+    return {"characters": characters, "next_cursor": next_cursor}
+
+
+# Character list field -> entity type its entries reference
+_HYDRATED_FIELDS = {"equipment": "item", "spells": "spell"}
+
+
+def hydrate_characters(characters: list[dict], user_id: str) -> dict[str, dict]:
+    """Resolve equipment and spell references for a list of characters.
+
+    All references across the list are resolved together — one entity
+    query and one overlay query in total — and returned side-loaded, so an
+    item shared by six characters is sent once.
+
+    Each character dict gains ``hydrated``: for equipment and spells, a
+    list aligned with the field holding the side-load key of each entry's
+    entity (None if unresolved). Keys are entity ids, suffixed with
+    ``:<campaign_id>`` when a campaign-scoped overlay gives that campaign a
+    different view of the same entity.
+
+    Args:
+        characters: Character dicts (as from to_dict), annotated in place.
+        user_id: UUID of the user whose overlays apply.
+
+    Returns:
+        Side-load key -> effective entity dict (apply_overlays shape).
+    """
+    campaign_ids = {c["campaign_id"] for c in characters}
+    if not campaign_ids:
+        return {}
+    ruleset_of = dict(
+        db.session.query(Campaign.id, Campaign.ruleset_id)
+        .filter(Campaign.id.in_(campaign_ids))
+        .all()
+    )
+
+    scopes: dict[ruleset_service.Scope, dict[str, set[str]]] = {}
+    for char in characters:
+        scope = (ruleset_of[char["campaign_id"]], char["campaign_id"])
+        refs = scopes.setdefault(scope, {})
+        for field, entity_type in _HYDRATED_FIELDS.items():
+            refs.setdefault(entity_type, set()).update(
+                ref for entry in char[field] if (ref := ruleset_service.entity_ref(entry))
+            )
+    resolved = ruleset_service.resolve_entity_refs_batch(user_id, scopes)
+
+    entities: dict[str, dict] = {}
+    keys: dict[int, str] = {}  # id(entity dict) -> side-load key
+    for char in characters:
+        campaign_id = char["campaign_id"]
+        by_ref = resolved[(ruleset_of[campaign_id], campaign_id)]
+        hydrated: dict[str, list[str | None]] = {}
+        for field, entity_type in _HYDRATED_FIELDS.items():
+            slots: list[str | None] = []
+            for entry in char[field]:
+                entity = by_ref.get((entity_type, ruleset_service.entity_ref(entry)))
+                if entity is None:
+                    slots.append(None)
+                    continue
+                key = keys.get(id(entity))
+                if key is None:
+                    key = entity["id"]
+                    if key in entities:
+                        key = f"{key}:{campaign_id}"
+                    keys[id(entity)] = key
+                    entities[key] = entity
+                slots.append(key)
+            hydrated[field] = slots
+        char["hydrated"] = hydrated
+    return entities
+
+
+@replica_reads
 def list_by_campaign(campaign_id: str, user_id: str) -> list[dict]:
     """List all characters in a specific campaign.
 
@@ -86,7 +366,8 @@ def create_character(campaign_id: str, user_id: str, data: dict) -> dict:
 
     Raises:
         LookupError: If campaign not found or not owned by user.
-        ValueError: If required fields (name) are missing.
+        ValueError: If required fields (name) are missing or a field has
+            the wrong type.
     """
     campaign = Campaign.query.filter_by(id=campaign_id, user_id=user_id).first()
     if not campaign:
@@ -94,6 +375,7 @@ def create_character(campaign_id: str, user_id: str, data: dict) -> dict:
 
     if not data.get("name"):
         raise ValueError("name is required")
+    _validate_scalar_fields(data)
     _validate_json_fields(data)
 
     character = Character(
@@ -126,21 +408,52 @@ def get_character(character_id: str, user_id: str) -> dict | None:
     return character.to_dict() if character else None
 
 
-def update_character(character_id: str, user_id: str, data: dict) -> dict | None:
+def get_character_version(character_id: str, user_id: str) -> int | None:
+    """Get only a character's version, without loading its JSON columns.
+
+    Lets conditional GETs answer 304 without reading or decoding the blobs.
+
+    Args:
+        character_id: UUID of the character.
+        user_id: UUID of the requesting user.
+
+    Returns:
+        Current version, or None if not found / not owned.
+    """
+    return (
+        db.session.query(Character.version)
+        .filter_by(id=character_id, user_id=user_id)
+        .scalar()
+    )
+
+
+def update_character(
+    character_id: str, user_id: str, data: dict, expected_version: int | None = None
+) -> dict | None:
     """Update a character's mutable fields.
 
     Args:
         character_id: UUID of the character.
         user_id: UUID of the requesting user.
         data: Dict of fields to update.
+        expected_version: Reject the write unless this is the current
+            version (from If-Match). None skips the check.
 
     Returns:
         Updated character dict, or None if not found.
+
+    Raises:
+        ValueError: If a field has the wrong type or level is out of range.
+        VersionConflictError: If expected_version is stale.
     """
     character = Character.query.filter_by(id=character_id, user_id=user_id).first()
     if not character:
         return None
 
+    _check_version(character, expected_version)
+    if "name" in data and not data["name"]:
+        raise ValueError("name is required")
+    _validate_scalar_fields(data)
     _validate_json_fields(data)
 
     if "name" in data:
@@ -158,24 +471,115 @@ def update_character(character_id: str, user_id: str, data: dict) -> dict | None
     if "spells" in data:
         character.spells = json.dumps(data["spells"])
 
-    db.session.commit()
+    _commit_versioned(character)
     return character.to_dict()
 
 
-def delete_character(character_id: str, user_id: str) -> bool:
+_PATCHABLE_SCALARS = ("name", "character_type", "level")
+
+
+def patch_character(
+    character_id: str, user_id: str, patch: dict, expected_version: int | None = None
+) -> dict | None:
+    """Apply an RFC 7396 merge patch to a character.
+
+    Scalar fields are replaced; the JSON blob fields (core_data, class_data,
+    equipment, spells) are merge-patched in place. Only blobs the patch
+    touches are decoded and re-encoded, so a single HP change never parses
+    the equipment or spell lists.
+
+    Args:
+        character_id: UUID of the character.
+        user_id: UUID of the requesting user.
+        patch: Merge patch document, e.g. ``{"core_data": {"hp_current": 7}}``.
+        expected_version: Reject the write unless this is the current
+            version (from If-Match). None skips the check.
+
+    Returns:
+        Dict with id, version, updated_at and ``changed`` — the minimal
+        merge patch that was actually applied (``{}`` when nothing
+        changed) — or None if not found.
+
+    Raises:
+        ValueError: If the patch touches unknown fields, nulls a required
+            field, sets a scalar of the wrong type or an out-of-range level,
+            or leaves a blob with the wrong container type.
+        VersionConflictError: If expected_version is stale.
+    """
+    if not isinstance(patch, dict):
+        raise ValueError("Merge patch must be a JSON object")
+    character = (
+        Character.query.options(undefer(Character.derived_stats))
+        .filter_by(id=character_id, user_id=user_id)
+        .first()
+    )
+    if not character:
+        return None
+
+    unknown = set(patch) - set(_PATCHABLE_SCALARS) - set(_JSON_FIELD_TYPES)
+    if unknown:
+        raise ValueError(f"Cannot patch: {', '.join(sorted(unknown))}")
+    _check_version(character, expected_version)
+
+    changed: dict[str, Any] = {}
+    for field in _PATCHABLE_SCALARS:
+        if field not in patch:
+            continue
+        if patch[field] is None:
+            raise ValueError(f"{field} cannot be null")
+        if field == "name" and not patch[field]:
+            raise ValueError("name is required")
+        _validate_scalar_fields({field: patch[field]})
+        if getattr(character, field) != patch[field]:
+            setattr(character, field, patch[field])
+            changed[field] = patch[field]
+
+    for field, default in (("core_data", {}), ("class_data", {}),
+                           ("equipment", []), ("spells", [])):
+        if field not in patch:
+            continue
+        if patch[field] is None:
+            raise ValueError(f"{field} cannot be null")
+        before = character._parse_json(field, default)
+        after = apply_merge_patch(before, patch[field])
+        _validate_json_fields({field: after})
+        if after != before:
+            setattr(character, field, json.dumps(after))
+            changed[field] = merge_diff(before, after)
+
+    if changed:
+        stats_service.carry_over_patch(character, changed)
+        _commit_versioned(character)
+    return {
+        "id": character.id,
+        "version": character.version,
+        "updated_at": character.updated_at.isoformat() if character.updated_at else None,
+        "changed": changed,
+    }
+
+
+def delete_character(
+    character_id: str, user_id: str, expected_version: int | None = None
+) -> bool:
     """Delete a character.
 
     Args:
         character_id: UUID of the character.
         user_id: UUID of the requesting user.
+        expected_version: Reject the delete unless this is the current
+            version (from If-Match). None skips the check.
 
     Returns:
         True if deleted, False if not found.
+
+    Raises:
+        VersionConflictError: If expected_version is stale.
     """
     character = Character.query.filter_by(id=character_id, user_id=user_id).first()
     if not character:
         return False
 
+    _check_version(character, expected_version)
     db.session.delete(character)
-    db.session.commit()
+    _commit_versioned(character)
     return True
@@ -0,0 +1,207 @@
+"""Effective entity service — materialized overlay results.
+
+With MATERIALIZE_OVERLAYS off (the default) overlays are merged over the
+base entity on every read. With it on, the merged result for each
+overlaid entity is stored per (user, campaign) in effective_entities and
+rewritten in the same transaction as every overlay change, and after a
+reseed changes a base entity. Reads of customized entities then become a
+single row lookup.
+
+Rows exist only where overlays do: a global row when the user has global
+overlays on the entity, and a campaign row when the user has overlays
+scoped to that campaign. A campaign without its own overlays reads the
+global row; no row at all means the base entity is the effective one.
+"""
+
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import Iterable
+
+from flask import current_app
+from sqlalchemy import and_, insert, or_
+
+from app.extensions import db
+from app.models.overlay import EffectiveEntity, UserOverlay
+from app.models.ruleset import RulesetEntity
+from app.utils.deep_merge import deep_merge_all
+
+# (ruleset_id, entity_type, source_key) — what an overlay targets
+EntityKey = tuple[str, str, str]
+
+# Keys per refresh query, well under SQLite's bound-parameter limit
+_CHUNK = 300
+
+
+def enabled() -> bool:
+    """Whether effective entities are materialized (MATERIALIZE_OVERLAYS)."""
+    return bool(current_app.config.get("MATERIALIZE_OVERLAYS"))
+
+
+def merge_overlays(base_data: dict, overlays: Iterable[UserOverlay]) -> tuple[dict, bool]:
+    """Apply overlays in order over base data.
+
+    A 'disable' overlay marks the entity disabled; 'modify' and 'homebrew'
+    overlays are deep-merged over the data in a single pass.
+
+    Returns:
+        (effective_data, is_disabled)
+    """
+    layers = []
+    is_disabled = False
+    for overlay in overlays:
+        if overlay.overlay_type == "disable":
+            is_disabled = True
+        elif overlay.overlay_type in ("modify", "homebrew"):
+            layers.append(overlay.get_overlay_data())
+    return deep_merge_all(base_data, layers), is_disabled
+
+
+def _key_filter(model: type, keys: list[EntityKey]):
+    """Match keys, grouped per (ruleset, type) so each branch seeks an index.
+
+    SQLite does not use indexes for a row-value ``IN`` over a literal list.
+    """
+    by_type: dict[tuple[str, str], set[str]] = {}
+    for ruleset_id, entity_type, source_key in keys:
+        by_type.setdefault((ruleset_id, entity_type), set()).add(source_key)
+    return or_(*(
+        and_(
+            model.ruleset_id == ruleset_id,
+            model.entity_type == entity_type,
+            model.source_key.in_(source_keys),
+        )
+        for (ruleset_id, entity_type), source_keys in by_type.items()
+    ))
+
+
+def _rewrite(keys: list[EntityKey], user_id: str | None) -> int:
+    """Delete and recompute the rows for keys (one user, or every user)."""
+    rows_q = EffectiveEntity.query.filter(_key_filter(EffectiveEntity, keys))
+    overlays_q = UserOverlay.query.filter(_key_filter(UserOverlay, keys))
+    if user_id is not None:
+        rows_q = rows_q.filter(EffectiveEntity.user_id == user_id)
+        overlays_q = overlays_q.filter(UserOverlay.user_id == user_id)
+    rows_q.delete(synchronize_session=False)
+
+    grouped: dict[tuple[str, EntityKey], list[UserOverlay]] = {}
+    # Global overlays first, then campaign-scoped, as in apply_overlays
+    for overlay in sorted(overlays_q.all(), key=lambda o: o.campaign_id is not None):
+        key = (overlay.ruleset_id, overlay.entity_type, overlay.source_key)
+        grouped.setdefault((overlay.user_id, key), []).append(overlay)
+    if not grouped:
+        return 0
+
+    overlaid = list({key for _, key in grouped})
+    entities = {
+        (e.ruleset_id, e.entity_type, e.source_key): e
+        for e in RulesetEntity.query.filter(_key_filter(RulesetEntity, overlaid))
+    }
+    now = datetime.now(timezone.utc)
+    rows = []
+    for (owner_id, key), overlays in grouped.items():
+        entity = entities.get(key)
+        if entity is None:
+            continue
+        base_data = entity.get_entity_data()
+        global_overlays = [o for o in overlays if o.campaign_id is None]
+        scopes: dict[str | None, list[UserOverlay]] = {}
+        if global_overlays:
+            scopes[None] = global_overlays
+        for overlay in overlays:
+            if overlay.campaign_id is not None:
+                scopes.setdefault(overlay.campaign_id, list(global_overlays)).append(overlay)
+        for campaign_id, applicable in scopes.items():
+            data, is_disabled = merge_overlays(base_data, applicable)
+            rows.append({
+                "id": str(uuid.uuid4()),
+                "user_id": owner_id,
+                "entity_id": entity.id,
+                "campaign_id": campaign_id,
+                "ruleset_id": key[0],
+                "entity_type": key[1],
+                "source_key": key[2],
+                "entity_data": json.dumps(data),
+                "is_disabled": is_disabled,
+                "updated_at": now,
+            })
+    if rows:
+        db.session.execute(insert(EffectiveEntity), rows)
+    return len(rows)
+
+
+def refresh(keys: Iterable[EntityKey], user_id: str | None = None) -> None:
+    """Recompute materialized rows for entity keys, if materialization is on.
+
+    Call after changing overlays (pass the owner's user_id) or base entities
+    (user_id None: every user's overlays on those keys), before committing,
+    so the rows change in the same transaction. Does not commit.
+    """
+    if not enabled():
+        return
+    keys = list(set(keys))
+    for start in range(0, len(keys), _CHUNK):
+        _rewrite(keys[start:start + _CHUNK], user_id)
+
+
+def rebuild(ruleset_id: str | None = None) -> int:
+    """Recompute every materialized row, optionally for one ruleset.
+
+    Runs regardless of MATERIALIZE_OVERLAYS, for backfilling before the
+    mode is switched on. Does not commit.
+
+    Returns:
+        Number of rows written.
+    """
+    rows_q = EffectiveEntity.query
+    keys_q = db.session.query(
+        UserOverlay.ruleset_id, UserOverlay.entity_type, UserOverlay.source_key
+    ).distinct()
+    if ruleset_id is not None:
+        rows_q = rows_q.filter(EffectiveEntity.ruleset_id == ruleset_id)
+        keys_q = keys_q.filter(UserOverlay.ruleset_id == ruleset_id)
+    rows_q.delete(synchronize_session=False)
+
+    keys = [tuple(k) for k in keys_q]
+    written = 0
+    for start in range(0, len(keys), _CHUNK):
+        written += _rewrite(keys[start:start + _CHUNK], None)
+    return written
+
+
+def lookup(
+    user_id: str,
+    entity_ids: Iterable[str],
+    campaign_ids: Iterable[str | None] = (None,),
+) -> dict[tuple[str, str | None], EffectiveEntity]:
+    """Load a user's materialized rows for entities in the given scopes.
+
+    The global scope is always included, since campaigns fall back to it.
+
+    Returns:
+        (entity_id, campaign_id) -> row. Pass the result to pick().
+    """
+    entity_ids = set(entity_ids)
+    if not entity_ids:
+        return {}
+    campaign_ids = {c for c in campaign_ids if c is not None}
+    scope_filter = EffectiveEntity.campaign_id.is_(None)
+    if campaign_ids:
+        scope_filter = scope_filter | EffectiveEntity.campaign_id.in_(campaign_ids)
+    rows = EffectiveEntity.query.filter(
+        EffectiveEntity.user_id == user_id,
+        EffectiveEntity.entity_id.in_(entity_ids),
+        scope_filter,
+    ).all()
+    return {(row.entity_id, row.campaign_id): row for row in rows}
+
+
+def pick(
+    rows: dict[tuple[str, str | None], EffectiveEntity],
+    entity_id: str,
+    campaign_id: str | None,
+) -> EffectiveEntity | None:
+    """The row that applies to an entity in a scope, or None for the base entity."""
+    if campaign_id is not None and (entity_id, campaign_id) in rows:
+        return rows[(entity_id, campaign_id)]
+    return rows.get((entity_id, None))
@@ -1,12 +1,38 @@
 """Overlay service — CRUD operations for user entity overlays."""
 
 import json
+from typing import Any, Iterator
+
+from sqlalchemy.exc import IntegrityError
 
 from app.extensions import db
+from app.models.campaign import Campaign
 from app.models.overlay import UserOverlay
 from app.models.ruleset import Ruleset
+from app.services import effective_service, stats_service
+from app.utils.database import replica_reads
+from app.utils.deep_merge import check_directives
+
+OVERLAY_TYPES = ("modify", "homebrew", "disable")
+
+# Fields that make an overlay portable between users: everything except
+# id, owner and timestamps. Export writes these; bulk upsert reads them.
+PORTABLE_FIELDS = (
+    "ruleset_id", "entity_type", "source_key", "overlay_type", "overlay_data",
+    "campaign_id",
+)
+
+# Keys per IN (...) lookup, well under SQLite's bound-parameter limit
+_LOOKUP_CHUNK = 500
 
+OverlayKey = tuple[str, str, str, str | None]
 
+
+class OverlayConflictError(Exception):
+    """Raised when an insert hits an overlay that already exists for its key."""
+
+
+@replica_reads
 def list_overlays(
     user_id: str,
     ruleset_id: str | None = None,
@@ -48,8 +74,11 @@ def create_overlay(user_id: str, data: dict) -> dict:
         Created overlay dict.
 
     Raises:
-        ValueError: If required fields are missing.
+        ValueError: If required fields are missing or overlay_data has a
+            malformed directive.
         LookupError: If ruleset_id does not exist.
+        OverlayConflictError: If the user already has an overlay on the
+            entity in the same scope.
     """
     required = ["ruleset_id", "entity_type", "source_key", "overlay_type", "overlay_data"]
     missing = [f for f in required if not data.get(f)]
@@ -62,6 +91,7 @@ def create_overlay(user_id: str, data: dict) -> dict:
 
     if not isinstance(data.get("overlay_data"), dict):
         raise ValueError("overlay_data must be an object")
+    check_directives(data["overlay_data"])
 
     overlay = UserOverlay(
         user_id=user_id,
@@ -73,7 +103,13 @@ def create_overlay(user_id: str, data: dict) -> dict:
         campaign_id=data.get("campaign_id"),
     )
     db.session.add(overlay)
-    db.session.commit()
+    try:
+        effective_service.refresh([_target(overlay)], user_id)
+        stats_service.invalidate([_target(overlay)], user_id)
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        raise OverlayConflictError("The entity already has an overlay in this scope") from e
     return overlay.to_dict()
 
 
@@ -95,10 +131,13 @@ def update_overlay(overlay_id: str, user_id: str, data: dict) -> dict | None:
     if "overlay_data" in data:
         if not isinstance(data["overlay_data"], dict):
             raise ValueError("overlay_data must be an object")
+        check_directives(data["overlay_data"])
         overlay.overlay_data = json.dumps(data["overlay_data"])
     if "overlay_type" in data:
         overlay.overlay_type = data["overlay_type"]
 
+    effective_service.refresh([_target(overlay)], user_id)
+    stats_service.invalidate([_target(overlay)], user_id)
     db.session.commit()
     return overlay.to_dict()
 
@@ -118,5 +157,259 @@ def delete_overlay(overlay_id: str, user_id: str) -> bool:
         return False
 
     db.session.delete(overlay)
+    effective_service.refresh([_target(overlay)], user_id)
+    stats_service.invalidate([_target(overlay)], user_id)
     db.session.commit()
     return True
+
+
+def _target(overlay: UserOverlay) -> effective_service.EntityKey:
+    """The entity an overlay applies to."""
+    return (overlay.ruleset_id, overlay.entity_type, overlay.source_key)
+
+
+def _overlay_key(item: dict) -> OverlayKey:
+    """The uq_user_overlay_entity columns (minus user_id) for an overlay dict."""
+    return (item["ruleset_id"], item["entity_type"], item["source_key"],
+            item.get("campaign_id"))
+
+
+def _validate_upsert(index: int, item: Any) -> None:
+    if not isinstance(item, dict):
+        raise ValueError(f"upsert[{index}]: must be an object")
+    required = ["ruleset_id", "entity_type", "source_key", "overlay_type"]
+    missing = [f for f in required if not item.get(f)]
+    if missing:
+        raise ValueError(f"upsert[{index}]: {', '.join(missing)} required")
+    if item["overlay_type"] not in OVERLAY_TYPES:
+        raise ValueError(
+            f"upsert[{index}]: overlay_type must be one of {', '.join(OVERLAY_TYPES)}"
+        )
+    if not isinstance(item.get("overlay_data", {}), dict):
+        raise ValueError(f"upsert[{index}]: overlay_data must be an object")
+    check_directives(item.get("overlay_data", {}), f"upsert[{index}].overlay_data")
+
+
+def _existing_overlays(user_id: str, keys: list[OverlayKey]) -> dict[OverlayKey, UserOverlay]:
+    """Load the user's overlays matching keys, seeking uq_user_overlay_entity.
+
+    A tuple IN over the constraint columns cannot match global overlays
+    (``campaign_id IS NULL``), so each chunk filters on the individual
+    columns and the exact key is matched here.
+    """
+    wanted = set(keys)
+    found: dict[OverlayKey, UserOverlay] = {}
+    for start in range(0, len(keys), _LOOKUP_CHUNK):
+        chunk = keys[start:start + _LOOKUP_CHUNK]
+        rows = UserOverlay.query.filter(
+            UserOverlay.user_id == user_id,
+            UserOverlay.ruleset_id.in_({k[0] for k in chunk}),
+            UserOverlay.entity_type.in_({k[1] for k in chunk}),
+            UserOverlay.source_key.in_({k[2] for k in chunk}),
+        ).all()
+        for overlay in rows:
+            key = (overlay.ruleset_id, overlay.entity_type, overlay.source_key,
+                   overlay.campaign_id)
+            if key in wanted:
+                found[key] = overlay
+    return found
+
+
+def _write_overlays(
+    user_id: str,
+    upserts: list[dict],
+    keys: list[OverlayKey],
+    existing: dict[OverlayKey, UserOverlay],
+    deletes: list[str],
+) -> dict:
+    """Apply a validated batch to the session and flush it; the caller commits."""
+    written: list[UserOverlay] = []
+    created = 0
+    for item, key in zip(upserts, keys):
+        data = json.dumps(item.get("overlay_data") or {})
+        overlay = existing.get(key)
+        if overlay is None:
+            overlay = UserOverlay(
+                user_id=user_id,
+                ruleset_id=key[0],
+                entity_type=key[1],
+                source_key=key[2],
+                campaign_id=key[3],
+            )
+            db.session.add(overlay)
+            created += 1
+        overlay.overlay_type = item["overlay_type"]
+        overlay.overlay_data = data
+        written.append(overlay)
+
+    targets = {k[:3] for k in keys}
+    deleted = 0
+    if deletes:
+        delete_q = UserOverlay.query.filter(
+            UserOverlay.user_id == user_id, UserOverlay.id.in_(set(deletes))
+        )
+        targets.update(
+            _target(o) for o in delete_q.with_entities(
+                UserOverlay.ruleset_id, UserOverlay.entity_type, UserOverlay.source_key
+            )
+        )
+        deleted = delete_q.delete(synchronize_session="fetch")
+    effective_service.refresh(targets, user_id)
+    stats_service.invalidate(targets, user_id)
+
+    db.session.flush()
+    result = {
+        "created": created,
+        "updated": len(written) - created,
+        "deleted": deleted,
+        "overlays": [o.to_dict() for o in written],
+    }
+    return result
+
+
+def rescope_overlays(overlays: list, campaign_id: str | None) -> list:
+    """Move every overlay of an import into one scope (None for global).
+
+    An export can hold a global and a campaign overlay for the same entity;
+    in one scope they would be the same overlay, so such collisions are
+    reported together instead of failing on the first duplicate. Items that
+    are not valid overlays are passed through for bulk_write_overlays to
+    reject.
+
+    Raises:
+        ValueError: Naming every pair of items that would collide.
+    """
+    first: dict[tuple, int] = {}
+    collisions = []
+    for index, item in enumerate(overlays):
+        if not isinstance(item, dict):
+            continue
+        target = (item.get("ruleset_id"), item.get("entity_type"), item.get("source_key"))
+        if target in first:
+            collisions.append(
+                f"overlays[{first[target]}] and overlays[{index}] "
+                f"({target[1]} {target[2]!r})"
+            )
+        else:
+            first[target] = index
+    if collisions:
+        raise ValueError(
+            "rescoping to one campaign_id makes these overlays target the same "
+            "entity; keep one of each pair: " + "; ".join(collisions)
+        )
+    return [
+        {**item, "campaign_id": campaign_id} if isinstance(item, dict) else item
+        for item in overlays
+    ]
+
+
+def bulk_write_overlays(
+    user_id: str,
+    upserts: list[dict],
+    deletes: list[str] | None = None,
+) -> dict:
+    """Upsert and delete many overlays in a single transaction.
+
+    Every item is validated before anything is written, so a bad item
+    rejects the whole batch. Upserts are keyed on uq_user_overlay_entity
+    (ruleset, entity type, source key, campaign): a matching overlay has
+    its type and data replaced, otherwise a new one is created.
+
+    Args:
+        user_id: UUID of the overlay owner.
+        upserts: Overlay dicts with ruleset_id, entity_type, source_key,
+            overlay_type, optional overlay_data and optional campaign_id.
+            Other keys (id, user_id, timestamps) are ignored, so export
+            output can be posted back as-is.
+        deletes: Overlay ids to delete. Ids that do not exist or belong to
+            another user are ignored and not counted.
+
+    Returns:
+        Dict with created, updated and deleted counts and the upserted
+        overlays in request order.
+
+    Raises:
+        ValueError: If an item is invalid or a key appears twice.
+        LookupError: If a ruleset or campaign does not exist or the
+            campaign belongs to another user.
+        OverlayConflictError: If another request created one of the same
+            overlays between the lookup and the insert. Nothing is written;
+            retrying the batch updates that overlay instead.
+    """
+    deletes = deletes or []
+    if not isinstance(upserts, list) or not isinstance(deletes, list):
+        raise ValueError("upsert and delete must be arrays")
+    if not all(isinstance(d, str) for d in deletes):
+        raise ValueError("delete must contain overlay ids")
+
+    keys: list[OverlayKey] = []
+    seen: dict[OverlayKey, int] = {}
+    for index, item in enumerate(upserts):
+        _validate_upsert(index, item)
+        key = _overlay_key(item)
+        if key in seen:
+            raise ValueError(f"upsert[{index}]: duplicate of upsert[{seen[key]}]")
+        seen[key] = index
+        keys.append(key)
+
+    ruleset_ids = {k[0] for k in keys}
+    if ruleset_ids:
+        found = {r for (r,) in db.session.query(Ruleset.id).filter(Ruleset.id.in_(ruleset_ids))}
+        if ruleset_ids - found:
+            raise LookupError("Ruleset not found")
+    campaign_ids = {k[3] for k in keys if k[3] is not None}
+    if campaign_ids:
+        found = {
+            c for (c,) in db.session.query(Campaign.id).filter(
+                Campaign.user_id == user_id, Campaign.id.in_(campaign_ids)
+            )
+        }
+        if campaign_ids - found:
+            raise LookupError("Campaign not found")
+
+    existing = _existing_overlays(user_id, keys)
+    upserted_ids = {o.id for o in existing.values()}
+    for index, overlay_id in enumerate(deletes):
+        if overlay_id in upserted_ids:
+            raise ValueError(f"delete[{index}]: overlay is also upserted")
+
+    try:
+        result = _write_overlays(user_id, upserts, keys, existing, deletes)
+        db.session.commit()
+    except IntegrityError as e:
+        # Another request inserted one of these keys after the lookup above
+        db.session.rollback()
+        raise OverlayConflictError(
+            "An overlay in this batch was created by another request"
+        ) from e
+    return result
+
+
+def export_overlays(
+    user_id: str,
+    ruleset_id: str | None = None,
+    campaign_id: str | None = None,
+    entity_type: str | None = None,
+) -> Iterator[dict]:
+    """Yield a user's overlays in portable form, loading rows in batches.
+
+    Filters match list_overlays. Each dict holds only PORTABLE_FIELDS, so
+    the owner can pass the output straight back to bulk_write_overlays.
+    Campaign-scoped overlays keep the exporter's campaign_id, which another
+    user does not own: importing them elsewhere needs the campaign_id
+    rescoped first, as the import endpoint does.
+    """
+    query = UserOverlay.query.filter_by(user_id=user_id)
+    if ruleset_id:
+        query = query.filter_by(ruleset_id=ruleset_id)
+    if campaign_id:
+        query = query.filter_by(campaign_id=campaign_id)
+    if entity_type:
+        query = query.filter_by(entity_type=entity_type)
+    query = query.order_by(
+        UserOverlay.ruleset_id, UserOverlay.entity_type, UserOverlay.source_key
+    )
+    for overlay in query.yield_per(200):
+        item = {f: getattr(overlay, f) for f in PORTABLE_FIELDS}
+        item["overlay_data"] = overlay.get_overlay_data()
+        yield item
@@ -1,13 +1,21 @@
 """Ruleset service — read operations, source filtering, and overlay merging."""
 
-from sqlalchemy import func
+from typing import Any
+
+from sqlalchemy import exists, func, literal, null, or_, select, type_coerce, union_all
+from sqlalchemy.orm import aliased
 
 from app.extensions import db
+from app.models.campaign import Campaign
 from app.models.ruleset import Ruleset, RulesetEntity
-from app.models.overlay import UserOverlay
-from app.utils.deep_merge import deep_merge
+from app.models.overlay import EffectiveEntity, UserOverlay
+from app.models.types import check_json_match, json_contains
+from app.services import effective_service
+from app.utils import response_cache
+from app.utils.database import replica_reads
 
 
+@replica_reads
 def list_rulesets() -> list[dict]:
     """List all available rulesets.
 
@@ -18,6 +26,7 @@ def list_rulesets() -> list[dict]:
     return [r.to_dict() for r in rulesets]
 
 
+@replica_reads
 def get_ruleset(ruleset_id: str) -> dict | None:
     """Get a single ruleset by ID.
 
@@ -40,6 +49,157 @@ def _get_default_source_key(ruleset: Ruleset) -> str | None:
     return None
 
 
+def _source_branches(
+    ruleset: Ruleset,
+    base_filters: list,
+    entity_type: str,
+    source: str,
+) -> tuple[list[list], str]:
+    """Filter sets whose union is the requested source view.
+
+    Returns:
+        (branches, active_source). Smart default mode has two branches: the
+        default source, and other sources' entities whose name the default
+        source lacks.
+    """
+    if source == "all":
+        # No source filtering — show everything
+        return [base_filters], "all"
+    if source:
+        # Specific source
+        return [[*base_filters, RulesetEntity.document_key == source]], source
+
+    # Smart default: default source + unique entities from other sources
+    default_key = _get_default_source_key(ruleset)
+    if not default_key:
+        # No default configured — show all
+        return [base_filters], "all"
+
+    # Subquery: names that exist in the default source
+    default_names_q = db.session.query(func.lower(RulesetEntity.name)).filter(
+        RulesetEntity.ruleset_id == ruleset.id,
+        RulesetEntity.document_key == default_key,
+    )
+    if entity_type:
+        default_names_q = default_names_q.filter(RulesetEntity.entity_type == entity_type)
+
+    return [
+        # Default source entities
+        [*base_filters, RulesetEntity.document_key == default_key],
+        # Unique entities from other sources (name not in default)
+        [
+            *base_filters,
+            RulesetEntity.document_key != default_key,
+            func.lower(RulesetEntity.name).notin_(default_names_q),
+        ],
+    ], default_key
+
+
+# Columns of a listed entity (to_dict() without entity_data)
+_LISTING_COLUMNS = (
+    RulesetEntity.id,
+    RulesetEntity.ruleset_id,
+    RulesetEntity.entity_type,
+    RulesetEntity.source_key,
+    RulesetEntity.name,
+    RulesetEntity.document_key,
+)
+
+
+def _overlay_exists(
+    overlay: Any,
+    user_id: str,
+    campaign_id: str,
+    overlay_type: str,
+    target: Any,
+):
+    """EXISTS an overlay of overlay_type on target's key in the campaign's view.
+
+    Seeks uq_user_overlay_entity on (user, ruleset, type, source_key).
+    """
+    return exists().where(
+        overlay.user_id == user_id,
+        overlay.ruleset_id == target.ruleset_id,
+        overlay.entity_type == target.entity_type,
+        overlay.source_key == target.source_key,
+        overlay.overlay_type == overlay_type,
+        or_(overlay.campaign_id.is_(None), overlay.campaign_id == campaign_id),
+    )
+
+
+def _campaign_listing(
+    ruleset_id: str,
+    branches: list[list],
+    campaign: Campaign,
+    entity_type: str,
+    search: str,
+    include_homebrew: bool,
+    match: dict | None = None,
+) -> Any:
+    """Union of the visible base entities and homebrew-only entries.
+
+    Base entities with a 'disable' overlay in the campaign's view are
+    anti-joined away. Homebrew overlays whose source_key matches no base
+    entity are listed as entries of their own (named by overlay_data.name),
+    a campaign-scoped one shadowing a global one for the same key.
+    """
+    owner_id, campaign_id = campaign.user_id, campaign.id
+    disable = aliased(UserOverlay)
+    selects = [
+        select(*_LISTING_COLUMNS, literal(False).label("homebrew")).where(
+            *filters,
+            ~_overlay_exists(disable, owner_id, campaign_id, "disable", RulesetEntity),
+        )
+        for filters in branches
+    ]
+    if include_homebrew:
+        shadow = aliased(UserOverlay)
+        name = func.coalesce(
+            type_coerce(UserOverlay.overlay_data, db.JSON)["name"].as_string(),
+            UserOverlay.source_key,
+        )
+        homebrew = select(
+            UserOverlay.id,
+            UserOverlay.ruleset_id,
+            UserOverlay.entity_type,
+            UserOverlay.source_key,
+            name.label("name"),
+            null().label("document_key"),
+            literal(True).label("homebrew"),
+        ).where(
+            UserOverlay.user_id == owner_id,
+            UserOverlay.ruleset_id == ruleset_id,
+            UserOverlay.overlay_type == "homebrew",
+            or_(UserOverlay.campaign_id.is_(None), UserOverlay.campaign_id == campaign_id),
+            ~exists().where(
+                RulesetEntity.ruleset_id == UserOverlay.ruleset_id,
+                RulesetEntity.entity_type == UserOverlay.entity_type,
+                RulesetEntity.source_key == UserOverlay.source_key,
+            ),
+            ~_overlay_exists(disable, owner_id, campaign_id, "disable", UserOverlay),
+            or_(
+                UserOverlay.campaign_id.isnot(None),
+                ~exists().where(
+                    shadow.user_id == owner_id,
+                    shadow.ruleset_id == UserOverlay.ruleset_id,
+                    shadow.entity_type == UserOverlay.entity_type,
+                    shadow.source_key == UserOverlay.source_key,
+                    shadow.overlay_type == "homebrew",
+                    shadow.campaign_id == campaign_id,
+                ),
+            ),
+        )
+        if entity_type:
+            homebrew = homebrew.where(UserOverlay.entity_type == entity_type)
+        if search:
+            homebrew = homebrew.where(name.ilike(f"%{search}%"))
+        if match:
+            homebrew = homebrew.where(json_contains(UserOverlay.overlay_data, match))
+        selects.append(homebrew)
+    return union_all(*selects) if len(selects) > 1 else selects[0]
+
+
+@replica_reads
 def list_entities(
     ruleset_id: str,
     entity_type: str = "",
@@ -47,9 +207,18 @@ def list_entities(
     source: str = "",
     page: int = 1,
     per_page: int = 50,
+    user_id: str | None = None,
+    campaign_id: str | None = None,
+    match: dict | None = None,
 ) -> dict | None:
     """List entities in a ruleset with filtering, source selection, and pagination.
 
+    With campaign_id, the listing is the campaign's view: entities disabled
+    by the owner's global or campaign overlays are left out, and homebrew
+    entries with no base entity are included (flagged ``homebrew``) unless
+    a specific source is requested. Both happen in SQL, so total and pages
+    count only what the campaign can see.
+
     Args:
         ruleset_id: UUID of the ruleset.
         entity_type: Optional filter by entity type.
@@ -57,17 +226,35 @@ def list_entities(
         source: Source filter — specific document_key, "all", or "" for smart default.
         page: Page number (1-indexed).
         per_page: Results per page (capped at 100).
+        user_id: UUID of the requesting user (required with campaign_id).
+        campaign_id: Optional campaign whose view to list.
+        match: Optional attribute filter; keeps entities whose data contains
+            this document, e.g. ``{"level": 3, "school": {"name": "Evocation"}}``.
+            On PostgreSQL it is served by the entity_data GIN index.
 
     Returns:
         Dict with entities list, pagination metadata, and active_source,
         or None if ruleset not found.
+
+    Raises:
+        ValueError: If match is not an object of scalars and objects.
+        LookupError: If the campaign does not exist, belongs to another
+            user, or uses a different ruleset.
     """
+    if match is not None:
+        check_json_match(match)
+
     ruleset = Ruleset.query.get(ruleset_id)
     if not ruleset:
         return None
 
+    campaign = None
+    if campaign_id:
+        campaign = Campaign.query.filter_by(id=campaign_id, user_id=user_id).first()
+        if not campaign or campaign.ruleset_id != ruleset_id:
+            raise LookupError("Campaign not found")
+
     per_page = min(per_page, 100)
-    active_source = source
 
     # Base filters (apply to all branches)
     base_filters = [RulesetEntity.ruleset_id == ruleset_id]
@@ -75,42 +262,37 @@ def list_entities(
         base_filters.append(RulesetEntity.entity_type == entity_type)
     if search:
         base_filters.append(RulesetEntity.name.ilike(f"%{search}%"))
-
-    if source == "all":
-        # No source filtering — show everything
-        query = RulesetEntity.query.filter(*base_filters)
-    elif source:
-        # Specific source
-        query = RulesetEntity.query.filter(*base_filters, RulesetEntity.document_key == source)
-    else:
-        # Smart default: default source + unique entities from other sources
-        default_key = _get_default_source_key(ruleset)
-        if default_key:
-            active_source = default_key
-
-            # Subquery: names that exist in the default source
-            default_names_q = db.session.query(func.lower(RulesetEntity.name)).filter(
-                RulesetEntity.ruleset_id == ruleset_id,
-                RulesetEntity.document_key == default_key,
-            )
-            if entity_type:
-                default_names_q = default_names_q.filter(RulesetEntity.entity_type == entity_type)
-
-            # Default source entities
-            default_q = RulesetEntity.query.filter(
-                *base_filters, RulesetEntity.document_key == default_key
-            )
-            # Unique entities from other sources (name not in default)
-            unique_q = RulesetEntity.query.filter(
-                *base_filters,
-                RulesetEntity.document_key != default_key,
-                func.lower(RulesetEntity.name).notin_(default_names_q),
-            )
-            query = default_q.union(unique_q)
-        else:
-            # No default configured — show all
-            active_source = "all"
-            query = RulesetEntity.query.filter(*base_filters)
+    if match:
+        base_filters.append(json_contains(RulesetEntity.entity_data, match))
+
+    branches, active_source = _source_branches(ruleset, base_filters, entity_type, source)
+
+    if campaign is not None:
+        listing = _campaign_listing(
+            ruleset_id, branches, campaign, entity_type, search,
+            include_homebrew=source in ("", "all"), match=match,
+        ).subquery()
+        page, per_page = max(page, 1), max(per_page, 1)
+        total = db.session.execute(select(func.count()).select_from(listing)).scalar()
+        rows = db.session.execute(
+            select(listing)
+            .order_by(listing.c.name, listing.c.id)
+            .limit(per_page)
+            .offset((page - 1) * per_page)
+        ).mappings().all()
+        return {
+            "entities": [dict(row) for row in rows],
+            "total": total,
+            "page": page,
+            "pages": -(-total // per_page),
+            "per_page": per_page,
+            "active_source": active_source,
+            "campaign_id": campaign.id,
+        }
+
+    query = RulesetEntity.query.filter(*branches[0])
+    for filters in branches[1:]:
+        query = query.union(RulesetEntity.query.filter(*filters))
 
     query = query.order_by(RulesetEntity.name)
     pagination = query.paginate(page=page, per_page=per_page, error_out=False)
@@ -125,6 +307,7 @@ def list_entities(
     }
 
 
+@replica_reads
 def get_sources(
     ruleset_id: str,
     entity_type: str | None = None,
@@ -170,12 +353,14 @@ def get_sources(
     return sources
 
 
+@replica_reads
 def get_entity(
     ruleset_id: str,
     entity_id: str,
     user_id: str | None = None,
     campaign_id: str | None = None,
     effective: bool = False,
+    raw_data: bool = False,
 ) -> dict | None:
     """Get a single entity with optional overlay merging.
 
@@ -185,6 +370,8 @@ def get_entity(
         user_id: UUID of requesting user (required if effective=True).
         campaign_id: Optional campaign scope for overlay resolution.
         effective: If True, apply user overlays to entity data.
+        raw_data: For base (non-effective) reads, return entity_data as the
+            stored JSON text wrapped in RawJSON, unparsed.
 
     Returns:
         Entity dict (with or without overlays applied), or None if not found.
@@ -198,7 +385,60 @@ def get_entity(
     if effective and user_id:
         return apply_overlays(entity, user_id, campaign_id)
 
-    return entity.to_dict(include_data=True)
+    return entity.to_dict(include_data=True, raw_data=raw_data)
+
+
+# Part of every base entity response version; bump when the entity
+# response body changes shape, so cached bodies of the old shape miss
+_ENTITY_RESPONSE_FORMAT = "1"
+
+
+def _entity_response_version(content_hash: str) -> str:
+    return f"{content_hash}-{_ENTITY_RESPONSE_FORMAT}"
+
+
+@replica_reads
+def get_entity_version(ruleset_id: str, entity_id: str) -> str | None:
+    """Version of a base entity's response, read without loading its data.
+
+    Args:
+        ruleset_id: UUID of the ruleset.
+        entity_id: UUID of the entity.
+
+    Returns:
+        Version for the response cache and the weak ETag, or None if the
+        entity does not exist.
+    """
+    content_hash = (
+        db.session.query(RulesetEntity.content_hash)
+        .filter_by(id=entity_id, ruleset_id=ruleset_id)
+        .scalar()
+    )
+    return _entity_response_version(content_hash) if content_hash else None
+
+
+def warm_entity_responses(ruleset_id: str) -> int:
+    """Pre-compress the base entity responses of a ruleset.
+
+    Fills the response cache with what the entity GET route serves for
+    non-effective reads. Only useful across processes with
+    RESPONSE_CACHE_DIR set.
+
+    Args:
+        ruleset_id: UUID of the ruleset.
+
+    Returns:
+        Number of entities warmed.
+    """
+    count = 0
+    entities = RulesetEntity.query.filter_by(ruleset_id=ruleset_id).yield_per(500)
+    for entity in entities:
+        response_cache.warm(
+            "entity", entity.id, {"entity": entity.to_dict(include_data=True, raw_data=True)},
+            _entity_response_version(entity.content_hash),
+        )
+        count += 1
+    return count
 
 
 def apply_overlays(
@@ -212,6 +452,8 @@ def apply_overlays(
     A 'disable' overlay marks the entity as disabled.
     'modify' and 'homebrew' overlays are deep-merged over base data.
 
+    With MATERIALIZE_OVERLAYS on, the precomputed result is read instead.
+
     Args:
         entity: The base ruleset entity.
         user_id: UUID of the current user.
@@ -220,9 +462,11 @@ def apply_overlays(
     Returns:
         Entity dict with overlay-merged entity_data, plus is_disabled and has_overlay flags.
     """
-    result = entity.to_dict(include_data=True)
-    base_data = entity.get_entity_data()
+    if effective_service.enabled():
+        rows = effective_service.lookup(user_id, [entity.id], [campaign_id])
+        return _materialized_dict(entity, effective_service.pick(rows, entity.id, campaign_id))
 
+    result = entity.to_dict(include_data=True)
     overlays = UserOverlay.query.filter_by(
         user_id=user_id,
         ruleset_id=entity.ruleset_id,
@@ -230,18 +474,184 @@ def apply_overlays(
         source_key=entity.source_key,
     ).filter(
         (UserOverlay.campaign_id.is_(None)) | (UserOverlay.campaign_id == campaign_id)
-    ).order_by(UserOverlay.campaign_id.asc()).all()
-
-    effective_data = base_data
-    is_disabled = False
-
-    for overlay in overlays:
-        if overlay.overlay_type == "disable":
-            is_disabled = True
-        elif overlay.overlay_type in ("modify", "homebrew"):
-            effective_data = deep_merge(effective_data, overlay.get_overlay_data())
+    ).order_by(UserOverlay.campaign_id.asc().nulls_first()).all()
 
+    effective_data, is_disabled = effective_service.merge_overlays(
+        result["entity_data"], overlays
+    )
     result["entity_data"] = effective_data
     result["is_disabled"] = is_disabled
     result["has_overlay"] = len(overlays) > 0
     return result
+
+
+def _materialized_dict(entity: RulesetEntity, row: EffectiveEntity | None) -> dict:
+    """apply_overlays' result from a materialized row (None: no overlays apply)."""
+    result = entity.to_dict()
+    if row is None:
+        result["entity_data"] = entity.get_entity_data()
+        result["is_disabled"] = False
+        result["has_overlay"] = False
+    else:
+        result["entity_data"] = row.get_entity_data()
+        result["is_disabled"] = row.is_disabled
+        result["has_overlay"] = True
+    return result
+
+
+def entity_ref(value: Any) -> str | None:
+    """Reference from a character's loose entity mention.
+
+    Characters store equipment, spells, class and species either as plain
+    strings or as objects like ``{"name": ..., "key": ...}``; the key wins.
+    """
+    if isinstance(value, dict):
+        value = value.get("key") or value.get("name")
+    return value if isinstance(value, str) and value else None
+
+
+# (ruleset_id, campaign_id) — the context an entity reference resolves in
+Scope = tuple[str, str | None]
+
+
+def resolve_entity_refs_batch(
+    user_id: str,
+    scopes: dict[Scope, dict[str, set[str]]],
+) -> dict[Scope, dict[tuple[str, str], dict]]:
+    """Resolve entity references for several scopes in one pass.
+
+    References are matched by source_key or, failing that, by name (the
+    ruleset's default source wins among name matches). All scopes share
+    one entity query and one overlay query, however many references,
+    types, rulesets or campaigns are involved.
+
+    Entity dicts are shared between scopes and references wherever the
+    effective data is the same — callers can dedupe by identity.
+
+    Args:
+        user_id: UUID of the user whose overlays apply.
+        scopes: (ruleset_id, campaign_id) -> entity type -> keys or names.
+
+    Returns:
+        Per scope, a mapping of (entity_type, ref) to the effective entity
+        dict (same shape as apply_overlays). Unresolved refs are absent.
+    """
+    wanted = {
+        scope: {t: {r for r in names if r} for t, names in refs.items()}
+        for scope, refs in scopes.items()
+    }
+    ruleset_ids = {scope[0] for scope, refs in wanted.items() if any(refs.values())}
+    types = {t for refs in wanted.values() for t, names in refs.items() if names}
+    names = {r for refs in wanted.values() for n in refs.values() for r in n}
+    resolved: dict[Scope, dict[tuple[str, str], dict]] = {scope: {} for scope in scopes}
+    if not names:
+        return resolved
+
+    default_sources = {
+        r.id: _get_default_source_key(r)
+        for r in Ruleset.query.filter(Ruleset.id.in_(ruleset_ids)).all()
+    }
+    candidates = RulesetEntity.query.filter(
+        RulesetEntity.ruleset_id.in_(ruleset_ids),
+        RulesetEntity.entity_type.in_(types),
+        (RulesetEntity.source_key.in_(names)) | (RulesetEntity.name.in_(names)),
+    ).order_by(RulesetEntity.source_key).all()
+
+    by_key: dict[tuple[str, str, str], RulesetEntity] = {}
+    by_name: dict[tuple[str, str, str], RulesetEntity] = {}
+    for e in candidates:
+        by_key[(e.ruleset_id, e.entity_type, e.source_key)] = e
+        slot = (e.ruleset_id, e.entity_type, e.name)
+        current = by_name.get(slot)
+        default = default_sources.get(e.ruleset_id)
+        if current is None or (e.document_key == default and current.document_key != default):
+            by_name[slot] = e
+
+    matched: dict[Scope, dict[tuple[str, str], RulesetEntity]] = {}
+    for scope, refs in wanted.items():
+        for entity_type, refs_of_type in refs.items():
+            for ref in refs_of_type:
+                slot = (scope[0], entity_type, ref)
+                entity = by_key.get(slot) or by_name.get(slot)
+                if entity is not None:
+                    matched.setdefault(scope, {})[(entity_type, ref)] = entity
+    if not matched:
+        return resolved
+
+    entities = {e.id: e for refs in matched.values() for e in refs.values()}
+    campaign_ids = {scope[1] for scope in matched if scope[1] is not None}
+    if effective_service.enabled():
+        rows = effective_service.lookup(user_id, entities, campaign_ids)
+        shared: dict[tuple[str, str | None], dict] = {}
+        for scope, refs in matched.items():
+            for ref_key, entity in refs.items():
+                row = effective_service.pick(rows, entity.id, scope[1])
+                cache_key = (entity.id, row.campaign_id if row else None)
+                if cache_key not in shared:
+                    shared[cache_key] = _materialized_dict(entity, row)
+                resolved[scope][ref_key] = shared[cache_key]
+        return resolved
+
+    scope_filter = UserOverlay.campaign_id.is_(None)
+    if campaign_ids:
+        scope_filter = scope_filter | UserOverlay.campaign_id.in_(campaign_ids)
+    overlays = UserOverlay.query.filter(
+        UserOverlay.user_id == user_id,
+        UserOverlay.ruleset_id.in_({e.ruleset_id for e in entities.values()}),
+        UserOverlay.entity_type.in_({e.entity_type for e in entities.values()}),
+        UserOverlay.source_key.in_({e.source_key for e in entities.values()}),
+        scope_filter,
+    ).all()
+    by_target: dict[tuple[str, str, str], list[UserOverlay]] = {}
+    # Global overlays first, then campaign-scoped, as in apply_overlays
+    for overlay in sorted(overlays, key=lambda o: o.campaign_id is not None):
+        target = (overlay.ruleset_id, overlay.entity_type, overlay.source_key)
+        by_target.setdefault(target, []).append(overlay)
+
+    effective_cache: dict[tuple[str, str | None], dict] = {}
+    for scope, refs in matched.items():
+        campaign_id = scope[1]
+        for ref_key, entity in refs.items():
+            target = (entity.ruleset_id, entity.entity_type, entity.source_key)
+            applicable = [
+                o for o in by_target.get(target, [])
+                if o.campaign_id is None or o.campaign_id == campaign_id
+            ]
+            # Campaigns without their own overlay share the global view
+            scoped = any(o.campaign_id for o in applicable)
+            cache_key = (entity.id, campaign_id if scoped else None)
+            if cache_key not in effective_cache:
+                result = entity.to_dict(include_data=True)
+                effective_data, is_disabled = effective_service.merge_overlays(
+                    result["entity_data"], applicable
+                )
+                result["entity_data"] = effective_data
+                result["is_disabled"] = is_disabled
+                result["has_overlay"] = len(applicable) > 0
+                effective_cache[cache_key] = result
+            resolved[scope][ref_key] = effective_cache[cache_key]
+    return resolved
+
+
+def resolve_entity_refs(
+    ruleset_id: str,
+    refs: dict[str, set[str]],
+    user_id: str,
+    campaign_id: str | None = None,
+) -> dict[tuple[str, str], dict]:
+    """Resolve entity references by key or name, with overlays applied.
+
+    Single-scope form of resolve_entity_refs_batch.
+
+    Args:
+        ruleset_id: UUID of the ruleset.
+        refs: Entity type -> set of keys or names to resolve.
+        user_id: UUID of the user whose overlays apply.
+        campaign_id: Optional campaign scope for overlay resolution.
+
+    Returns:
+        Mapping of (entity_type, ref) to the effective entity dict (same
+        shape as apply_overlays). Unresolved refs are absent.
+    """
+    scope = (ruleset_id, campaign_id)
+    return resolve_entity_refs_batch(user_id, {scope: refs})[scope]
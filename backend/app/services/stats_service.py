@@ -0,0 +1,561 @@
+"""Stats service — derived character stats with a version-keyed cache.
+
+Derived values (ability modifiers, proficiency, saves, AC, spellcasting,
+slot tables) are computed from the character's own fields plus the class,
+species and item entities it references. Each derivation declares the
+character inputs it reads and the derived fields it builds on, so a merge
+patch recomputes only what its changed paths reach.
+
+Results are stored on the character row (``derived_stats``) with the
+version they describe; a read is a cache hit when ``derived_version``
+equals ``version``. Edits to referenced ruleset entities or overlays do
+not bump the character version; instead, overlay writes and reseeds call
+invalidate(), which clears ``derived_version`` on the characters that may
+read the changed entities.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+from sqlalchemy import select, type_coerce, update
+from sqlalchemy.orm import load_only, undefer
+
+from app.extensions import db
+from app.models.campaign import Campaign
+from app.models.character import Character
+from app.services import effective_service, ruleset_service
+from app.services.ruleset_service import entity_ref
+from app.utils.database import cache_fill
+
+ABILITIES = ("str", "dex", "con", "int", "wis", "cha")
+
+# Spell slots per spell level for a full caster, by caster level 1-20
+_FULL_CASTER_SLOTS = [
+    [2], [3], [4, 2], [4, 3], [4, 3, 2], [4, 3, 3], [4, 3, 3, 1], [4, 3, 3, 2],
+    [4, 3, 3, 3, 1], [4, 3, 3, 3, 2], [4, 3, 3, 3, 2, 1], [4, 3, 3, 3, 2, 1],
+    [4, 3, 3, 3, 2, 1, 1], [4, 3, 3, 3, 2, 1, 1], [4, 3, 3, 3, 2, 1, 1, 1],
+    [4, 3, 3, 3, 2, 1, 1, 1], [4, 3, 3, 3, 2, 1, 1, 1, 1], [4, 3, 3, 3, 3, 1, 1, 1, 1],
+    [4, 3, 3, 3, 3, 2, 1, 1, 1], [4, 3, 3, 3, 3, 2, 2, 1, 1],
+]
+
+# Spellcasting by class name, used when the class entity does not declare
+# spellcasting_ability / caster_type itself
+_CASTERS = {
+    "artificer": ("int", "half"),
+    "bard": ("cha", "full"),
+    "cleric": ("wis", "full"),
+    "druid": ("wis", "full"),
+    "paladin": ("cha", "half"),
+    "ranger": ("wis", "half"),
+    "sorcerer": ("cha", "full"),
+    "warlock": ("cha", "pact"),
+    "wizard": ("int", "full"),
+}
+
+
+def _ability_key(value: Any) -> str | None:
+    """Normalize "Strength", "strength", "STR" or {"name": ...} to "str"."""
+    if isinstance(value, dict):
+        value = value.get("key") or value.get("name")
+    if not isinstance(value, str):
+        return None
+    key = value.strip().lower()[:3]
+    return key if key in ABILITIES else None
+
+
+def _int(value: Any, default: int | None = None) -> int | None:
+    return value if isinstance(value, int) and not isinstance(value, bool) else default
+
+
+class _Inputs:
+    """A character's inputs, parsed lazily, plus its resolved entity refs."""
+
+    def __init__(
+        self,
+        character: Character,
+        ruleset_id: str | None = None,
+        user_id: str | None = None,
+        entities: dict[tuple[str, str], dict] | None = None,
+    ) -> None:
+        self.character = character
+        self.level = max(1, min(_int(character.level, 1), 20))
+        self._ruleset_id = ruleset_id
+        self._user_id = user_id or character.user_id
+        self._entities = entities
+        self._parsed: dict[str, Any] = {}
+
+    def blob(self, field: str, default: Any) -> Any:
+        if field not in self._parsed:
+            raw = getattr(self.character, field)
+            self._parsed[field] = json.loads(raw) if raw else default
+        return self._parsed[field]
+
+    @property
+    def core(self) -> dict:
+        return self.blob("core_data", {})
+
+    @property
+    def class_data(self) -> dict:
+        return self.blob("class_data", {})
+
+    def refs(self, entity_type: str) -> set[str]:
+        """Entity references of one type made by this character."""
+        if entity_type == "class":
+            ref = entity_ref(self.class_data)
+            return {ref} if ref else set()
+        if entity_type == "species":
+            ref = entity_ref(self.core.get("species"))
+            return {ref} if ref else set()
+        if entity_type == "item":
+            return {
+                ref for item in self.blob("equipment", [])
+                if not (isinstance(item, dict) and item.get("equipped") is False)
+                and (ref := entity_ref(item))
+            }
+        return set()
+
+    def prefetch(self, entity_types: set[str]) -> None:
+        """Resolve all refs of the given types in one batch (skipped if injected)."""
+        if self._entities is not None or not entity_types:
+            return
+        refs = {t: self.refs(t) for t in entity_types}
+        if not any(refs.values()):
+            self._entities = {}
+            return
+        if self._ruleset_id is None:
+            self._ruleset_id = (
+                db.session.query(Campaign.ruleset_id)
+                .filter_by(id=self.character.campaign_id)
+                .scalar()
+            )
+        self._entities = ruleset_service.resolve_entity_refs(
+            self._ruleset_id, refs, self._user_id, self.character.campaign_id
+        )
+
+    def entity(self, entity_type: str, ref: str | None) -> dict:
+        """Effective entity_data for a ref, or {} if unresolved or disabled."""
+        if ref is None or not self._entities:
+            return {}
+        entity = self._entities.get((entity_type, ref))
+        if not entity or entity.get("is_disabled"):
+            return {}
+        return entity["entity_data"]
+
+    def class_entity(self) -> dict:
+        return self.entity("class", entity_ref(self.class_data))
+
+
+@dataclass(frozen=True)
+class _Derivation:
+    field: str
+    inputs: tuple[str, ...]  # character input paths read, e.g. "core_data.ability_scores"
+    needs: tuple[str, ...]  # derived fields read
+    entities: tuple[str, ...]  # entity types resolved
+    fn: Callable[[_Inputs, dict[str, Any]], Any]
+
+
+# Registration order is evaluation order: needs must be registered first
+_DERIVATIONS: list[_Derivation] = []
+
+
+def _derived(
+    field: str,
+    inputs: tuple[str, ...] = (),
+    needs: tuple[str, ...] = (),
+    entities: tuple[str, ...] = (),
+) -> Callable:
+    def register(fn: Callable[[_Inputs, dict[str, Any]], Any]) -> Callable:
+        _DERIVATIONS.append(_Derivation(field, inputs, needs, entities, fn))
+        return fn
+    return register
+
+
+@_derived("ability_modifiers", inputs=("core_data.ability_scores",))
+def _ability_modifiers(inp: _Inputs, d: dict) -> dict[str, int]:
+    raw = inp.core.get("ability_scores") or {}
+    scores = {a: 10 for a in ABILITIES}
+    for key, value in raw.items():
+        ability = _ability_key(key)
+        if ability and _int(value) is not None:
+            scores[ability] = value
+    return {a: (score - 10) // 2 for a, score in scores.items()}
+
+
+@_derived("proficiency_bonus", inputs=("level",))
+def _proficiency_bonus(inp: _Inputs, d: dict) -> int:
+    return (inp.level - 1) // 4 + 2
+
+
+@_derived(
+    "saving_throws", inputs=("class_data",),
+    needs=("ability_modifiers", "proficiency_bonus"), entities=("class",),
+)
+def _saving_throws(inp: _Inputs, d: dict) -> dict[str, int]:
+    listed = inp.class_entity().get("saving_throws") or inp.class_data.get("saving_throws") or []
+    proficient = {_ability_key(s) for s in listed} if isinstance(listed, list) else set()
+    mods = d["ability_modifiers"]
+    return {a: mods[a] + (d["proficiency_bonus"] if a in proficient else 0) for a in ABILITIES}
+
+
+def _armor(item: dict) -> tuple[str, int, bool, int | None] | None:
+    """(kind, base, adds dex, dex cap) for armor-like item data, else None."""
+    armor = item.get("armor")
+    if isinstance(armor, dict) and _int(armor.get("ac_base")) is not None:
+        category = str(armor.get("category") or "").lower()
+        kind = "shield" if "shield" in category else "body"
+        return (kind, armor["ac_base"], bool(armor.get("ac_add_dexmod", kind == "body")),
+                _int(armor.get("ac_cap_dexmod")))
+    category = item.get("category")
+    category = str(category.get("name") if isinstance(category, dict) else category).lower()
+    if _int(item.get("armor_class")) is not None and ("armor" in category or "shield" in category):
+        if "shield" in category or "shield" in str(item.get("name", "")).lower():
+            return ("shield", item["armor_class"], False, None)
+        return ("body", item["armor_class"], True, None)
+    return None
+
+
+@_derived(
+    "armor_class", inputs=("equipment", "core_data.ac"),
+    needs=("ability_modifiers",), entities=("item",),
+)
+def _armor_class(inp: _Inputs, d: dict) -> int:
+    dex = d["ability_modifiers"]["dex"]
+    body: int | None = None
+    shield = 0
+    for ref in inp.refs("item"):
+        armor = _armor(inp.entity("item", ref))
+        if armor is None:
+            continue
+        kind, base, adds_dex, cap = armor
+        if kind == "shield":
+            shield = max(shield, base)
+            continue
+        bonus = (min(dex, cap) if cap is not None else dex) if adds_dex else 0
+        body = max(body or 0, base + bonus)
+    if body is None:
+        body = _int(inp.core.get("ac"), 10 + dex)
+    return body + shield
+
+
+@_derived("initiative", inputs=("core_data.initiative_bonus",), needs=("ability_modifiers",))
+def _initiative(inp: _Inputs, d: dict) -> int:
+    return d["ability_modifiers"]["dex"] + _int(inp.core.get("initiative_bonus"), 0)
+
+
+@_derived("passive_perception", needs=("ability_modifiers",))
+def _passive_perception(inp: _Inputs, d: dict) -> int:
+    return 10 + d["ability_modifiers"]["wis"]
+
+
+@_derived("speed", inputs=("core_data.speed", "core_data.species"), entities=("species",))
+def _speed(inp: _Inputs, d: dict) -> int:
+    speed = _int(inp.core.get("speed"))
+    if speed is not None:
+        return speed
+    species_speed = inp.entity("species", entity_ref(inp.core.get("species"))).get("speed")
+    if isinstance(species_speed, dict):
+        species_speed = species_speed.get("walk")
+    return _int(species_speed, 30)
+
+
+@_derived("hit_dice", inputs=("level", "class_data"), entities=("class",))
+def _hit_dice(inp: _Inputs, d: dict) -> str | None:
+    die = inp.class_entity().get("hit_dice") or inp.class_data.get("hit_dice")
+    if not isinstance(die, str) or "d" not in die.lower():
+        return None
+    sides = die.lower().rsplit("d", 1)[1]
+    return f"{inp.level}d{sides}" if sides.isdigit() else None
+
+
+def _caster(inp: _Inputs) -> tuple[str, str] | None:
+    """(spellcasting ability, caster type) for the character's class."""
+    for data in (inp.class_entity(), inp.class_data):
+        ability = _ability_key(data.get("spellcasting_ability"))
+        caster_type = data.get("caster_type")
+        if ability and caster_type in ("full", "half", "pact"):
+            return ability, caster_type
+    ref = (entity_ref(inp.class_data) or "").lower()
+    for name, caster in _CASTERS.items():
+        if name in ref:
+            return caster
+    return None
+
+
+@_derived(
+    "spellcasting", inputs=("class_data",),
+    needs=("ability_modifiers", "proficiency_bonus"), entities=("class",),
+)
+def _spellcasting(inp: _Inputs, d: dict) -> dict[str, Any] | None:
+    caster = _caster(inp)
+    if caster is None:
+        return None
+    ability, caster_type = caster
+    mod = d["ability_modifiers"][ability]
+    return {
+        "ability": ability,
+        "caster_type": caster_type,
+        "save_dc": 8 + d["proficiency_bonus"] + mod,
+        "attack_bonus": d["proficiency_bonus"] + mod,
+    }
+
+
+@_derived("spell_slots", inputs=("level",), needs=("spellcasting",))
+def _spell_slots(inp: _Inputs, d: dict) -> dict[str, int]:
+    casting = d["spellcasting"]
+    if not casting or casting["caster_type"] == "pact":
+        return {}
+    caster_level = inp.level if casting["caster_type"] == "full" else (inp.level + 1) // 2
+    if casting["caster_type"] == "half" and inp.level < 2:
+        return {}
+    slots = _FULL_CASTER_SLOTS[caster_level - 1]
+    return {str(i + 1): n for i, n in enumerate(slots)}
+
+
+@_derived("pact_slots", inputs=("level",), needs=("spellcasting",))
+def _pact_slots(inp: _Inputs, d: dict) -> dict[str, int] | None:
+    casting = d["spellcasting"]
+    if not casting or casting["caster_type"] != "pact":
+        return None
+    count = 1 if inp.level == 1 else 2 if inp.level <= 10 else 3 if inp.level <= 16 else 4
+    return {"count": count, "level": min(5, (inp.level + 1) // 2)}
+
+
+_FIELDS = {der.field for der in _DERIVATIONS}
+
+# Entity types any derivation resolves; changes to other types never stale stats
+_ENTITY_TYPES = {t for der in _DERIVATIONS for t in der.entities}
+
+
+def _overlaps(path: str, input_path: str) -> bool:
+    return (path == input_path or path.startswith(input_path + ".")
+            or input_path.startswith(path + "."))
+
+
+def _changed_paths(changed: dict[str, Any]) -> set[str]:
+    """Input paths touched by a merge patch (one level into core/class data)."""
+    paths = set()
+    for field, value in changed.items():
+        if field in ("core_data", "class_data") and isinstance(value, dict):
+            paths.update(f"{field}.{key}" for key in value)
+        else:
+            paths.add(field)
+    return paths
+
+
+def _affected(paths: set[str]) -> set[str]:
+    """Derived fields reached by the changed input paths, transitively."""
+    hit: set[str] = set()
+    for der in _DERIVATIONS:
+        if hit.intersection(der.needs) or any(
+            _overlaps(p, i) for p in paths for i in der.inputs
+        ):
+            hit.add(der.field)
+    return hit
+
+
+def _compute(
+    inputs: _Inputs,
+    previous: dict[str, Any] | None = None,
+    fields: set[str] | None = None,
+) -> dict[str, Any]:
+    """Run derivations (all, or only ``fields``) over inputs, reusing previous."""
+    todo = [der for der in _DERIVATIONS if fields is None or der.field in fields]
+    inputs.prefetch({t for der in todo for t in der.entities})
+    derived = dict(previous or {})
+    for der in todo:
+        derived[der.field] = der.fn(inputs, derived)
+    return derived
+
+
+def _cached(character: Character) -> dict[str, Any] | None:
+    """Stored stats if they describe the current version and are complete."""
+    if character.derived_version != character.version or not character.derived_stats:
+        return None
+    stats = json.loads(character.derived_stats)
+    return stats if _FIELDS.issubset(stats) else None
+
+
+def _store(character_id: str, version: int, stats: dict[str, Any]) -> None:
+    """Write stats for a version without bumping it or touching updated_at."""
+    table = Character.__table__
+    db.session.execute(
+        update(table)
+        .where(table.c.id == character_id, table.c.version == version)
+        .values(
+            derived_stats=json.dumps(stats),
+            derived_version=version,
+            updated_at=table.c.updated_at,
+        )
+    )
+
+
+def invalidate(keys: Iterable[effective_service.EntityKey], user_id: str | None = None) -> None:
+    """Clear cached stats that may read the given entities.
+
+    Call after changing overlays (pass the owner's user_id) or base entities
+    (user_id None: every user), before committing. References also match
+    by name, which an overlay can change, so every character in a campaign
+    on an affected ruleset is cleared, not only those naming the key.
+    Does not commit.
+    """
+    ruleset_ids = {ruleset_id for ruleset_id, entity_type, _ in keys
+                   if entity_type in _ENTITY_TYPES}
+    if not ruleset_ids:
+        return
+    table = Character.__table__
+    stmt = (
+        update(table)
+        .where(
+            table.c.derived_version.is_not(None),
+            table.c.campaign_id.in_(
+                select(Campaign.id).where(Campaign.ruleset_id.in_(ruleset_ids))
+            ),
+        )
+        .values(derived_version=None, updated_at=table.c.updated_at)
+    )
+    if user_id is not None:
+        stmt = stmt.where(table.c.user_id == user_id)
+    db.session.execute(stmt)
+
+
+def get_character_stats(
+    character_id: str, user_id: str, refresh: bool = False
+) -> dict | None:
+    """Get a character's derived stats, computing and caching them if stale.
+
+    Args:
+        character_id: UUID of the character.
+        user_id: UUID of the requesting user.
+        refresh: Recompute even if the cache matches the version.
+
+    Returns:
+        Dict with character_id, version and stats, or None if not found.
+    """
+    character = (
+        Character.query.options(undefer(Character.derived_stats))
+        .filter_by(id=character_id, user_id=user_id)
+        .first()
+    )
+    if not character:
+        return None
+
+    result = {"character_id": character.id, "version": character.version}
+    stats = None if refresh else _cached(character)
+    if stats is None:
+        stats = _compute(_Inputs(character, user_id=user_id))
+        with cache_fill():
+            _store(character.id, character.version, stats)
+            db.session.commit()
+    result["stats"] = stats
+    return result
+
+
+def get_party_stats(campaign_id: str, user_id: str, refresh: bool = False) -> list[dict]:
+    """Derived stats for every character in a campaign, in one read when cached.
+
+    Blob columns are only loaded for characters whose cache is stale, and
+    their entity references are resolved together in one batch.
+
+    Args:
+        campaign_id: UUID of the campaign.
+        user_id: UUID of the requesting user (campaign owner).
+        refresh: Recompute every character, even where the cache matches.
+
+    Returns:
+        List of dicts with id, name, character_type, level, version,
+        hp_current, hp_max and stats, sorted by initiative (highest first).
+
+    Raises:
+        LookupError: If campaign not found or not owned by user.
+    """
+    campaign = Campaign.query.filter_by(id=campaign_id, user_id=user_id).first()
+    if not campaign:
+        raise LookupError("Campaign not found")
+
+    core = type_coerce(Character.core_data, db.JSON)
+    rows = (
+        db.session.query(
+            Character,
+            core["hp_current"].as_integer(),
+            core["hp_max"].as_integer(),
+        )
+        .options(
+            load_only(
+                Character.id, Character.name, Character.character_type, Character.level,
+                Character.version, Character.derived_version, Character.derived_stats,
+            ),
+            undefer(Character.derived_stats),
+        )
+        .filter(Character.campaign_id == campaign_id)
+        .all()
+    )
+
+    stats_by_id = {}
+    stale_ids = []
+    for character, _, _ in rows:
+        stats = None if refresh else _cached(character)
+        if stats is None:
+            stale_ids.append(character.id)
+        else:
+            stats_by_id[character.id] = stats
+
+    if stale_ids:
+        stale = Character.query.filter(Character.id.in_(stale_ids)).all()
+        # One batch resolves every stale character's refs; filled below
+        entities: dict[tuple[str, str], dict] = {}
+        inputs = [_Inputs(c, campaign.ruleset_id, user_id, entities) for c in stale]
+        refs: dict[str, set[str]] = {}
+        for inp in inputs:
+            for entity_type in _ENTITY_TYPES:
+                refs.setdefault(entity_type, set()).update(inp.refs(entity_type))
+        entities.update(ruleset_service.resolve_entity_refs(
+            campaign.ruleset_id, refs, user_id, campaign_id
+        ))
+        with cache_fill():
+            for inp in inputs:
+                stats = _compute(inp)
+                _store(inp.character.id, inp.character.version, stats)
+                stats_by_id[inp.character.id] = stats
+
+    party = [
+        {
+            "id": character.id,
+            "name": character.name,
+            "character_type": character.character_type,
+            "level": character.level,
+            "version": character.version,
+            "hp_current": hp_current,
+            "hp_max": hp_max,
+            "stats": stats_by_id[character.id],
+        }
+        for character, hp_current, hp_max in rows
+    ]
+    party.sort(key=lambda c: (-c["stats"]["initiative"], c["name"]))
+    if stale_ids:
+        with cache_fill():
+            db.session.commit()
+    return party
+
+
+def carry_over_patch(character: Character, changed: dict[str, Any]) -> None:
+    """Carry cached stats across a merge patch, recomputing only what it reaches.
+
+    Call after the patch is applied to the character but before its commit:
+    the stats are written in the same UPDATE and tagged with the version
+    that commit assigns. Does nothing when there is no fresh cache to carry.
+
+    Args:
+        character: The patched, not yet committed character.
+        changed: Effective merge patch returned by the patch.
+    """
+    # An autoflush here would commit the patch early and bump the version twice
+    with db.session.no_autoflush:
+        previous = _cached(character)
+        if previous is None:
+            return
+        fields = _affected(_changed_paths(changed))
+        if fields:
+            character.derived_stats = json.dumps(_compute(_Inputs(character), previous, fields))
+        # version_id_col bumps version by exactly one on the patch's flush
+        character.derived_version = character.version + 1
@@ -0,0 +1,129 @@
+"""HTTP response compression negotiated from Accept-Encoding.
+
+gzip is always available; brotli (``br``) and zstd are used when the
+``brotli`` / ``zstandard`` packages are installed. Among the encodings a
+client accepts, the highest quality wins, with ties going to the better
+codec (br, then zstd, then gzip).
+
+Two levels are used: FAST for per-request compression in the after-request
+hook, and BEST for bodies compressed once and cached (see response_cache).
+
+A strong ETag names exact bytes, so the hook weakens it on the bodies it
+compresses: the identity and compressed bodies share one version but are
+different representations.
+"""
+
+import gzip
+from typing import Callable
+
+from flask import Flask, Response, current_app, request
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+FAST = "fast"
+BEST = "best"
+
+# Preference order for equal client quality
+_CODECS: dict[str, dict[str, Callable[[bytes], bytes]]] = {}
+if brotli is not None:
+    _CODECS["br"] = {
+        FAST: lambda b: brotli.compress(b, quality=5),
+        BEST: lambda b: brotli.compress(b, quality=11),
+    }
+if zstandard is not None:
+    _CODECS["zstd"] = {
+        FAST: lambda b: zstandard.ZstdCompressor(level=3).compress(b),
+        BEST: lambda b: zstandard.ZstdCompressor(level=19).compress(b),
+    }
+_CODECS["gzip"] = {
+    FAST: lambda b: gzip.compress(b, compresslevel=6, mtime=0),
+    BEST: lambda b: gzip.compress(b, compresslevel=9, mtime=0),
+}
+
+ENCODINGS: tuple[str, ...] = tuple(_CODECS)
+
+_COMPRESSIBLE = ("application/json", "text/", "application/javascript")
+
+
+def negotiate() -> str | None:
+    """Pick the content encoding for the current request, or None for identity.
+
+    Always None when COMPRESS_RESPONSES is off, so pre-compressed bodies
+    are not served either.
+    """
+    if not current_app.config.get("COMPRESS_RESPONSES", True):
+        return None
+    accepted = request.accept_encodings
+    best, best_q = None, 0.0
+    for encoding in ENCODINGS:
+        q = accepted.quality(encoding)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str, level: str = FAST) -> bytes:
+    """Compress body with one of ENCODINGS."""
+    return _CODECS[encoding][level](body)
+
+
+def add_vary(response: Response) -> None:
+    """Mark a response as varying by Accept-Encoding."""
+    response.vary.add("Accept-Encoding")
+
+
+def _weaken_etag(response: Response) -> None:
+    tag, weak = response.get_etag()
+    if tag is not None and not weak:
+        response.set_etag(tag, weak=True)
+
+
+def init_compression(app: Flask) -> None:
+    """Compress eligible responses after each request (COMPRESS_RESPONSES).
+
+    Skips streamed and already-encoded responses, bodies under
+    COMPRESS_MIN_BYTES, non-text types and ``Cache-Control: no-transform``.
+    """
+    if not app.config.get("COMPRESS_RESPONSES", True):
+        return
+    min_bytes = app.config.get("COMPRESS_MIN_BYTES", 1024)
+
+    @app.after_request
+    def _compress(response: Response) -> Response:
+        if response.status_code == 304:
+            # Echo the validator in the form the client holds: weak if its
+            # cached copy came from a compressed response
+            tag, _ = response.get_etag()
+            held = request.if_none_match
+            if tag and held.is_weak(tag) and not held.is_strong(tag):
+                _weaken_etag(response)
+            return response
+        if (
+            response.direct_passthrough
+            or response.is_streamed
+            or response.status_code < 200
+            or response.status_code in (204, 206, 304)
+            or "Content-Encoding" in response.headers
+            or not (response.mimetype or "").startswith(_COMPRESSIBLE)
+            or response.cache_control.no_transform
+        ):
+            return response
+        body = response.get_data()
+        if len(body) < min_bytes:
+            return response
+        add_vary(response)
+        encoding = negotiate()
+        if encoding is None:
+            return response
+        response.set_data(compress(body, encoding))
+        response.headers["Content-Encoding"] = encoding
+        _weaken_etag(response)
+        return response
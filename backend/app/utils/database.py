@@ -0,0 +1,334 @@
+"""Database engine setup — SQLite production profile and read routing.
+
+With SQLITE_PROFILE=production and a file-backed SQLite URI, every new
+connection is tuned on connect:
+
+- ``journal_mode=WAL`` so readers never block the writer or each other.
+- ``synchronous=NORMAL`` (durable at checkpoints; safe with WAL).
+- ``cache_size``, ``mmap_size`` and ``temp_store=MEMORY`` from config.
+- ``busy_timeout`` so a second writer waits instead of failing with
+  "database is locked".
+
+The profile also adds a ``read`` bind: a separate pool of
+SQLITE_READ_POOL_SIZE connections to the same file, opened with
+``query_only``.
+
+Engines for server databases (PostgreSQL, MySQL) get their pool sizing
+from the DB_POOL_* settings and ``pool_pre_ping``, so connections dropped
+by the server or a proxy are replaced instead of failing a request.
+
+DATABASE_REPLICA_URL adds a ``replica`` bind: a second database (a
+Postgres replica, or a SQLite file refreshed by ``flask snapshot-replica``)
+that may lag the primary.
+
+RoutingSession picks the engine per statement:
+
+1. Flushes and DML go to the primary, and the session stays on the
+   primary until the transaction ends so it reads its own writes.
+2. Inside a ``replica_reads`` function, reads go to the replica unless
+   the client wrote recently (read-your-writes, below).
+3. While serving GET/HEAD, reads go to the ``read`` pool.
+4. Everything else goes to the primary.
+
+A request that writes to the primary pins its user to the primary for
+REPLICA_STICKY_SECONDS, which should exceed the replica's lag: the
+deadline is stored on the user row (``users.primary_reads_until``), so it
+follows the bearer token to every worker and needs no cookie. The auth
+lookup loads it with the user, so checking it costs no query. Writes
+inside ``cache_fill()`` (derived data stored by a read, such as cached
+character stats) do not pin.
+
+pysqlite only opens a transaction right before the first DML statement,
+so a session that merely reads never holds the write lock, and writers
+queue on ``busy_timeout``.
+"""
+
+import contextlib
+import contextvars
+import functools
+import logging
+import os
+import sqlite3
+import time
+from typing import Any, Callable, Iterator, TypeVar
+
+import sqlalchemy as sa
+from flask import Flask, Response, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.sql.dml import UpdateBase
+
+logger = logging.getLogger(__name__)
+
+READ_BIND = "read"
+REPLICA_BIND = "replica"
+
+_READ_METHODS = ("GET", "HEAD")
+
+_replica_scope: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "replica_scope", default=False
+)
+_cache_fill: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "cache_fill", default=False
+)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def replica_reads(fn: F) -> F:
+    """Let a read-only service function read from the replica, if configured."""
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        token = _replica_scope.set(True)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _replica_scope.reset(token)
+    return wrapper  # type: ignore[return-value]
+
+
+@contextlib.contextmanager
+def cache_fill() -> Iterator[None]:
+    """Write derived data without sending the client to the primary.
+
+    The writes still go to the primary, but they only store what any read
+    would compute the same way, so the client has nothing to read back
+    and its replica reads need not become sticky.
+    """
+    token = _cache_fill.set(True)
+    try:
+        yield
+    finally:
+        _cache_fill.reset(token)
+
+
+def _pinned_until() -> float:
+    """The authenticated user's primary_reads_until, or 0.0 without a user.
+
+    Read from the already-loaded row, never with a refresh query: that
+    query would route through get_bind, and so back here.
+    """
+    if "primary_reads_until" not in g:
+        user = getattr(request, "current_user", None)
+        loaded = sa.inspect(user).dict if user is not None else {}
+        g.primary_reads_until = loaded.get("primary_reads_until") or 0.0
+    return g.primary_reads_until
+
+
+def _sticky() -> bool:
+    """Whether this request's user wrote recently enough to need primary reads."""
+    if not has_request_context():
+        return False
+    if g.get("wrote_primary"):
+        return True
+    return _pinned_until() > time.time()
+
+
+class RoutingSession(Session):
+    """Session that routes reads to the replica and read pool (see module doc)."""
+
+    _wrote = False
+
+    def get_bind(
+        self,
+        mapper: Any | None = None,
+        clause: Any | None = None,
+        bind: sa.engine.Engine | sa.engine.Connection | None = None,
+        **kwargs: Any,
+    ) -> sa.engine.Engine | sa.engine.Connection:
+        engines = self._db.engines
+        if bind is None and len(engines) > 1:
+            if self._flushing or isinstance(clause, UpdateBase):
+                # Stay on the primary until the transaction ends, so later
+                # reads see this transaction's own writes
+                self._wrote = True
+                if has_request_context() and not _cache_fill.get():
+                    g.wrote_primary = True
+            elif not self._wrote:
+                if REPLICA_BIND in engines and _replica_scope.get() and not _sticky():
+                    return engines[REPLICA_BIND]
+                if (
+                    READ_BIND in engines
+                    and has_request_context()
+                    and request.method in _READ_METHODS
+                ):
+                    return engines[READ_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _reset_routing(session: RoutingSession, transaction: sa.orm.SessionTransaction) -> None:
+    if transaction.parent is None:
+        session._wrote = False
+
+
+def _sqlite_path(uri: str) -> str | None:
+    """Database file of a SQLite URI, or None (other backends, in-memory)."""
+    url = make_url(uri)
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    return url.database
+
+
+def _sqlite_profile(app: Flask) -> bool:
+    """Whether the production profile applies (it needs a SQLite file)."""
+    return (
+        app.config.get("SQLITE_PROFILE") == "production"
+        and _sqlite_path(app.config["SQLALCHEMY_DATABASE_URI"]) is not None
+    )
+
+
+def _pool_options(app: Flask, uri: str) -> dict[str, Any]:
+    """Engine pool options for a server database; SQLite keeps its defaults."""
+    if make_url(uri).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": app.config.get("DB_POOL_SIZE", 5),
+        "max_overflow": app.config.get("DB_MAX_OVERFLOW", 10),
+        "pool_timeout": app.config.get("DB_POOL_TIMEOUT", 30),
+        "pool_recycle": app.config.get("DB_POOL_RECYCLE", 1800),
+        "pool_pre_ping": True,
+    }
+
+
+def configure_database(app: Flask) -> None:
+    """Add pool options and the read and replica binds from config.
+
+    Call before ``db.init_app``; engines are created from this config.
+    """
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        **_pool_options(app, app.config["SQLALCHEMY_DATABASE_URI"]),
+        **(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {}),
+    }
+    binds = dict(app.config.get("SQLALCHEMY_BINDS") or {})
+    pool_size = app.config.get("SQLITE_READ_POOL_SIZE", 8)
+    if _sqlite_profile(app) and pool_size > 0:
+        binds[READ_BIND] = {
+            "url": app.config["SQLALCHEMY_DATABASE_URI"],
+            "pool_size": pool_size,
+            "max_overflow": pool_size,
+        }
+    replica_url = app.config.get("DATABASE_REPLICA_URL")
+    if replica_url:
+        binds[REPLICA_BIND] = {"url": replica_url, **_pool_options(app, replica_url)}
+    if binds:
+        app.config["SQLALCHEMY_BINDS"] = binds
+
+
+def _pragmas(app: Flask, wal: bool, query_only: bool) -> list[str]:
+    statements = ["PRAGMA journal_mode=WAL", "PRAGMA synchronous=NORMAL"] if wal else []
+    statements += [
+        f"PRAGMA cache_size=-{int(app.config.get('SQLITE_CACHE_MB', 64) * 1024)}",
+        f"PRAGMA mmap_size={int(app.config.get('SQLITE_MMAP_MB', 256) * 1024 * 1024)}",
+        f"PRAGMA busy_timeout={int(app.config.get('SQLITE_BUSY_TIMEOUT_MS', 5000))}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+    if query_only:
+        statements.append("PRAGMA query_only=ON")
+    return statements
+
+
+def _tune(engine: Engine, statements: list[str]) -> None:
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        for statement in statements:
+            cursor.execute(statement)
+        cursor.close()
+
+
+def _pin_writers_to_primary(app: Flask) -> None:
+    seconds = int(app.config.get("REPLICA_STICKY_SECONDS", 10))
+
+    @app.after_request
+    def _stick_to_primary(response: Response) -> Response:
+        user = getattr(request, "current_user", None)
+        if not g.get("wrote_primary") or user is None:
+            return response
+        until = time.time() + seconds
+        # A burst of writes renews the pin at most twice per window
+        if _pinned_until() > until - seconds / 2:
+            return response
+
+        from app.extensions import db
+        from app.models.user import User
+
+        try:
+            db.session.execute(
+                sa.update(User)
+                .where(User.id == user.id)
+                .values(primary_reads_until=until, updated_at=User.updated_at)
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+        except SQLAlchemyError:
+            # The write itself succeeded; worst case is a stale replica read
+            db.session.rollback()
+            logger.warning("Could not pin user %s to the primary", user.id, exc_info=True)
+        return response
+
+
+def init_database(app: Flask) -> None:
+    """Initialize Flask-SQLAlchemy, tune SQLite engines and set up routing.
+
+    Called by create_app().
+    """
+    from app.extensions import db
+
+    configure_database(app)
+    db.init_app(app)
+    with app.app_context():
+        engines = db.engines
+    if _sqlite_profile(app):
+        _tune(engines[None], _pragmas(app, wal=True, query_only=False))
+    if READ_BIND in engines:
+        _tune(engines[READ_BIND], _pragmas(app, wal=True, query_only=True))
+    if REPLICA_BIND in engines:
+        if _sqlite_path(app.config["DATABASE_REPLICA_URL"]):
+            _tune(engines[REPLICA_BIND], _pragmas(app, wal=False, query_only=True))
+        _pin_writers_to_primary(app)
+
+
+def dispose_after_fork(app: Flask) -> None:
+    """Drop pooled connections inherited from the parent process.
+
+    Call in each worker forked from a process that preloaded the app.
+    ``close=False`` leaves the parent's sockets and SQLite handles alone,
+    so the child never closes or reuses a connection it does not own.
+    """
+    from app.extensions import db
+
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def snapshot_sqlite_replica(app: Flask) -> str:
+    """Copy the SQLite primary into the SQLite replica file, in place.
+
+    Uses SQLite's online backup, so the primary stays writable and replica
+    readers see either the old or the new copy, never a partial one.
+
+    Returns:
+        Path of the replica file.
+
+    Raises:
+        ValueError: If the primary or replica is not a SQLite file.
+    """
+    primary = _sqlite_path(app.config["SQLALCHEMY_DATABASE_URI"])
+    replica = _sqlite_path(app.config.get("DATABASE_REPLICA_URL") or "sqlite://")
+    if primary is None or replica is None:
+        raise ValueError("Snapshots need a SQLite file for both primary and replica")
+    if os.path.abspath(primary) == os.path.abspath(replica):
+        raise ValueError("DATABASE_REPLICA_URL points at the primary database")
+    timeout = app.config.get("SQLITE_BUSY_TIMEOUT_MS", 5000) / 1000
+    source = sqlite3.connect(primary, timeout=timeout)
+    target = sqlite3.connect(replica, timeout=timeout)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+    return replica
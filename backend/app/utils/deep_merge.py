@@ -1,10 +1,170 @@
-def deep_merge(base: dict, overlay: dict) -> dict:
-    """Deep merge overlay into base, returning a new dict.
-    Overlay values take precedence. Nested dicts are merged recursively."""
-    result = base.copy()
-    for key, value in overlay.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = deep_merge(result[key], value)
+"""Deep merge for overlay data, with structural sharing.
+
+Overlay values take precedence and nested dicts merge recursively. A few
+directive objects change what happens at a key instead of setting it:
+
+- ``{"$delete": true}`` removes the key.
+- ``{"$append": [...]}`` appends items to the list at the key.
+- ``{"$merge": [...], "$key": "name"}`` merges a list of objects by the
+  ``$key`` field (default ``"name"``): matching items are deep-merged,
+  items with ``"$delete": true`` are removed, and the rest are appended.
+
+Results share every subtree no overlay touches with the base (and with
+the overlays), so treat inputs and results as immutable. Malformed
+directives (see check_directives) are ignored when merging, so one bad
+overlay cannot break reads of its entity.
+"""
+
+from typing import Any
+
+_MISSING = object()
+
+_DIRECTIVES = ("$delete", "$append", "$merge")
+
+
+def _is_directive(value: Any) -> bool:
+    return isinstance(value, dict) and any(d in value for d in _DIRECTIVES)
+
+
+def _hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+def check_directives(data: Any, path: str = "overlay_data") -> None:
+    """Validate the directive objects anywhere in an overlay document.
+
+    Raises:
+        ValueError: If a directive has the wrong shape: ``$delete`` not a
+            boolean, ``$append`` or ``$merge`` not an array, ``$key`` not
+            a string, or a ``$merge`` item whose key value is an array or
+            object.
+    """
+    if not isinstance(data, dict):
+        return
+    if "$delete" in data and not isinstance(data["$delete"], bool):
+        raise ValueError(f"{path}: $delete must be true or false")
+    if "$append" in data and not isinstance(data["$append"], list):
+        raise ValueError(f"{path}: $append must be an array")
+    if "$merge" in data:
+        if not isinstance(data["$merge"], list):
+            raise ValueError(f"{path}: $merge must be an array")
+        key = data.get("$key", "name")
+        if not isinstance(key, str):
+            raise ValueError(f"{path}: $key must be a string")
+        for i, item in enumerate(data["$merge"]):
+            if isinstance(item, dict) and not _hashable(item.get(key)):
+                raise ValueError(f"{path}.$merge[{i}]: {key} must be a scalar")
+            check_directives(item, f"{path}.$merge[{i}]")
+    for key, value in data.items():
+        if key not in _DIRECTIVES:
+            check_directives(value, f"{path}.{key}")
+
+
+def _merge_list(current: Any, directive: dict) -> Any:
+    key = directive.get("$key", "name")
+    if not isinstance(directive["$merge"], list) or not _hashable(key):
+        return current
+    items = list(current) if isinstance(current, list) else []
+    index = {
+        item[key]: i for i, item in enumerate(items)
+        if isinstance(item, dict) and key in item and _hashable(item[key])
+    }
+    deleted = set()
+    for patch in directive["$merge"]:
+        if not isinstance(patch, dict):
+            items.append(patch)
+            continue
+        match = patch.get(key)
+        i = index.get(match) if _hashable(match) else None
+        delete = patch.get("$delete") is True
+        patch = {k: v for k, v in patch.items() if k != "$delete"}
+        if i is None:
+            if not delete:
+                items.append(_merge({}, [patch]))
+        elif delete:
+            deleted.add(i)
+        else:
+            items[i] = _merge(items[i], [patch])
+    if deleted:
+        items = [item for i, item in enumerate(items) if i not in deleted]
+    return items
+
+
+def _apply_directive(current: Any, directive: dict) -> Any:
+    if directive.get("$delete") is True:
+        return _MISSING
+    if "$append" in directive:
+        if not isinstance(directive["$append"], list):
+            return current
+        base = list(current) if isinstance(current, list) else []
+        return base + directive["$append"]
+    if "$merge" in directive:
+        return _merge_list(current, directive)
+    return current
+
+
+def _resolve(current: Any, values: list[Any]) -> Any:
+    """Apply one key's overlay values, in order, to its current value."""
+    pending: list[dict] = []
+    for value in values:
+        if isinstance(value, dict) and not _is_directive(value):
+            pending.append(value)
+            continue
+        if pending:
+            current = _merge(current if isinstance(current, dict) else {}, pending)
+            pending = []
+        current = _apply_directive(current, value) if isinstance(value, dict) else value
+    if pending:
+        current = _merge(current if isinstance(current, dict) else {}, pending)
+    return current
+
+
+def _merge(base: dict, layers: list[dict]) -> dict:
+    """Merge dict layers over base, copying this level once."""
+    by_key: dict[str, list[Any]] = {}
+    for layer in layers:
+        for key, value in layer.items():
+            by_key.setdefault(key, []).append(value)
+    result = dict(base)
+    for key, values in by_key.items():
+        last = values[-1]
+        if not isinstance(last, dict):
+            # A plain value replaces whatever the earlier layers built
+            result[key] = last
+            continue
+        value = _resolve(base.get(key, _MISSING), values)
+        if value is _MISSING:
+            result.pop(key, None)
         else:
             result[key] = value
     return result
+
+
+def deep_merge_all(base: dict, overlays: list[dict]) -> dict:
+    """Apply an ordered list of overlays to base in one pass.
+
+    Equivalent to folding deep_merge over the overlays, but each dict
+    level that any overlay touches is copied once rather than once per
+    overlay, and untouched subtrees are shared with base.
+
+    Args:
+        base: The base data. Not modified.
+        overlays: Overlay dicts, lowest precedence first.
+
+    Returns:
+        The merged dict (base itself when there is nothing to apply).
+    """
+    overlays = [o for o in overlays if o]
+    if not overlays:
+        return base
+    return _merge(base, overlays)
+
+
+def deep_merge(base: dict, overlay: dict) -> dict:
+    """Deep merge overlay into base, returning a new dict.
+    Overlay values take precedence. Nested dicts are merged recursively."""
+    return _merge(base, [overlay])
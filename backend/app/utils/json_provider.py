@@ -0,0 +1,122 @@
+"""JSON output — optional orjson provider and raw JSON splicing.
+
+JSON_PROVIDER selects the app's JSON provider:
+
+- ``auto`` (default): orjson when it is installed, else Flask's default.
+- ``orjson``: require orjson.
+- ``default``: Flask's stdlib provider.
+
+The orjson provider keeps Flask's output contract: keys are sorted,
+datetimes are HTTP dates, and debug mode pretty-prints (through the
+stdlib path).
+
+RawJSON wraps text that is already valid JSON, such as a stored
+``entity_data`` column, so ``raw_jsonify`` can splice it into the
+response body without the ``json.loads``/``dumps`` round trip.
+"""
+
+import json
+import uuid
+from typing import Any
+
+from flask import Flask, Response, current_app
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+class RawJSON:
+    """Already-serialized JSON text, emitted verbatim by raw_jsonify."""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+
+def _default(o: Any) -> Any:
+    # Outside raw_jsonify (plain jsonify, tests), decode so output stays correct
+    if isinstance(o, RawJSON):
+        return json.loads(o.text)
+    return DefaultJSONProvider.default(o)
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """Flask's default provider, plus RawJSON support."""
+
+    default = staticmethod(_default)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson."""
+
+    default = staticmethod(_default)
+    _options = (
+        (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME)
+        if orjson else 0
+    )
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs.get("indent"):
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=self._options).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_default, option=self._options) + b"\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def init_json(app: Flask) -> None:
+    """Install the JSON provider selected by JSON_PROVIDER."""
+    choice = app.config.get("JSON_PROVIDER", "auto")
+    if choice == "orjson" and orjson is None:
+        raise RuntimeError("JSON_PROVIDER=orjson but orjson is not installed")
+    use_orjson = orjson is not None and choice in ("auto", "orjson")
+    app.json = (OrjsonProvider if use_orjson else StdlibJSONProvider)(app)
+
+
+def _swap_raw(value: Any, token: str, fragments: list[str]) -> Any:
+    """Replace RawJSON values with placeholder strings, collecting their text."""
+    if isinstance(value, RawJSON):
+        fragments.append(value.text)
+        return f"{token}{len(fragments) - 1}"
+    if isinstance(value, dict):
+        return {k: _swap_raw(v, token, fragments) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_swap_raw(v, token, fragments) for v in value]
+    return value
+
+
+def raw_dumps(payload: Any) -> str:
+    """Serialize payload like jsonify's body, emitting RawJSON text verbatim.
+
+    The payload is serialized with RawJSON values swapped for unique
+    placeholder strings, which are then replaced by the raw text. Only
+    the small envelope goes through the encoder.
+    """
+    provider = current_app.json
+    dump_args: dict[str, Any] = {"separators": (",", ":")}
+    if (provider.compact is None and current_app.debug) or provider.compact is False:
+        dump_args = {"indent": 2}
+    fragments: list[str] = []
+    token = f"raw-{uuid.uuid4().hex}-"
+    body = provider.dumps(_swap_raw(payload, token, fragments), **dump_args)
+    for i, text in enumerate(fragments):
+        body = body.replace(f'"{token}{i}"', text, 1)
+    return f"{body}\n"
+
+
+def raw_jsonify(payload: Any, status: int = 200) -> Response:
+    """Like jsonify, but emits RawJSON values' text without re-encoding it."""
+    return current_app.response_class(
+        raw_dumps(payload), status=status, mimetype=current_app.json.mimetype
+    )
@@ -1,13 +1,24 @@
-"""Logging initialization — console handler, SSE streaming handler, access log middleware."""
+"""Logging initialization — queued pipeline, console + SSE handlers, access log middleware."""
 
+import atexit
+import json
 import logging
+import logging.handlers
 import os
 import queue
+import sys
 import threading
 import time
 
 from flask import Flask, g, request
 
+from app.utils.metrics import registry as metrics_registry
+from app.utils.query_stats import (
+    check_query_budget,
+    get_query_stats,
+    reset_query_stats,
+)
+
 
 # ---------------------------------------------------------------------------
 # SSE Log Handler — pushes formatted records to per-subscriber queues
@@ -63,40 +74,162 @@ class SSELogHandler(logging.Handler):
 sse_handler = SSELogHandler()
 
 
+# ---------------------------------------------------------------------------
+# Queued pipeline — request threads enqueue, a listener thread does the I/O
+# ---------------------------------------------------------------------------
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler over a bounded queue that never blocks the caller.
+
+    When the queue is full the record is discarded and counted in
+    ``dropped`` instead of raising through ``handleError``.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]") -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Many request threads land here at once when the queue is full
+            with self.lock:
+                self.dropped += 1
+
+
+class _BlockingSentinelListener(logging.handlers.QueueListener):
+    """QueueListener whose stop sentinel waits for room in a full queue.
+
+    The stock implementation uses put_nowait(), which raises on a bounded
+    queue that is full at shutdown and would skip the final flush.
+    """
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+class AccessCaptureFormatter(logging.Formatter):
+    """Formats access records as NDJSON for the replay tool.
+
+    Reads the ``access`` dict attached by the access log middleware, which
+    carries the query string the plain log line omits.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps({"ts": record.created, **getattr(record, "access", {})})
+
+
+# Module-level singletons — created on first init_logging() call
+queue_handler: DroppingQueueHandler | None = None
+_listener: _BlockingSentinelListener | None = None
+
+
+def shutdown_logging() -> None:
+    """Stop the listener thread after draining every queued record.
+
+    Registered with atexit at import; safe to call more than once.
+    """
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+    if queue_handler is not None and queue_handler.dropped:
+        # Listener is gone — report straight to stderr
+        sys.stderr.write(f"logging: dropped {queue_handler.dropped} records (queue full)\n")
+
+
+def _restart_listener_in_child() -> None:
+    """Give a forked child its own queue and listener thread.
+
+    Threads do not survive fork(), so a worker forked from a server that
+    preloads the app would otherwise queue records nothing ever drains.
+    """
+    global _listener
+    if _listener is None or queue_handler is None:
+        return
+    log_queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=queue_handler.queue.maxsize)
+    queue_handler.queue = log_queue
+    _listener = _BlockingSentinelListener(
+        log_queue, *_listener.handlers, respect_handler_level=True
+    )
+    _listener.start()
+
+
+# Once per process: both are no-ops until init_logging() starts a listener,
+# and init_logging() may run again after a shutdown
+atexit.register(shutdown_logging)
+os.register_at_fork(after_in_child=_restart_listener_in_child)
+
+
 # ---------------------------------------------------------------------------
 # Initialization
 # ---------------------------------------------------------------------------
 
-def init_logging() -> None:
-    """Set up root logger with console + SSE handlers.
+def init_logging(sse: bool = True) -> None:
+    """Set up the root logger with a queued console + SSE pipeline.
 
-    Called once during create_app(). The SSE handler is always attached so
-    subscribers can connect at any time.
+    Called once during create_app(). Request threads only pay for a
+    non-blocking put onto a bounded queue; a background QueueListener
+    thread formats records and drives the console and SSE handlers. When
+    the queue is full new records are dropped and counted on
+    ``queue_handler.dropped``. The listener is flushed at interpreter exit
+    and restarted in forked children.
+
+    Args:
+        sse: Feed records to the live log viewer (LOG_VIEWER).
+
+    Environment variables:
+        LOG_LEVEL           Python log level name (default: INFO)
+        LOG_QUEUE_SIZE      Max records buffered for the listener (default: 10000)
+        ACCESS_LOG_CAPTURE  Path to append NDJSON access records to (default: off)
     """
+    global queue_handler, _listener
+
     level_name = os.environ.get("LOG_LEVEL", "INFO").upper()
     level = getattr(logging, level_name, logging.INFO)
 
     root = logging.getLogger()
     root.setLevel(level)
 
+    # Pipeline is a process-wide singleton — attach once
+    if _listener is not None:
+        return
+
     fmt = logging.Formatter(
         "[%(asctime)s] %(levelname)s %(name)s: %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
     )
 
-    # Console handler (avoid duplicates on repeated calls)
-    if not any(isinstance(h, logging.StreamHandler) and not isinstance(h, SSELogHandler)
-               for h in root.handlers):
-        console = logging.StreamHandler()
-        console.setLevel(level)
-        console.setFormatter(fmt)
-        root.addHandler(console)
+    console = logging.StreamHandler()
+    console.setLevel(level)
+    console.setFormatter(fmt)
+
+    sse_handler.setLevel(level)
+    sse_handler.setFormatter(fmt)
+
+    maxsize = int(os.environ.get("LOG_QUEUE_SIZE", 10000))
+    log_queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=maxsize)
+    if queue_handler is None:
+        queue_handler = DroppingQueueHandler(log_queue)
+        root.addHandler(queue_handler)
+    else:
+        queue_handler.queue = log_queue
 
-    # SSE handler (singleton — attach once)
-    if sse_handler not in root.handlers:
-        sse_handler.setLevel(level)
-        sse_handler.setFormatter(fmt)
-        root.addHandler(sse_handler)
+    handlers: list[logging.Handler] = [console, sse_handler] if sse else [console]
+
+    capture_path = os.environ.get("ACCESS_LOG_CAPTURE")
+    if capture_path:
+        capture = logging.FileHandler(capture_path)
+        capture.addFilter(logging.Filter("app.access"))
+        capture.setFormatter(AccessCaptureFormatter())
+        handlers.append(capture)
+
+    _listener = _BlockingSentinelListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _listener.start()
 
 
 # ---------------------------------------------------------------------------
@@ -109,13 +242,17 @@ _access_logger = logging.getLogger("app.access")
 def register_access_logging(app: Flask) -> None:
     """Attach before/after request hooks for HTTP access logging.
 
-    Logs one line per request: METHOD /path STATUS DURATIONms
+    Logs one line per request: METHOD /path STATUS DURATIONms db=QUERIESq/SQLms,
+    adds a matching Server-Timing header, warns when the route's SQL query
+    budget is exceeded, and records the duration in the per-route metrics
+    histograms.
     Skips the SSE log stream endpoint itself to avoid feedback loops.
     """
 
     @app.before_request
     def _start_timer() -> None:
         g.request_start = time.monotonic()
+        reset_query_stats()
 
     @app.after_request
     def _log_request(response):  # type: ignore[no-untyped-def]
@@ -124,11 +261,33 @@ def register_access_logging(app: Flask) -> None:
             return response
 
         duration_ms = (time.monotonic() - getattr(g, "request_start", time.monotonic())) * 1000
+        query_count, query_ms = get_query_stats()
         _access_logger.info(
-            "%s %s %s %.0fms",
+            "%s %s %s %.0fms db=%dq/%.0fms",
             request.method,
             request.path,
             response.status_code,
             duration_ms,
+            query_count,
+            query_ms,
+            extra={"access": {
+                "method": request.method,
+                "path": request.path,
+                "query": request.query_string.decode("latin-1"),
+                "status": response.status_code,
+                "duration_ms": round(duration_ms, 3),
+                "queries": query_count,
+            }},
+        )
+        response.headers["Server-Timing"] = (
+            f'db;dur={query_ms:.1f};desc="{query_count} queries", app;dur={duration_ms:.1f}'
+        )
+        check_query_budget(query_count)
+        metrics_registry.observe(
+            request.method,
+            request.blueprint or "",
+            request.url_rule.rule if request.url_rule else "<unmatched>",
+            response.status_code,
+            duration_ms,
         )
         return response
@@ -0,0 +1,44 @@
+"""JSON Merge Patch (RFC 7396) apply and diff helpers."""
+
+from typing import Any
+
+
+def apply_merge_patch(target: Any, patch: Any) -> Any:
+    """Apply an RFC 7396 merge patch to target, returning a new value.
+
+    Objects are merged recursively, ``null`` removes a member, and any other
+    value (including arrays) replaces the target value wholesale. Subtrees
+    the patch does not mention are shared with ``target``, not copied.
+    """
+    if not isinstance(patch, dict):
+        return patch
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = apply_merge_patch(result.get(key), value)
+    return result
+
+
+def merge_diff(before: Any, after: Any) -> Any:
+    """Return the minimal merge patch that turns ``before`` into ``after``.
+
+    The inverse of apply_merge_patch: an empty dict means no change.
+    Only meaningful when both sides are objects; other values are
+    returned as-is (a full replacement).
+    """
+    if not isinstance(before, dict) or not isinstance(after, dict):
+        return after
+    diff: dict[str, Any] = {}
+    for key in before.keys() - after.keys():
+        diff[key] = None
+    for key, value in after.items():
+        if key not in before:
+            diff[key] = value
+        elif before[key] != value:
+            if isinstance(before[key], dict) and isinstance(value, dict):
+                diff[key] = merge_diff(before[key], value)
+            else:
+                diff[key] = value
+    return diff
@@ -0,0 +1,361 @@
+"""In-process request metrics — per-route latency histograms and status counters.
+
+Every request observed by the access log middleware is recorded into a
+fixed-bucket histogram keyed by (method, blueprint, route rule). Status codes
+are counted per route alongside it.
+
+Multi-worker servers: when METRICS_DIR is set, each worker process writes a
+snapshot of its own series to ``<METRICS_DIR>/<pid>-<start ms>.json`` every
+METRICS_FLUSH_INTERVAL seconds. The start time keeps a recycled worker whose
+pid is reused from overwriting its predecessor's totals. A scrape merges the
+live in-memory series of the answering worker with the snapshots of every
+other worker, so any worker can serve the whole deployment's numbers.
+
+When a worker exits, the server folds its snapshot into ``aggregate.json``
+(fold_snapshots; gunicorn.conf.py calls it from child_exit), so recycled
+workers do not leave a file per worker behind. Clear the directory before
+starting the server (clear_snapshots; gunicorn.conf.py does it) so counters
+from a previous run are not carried over."""
+
+import atexit
+import json
+import math
+import os
+import threading
+import time
+from typing import Any
+
+from flask import Flask
+
+# Upper bucket bounds in milliseconds; the implicit last bucket is +Inf
+BUCKETS_MS: tuple[float, ...] = (
+    1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000,
+)
+QUANTILES: tuple[float, ...] = (0.5, 0.95, 0.99)
+
+SeriesKey = tuple[str, str, str]  # (method, blueprint, route)
+
+# Totals of exited workers, written only by fold_snapshots
+AGGREGATE = "aggregate.json"
+
+
+class _Series:
+    """Histogram + status counters for one route."""
+
+    __slots__ = ("buckets", "sum_ms", "count", "statuses")
+
+    def __init__(self) -> None:
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.sum_ms = 0.0
+        self.count = 0
+        self.statuses: dict[str, int] = {}
+
+    def observe(self, status: int, duration_ms: float) -> None:
+        i = 0
+        while i < len(BUCKETS_MS) and duration_ms > BUCKETS_MS[i]:
+            i += 1
+        self.buckets[i] += 1
+        self.sum_ms += duration_ms
+        self.count += 1
+        code = str(status)
+        self.statuses[code] = self.statuses.get(code, 0) + 1
+
+    def merge(self, other: dict[str, Any]) -> None:
+        for i, n in enumerate(other["buckets"]):
+            self.buckets[i] += n
+        self.sum_ms += other["sum_ms"]
+        self.count += other["count"]
+        for code, n in other["statuses"].items():
+            self.statuses[code] = self.statuses.get(code, 0) + n
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "buckets": list(self.buckets),
+            "sum_ms": self.sum_ms,
+            "count": self.count,
+            "statuses": dict(self.statuses),
+        }
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile in ms by linear interpolation inside its bucket."""
+        if not self.count:
+            return math.nan
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            if n and seen + n >= rank:
+                lower = BUCKETS_MS[i - 1] if i > 0 else 0.0
+                if i == len(BUCKETS_MS):
+                    # Overflow bucket has no upper bound — report its floor
+                    return lower
+                return lower + (BUCKETS_MS[i] - lower) * (rank - seen) / n
+            seen += n
+        return BUCKETS_MS[-1]
+
+
+class MetricsRegistry:
+    """Thread-safe per-process store of route series with optional file sharing."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._series: dict[SeriesKey, _Series] = {}
+        self._directory = ""
+        self._interval = 5.0
+        self._pid = 0  # pid that owns the flush thread (re-armed after fork)
+        self._name = ""  # this process's snapshot file, set with _pid
+
+    def configure(self, directory: str, interval: float) -> None:
+        """Set the shared snapshot directory ('' disables sharing)."""
+        self._directory = directory
+        self._interval = interval
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def observe(
+        self, method: str, blueprint: str, route: str, status: int, duration_ms: float
+    ) -> None:
+        """Record one finished request."""
+        key = (method, blueprint, route)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series()
+            series.observe(status, duration_ms)
+        if self._directory and self._pid != os.getpid():
+            self._start_flusher()
+
+    # -- cross-worker sharing ------------------------------------------------
+
+    def _snapshot(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [
+                {"key": list(key), **series.to_dict()}
+                for key, series in self._series.items()
+            ]
+
+    def flush(self) -> None:
+        """Write this process's series to its snapshot file atomically."""
+        if not self._directory or self._pid != os.getpid():
+            return
+        _write_json(os.path.join(self._directory, self._name), self._snapshot())
+
+    def _start_flusher(self) -> None:
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # Series inherited from a pre-fork parent belong to the parent's file
+            if self._pid:
+                self._series = {}
+            self._pid = os.getpid()
+            self._name = f"{self._pid}-{time.time_ns() // 1_000_000}.json"
+
+        def loop() -> None:
+            while True:
+                time.sleep(self._interval)
+                self.flush()
+
+        threading.Thread(target=loop, name="metrics-flush", daemon=True).start()
+        atexit.register(self.flush)
+
+    def collect(self) -> dict[SeriesKey, _Series]:
+        """Return merged series for this process plus every other worker's snapshot."""
+        snapshots = [self._snapshot()]
+        if self._directory:
+            snapshots += _read_shared(self._directory, skip=self._name)
+        return _merge(snapshots)
+
+
+def _merge(snapshots: list[list[dict[str, Any]]]) -> dict[SeriesKey, _Series]:
+    merged: dict[SeriesKey, _Series] = {}
+    for snapshot in snapshots:
+        for entry in snapshot:
+            key = tuple(entry["key"])
+            series = merged.get(key)
+            if series is None:
+                series = merged[key] = _Series()
+            series.merge(entry)
+    return merged
+
+
+def _write_json(path: str, data: Any) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def _read_aggregate(directory: str) -> dict[str, Any]:
+    try:
+        with open(os.path.join(directory, AGGREGATE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"folded": [], "series": []}
+
+
+def _read_shared(directory: str, skip: str) -> list[list[dict[str, Any]]]:
+    """Read the aggregate plus every worker snapshot not yet folded into it.
+
+    fold_snapshots replaces the aggregate before deleting the files it
+    folded, so a listed snapshot that has vanished is in the aggregate by
+    now: reading again counts it exactly once.
+    """
+    for _ in range(3):
+        names = [n for n in os.listdir(directory)
+                 if n.endswith(".json") and n not in (AGGREGATE, skip)]
+        aggregate = _read_aggregate(directory)
+        folded = set(aggregate["folded"])
+        snapshots = [aggregate["series"]]
+        for name in names:
+            if name in folded:
+                continue
+            try:
+                with open(os.path.join(directory, name)) as f:
+                    snapshots.append(json.load(f))
+            except FileNotFoundError:
+                break  # folded since the listing
+            except (OSError, ValueError):
+                continue
+        else:
+            return snapshots
+    return snapshots
+
+
+# Module-level singleton — fed by the access log middleware
+registry = MetricsRegistry()
+
+
+def fold_snapshots(directory: str, pid: int) -> int:
+    """Merge an exited worker's snapshots into the aggregate and delete them.
+
+    Call from a single process (the server master), after the worker has
+    exited, so its final flush is on disk and nothing else folds at the
+    same time.
+
+    Returns:
+        Number of snapshot files folded.
+    """
+    if not directory or not os.path.isdir(directory):
+        return 0
+    names = [n for n in os.listdir(directory)
+             if n.startswith(f"{pid}-") and n.endswith(".json")]
+    if not names:
+        return 0
+
+    aggregate = _read_aggregate(directory)
+    snapshots = [aggregate["series"]]
+    for name in names:
+        try:
+            with open(os.path.join(directory, name)) as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    totals = _merge(snapshots)
+
+    # Keep folded names only while their files may still be listed by a scrape
+    folded = [n for n in aggregate["folded"]
+              if os.path.exists(os.path.join(directory, n))] + names
+    _write_json(os.path.join(directory, AGGREGATE), {
+        "folded": folded,
+        "series": [{"key": list(k), **v.to_dict()} for k, v in totals.items()],
+    })
+    for name in names:
+        try:
+            os.remove(os.path.join(directory, name))
+        except OSError:
+            continue  # skipped by scrapes until a later fold prunes it
+    return len(names)
+
+
+def clear_snapshots(directory: str) -> int:
+    """Delete worker snapshots and the aggregate left in ``directory`` by a previous run.
+
+    Returns:
+        Number of files removed.
+    """
+    removed = 0
+    if not directory or not os.path.isdir(directory):
+        return removed
+    for name in os.listdir(directory):
+        if name.endswith((".json", ".json.tmp")):
+            try:
+                os.remove(os.path.join(directory, name))
+                removed += 1
+            except OSError:
+                continue  # removed concurrently
+    return removed
+
+
+def init_metrics(app: Flask) -> None:
+    """Configure the metrics registry from app config. Called by create_app()."""
+    registry.configure(
+        app.config.get("METRICS_DIR", ""),
+        app.config.get("METRICS_FLUSH_INTERVAL", 5.0),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Prometheus text exposition
+# ---------------------------------------------------------------------------
+
+def _labels(**labels: str) -> str:
+    parts = []
+    for name, value in labels.items():
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{name}="{escaped}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _fmt(value: float) -> str:
+    return "NaN" if math.isnan(value) else repr(float(value))
+
+
+def render_prometheus(extra_counters: dict[str, tuple[str, float]] | None = None) -> str:
+    """Render all merged series in Prometheus text format (version 0.0.4).
+
+    Args:
+        extra_counters: Optional ``{metric_name: (help, value)}`` counters to
+            append, for process-level numbers owned by other modules.
+
+    Returns:
+        Exposition text, newline-terminated.
+    """
+    series_by_key = sorted(registry.collect().items())
+    lines: list[str] = []
+
+    name = "rpg_http_request_duration_seconds"
+    lines.append(f"# HELP {name} Request latency by route.")
+    lines.append(f"# TYPE {name} histogram")
+    for (method, blueprint, route), series in series_by_key:
+        base = {"method": method, "blueprint": blueprint, "route": route}
+        cumulative = 0
+        for bound, n in zip(BUCKETS_MS, series.buckets):
+            cumulative += n
+            le = _fmt(bound / 1000)
+            lines.append(f"{name}_bucket{_labels(**base, le=le)} {cumulative}")
+        lines.append(f'{name}_bucket{_labels(**base, le="+Inf")} {series.count}')
+        lines.append(f"{name}_sum{_labels(**base)} {_fmt(series.sum_ms / 1000)}")
+        lines.append(f"{name}_count{_labels(**base)} {series.count}")
+
+    name = "rpg_http_request_duration_quantile_seconds"
+    lines.append(f"# HELP {name} Latency quantiles estimated from the route histogram.")
+    lines.append(f"# TYPE {name} gauge")
+    for (method, blueprint, route), series in series_by_key:
+        base = {"method": method, "blueprint": blueprint, "route": route}
+        for q in QUANTILES:
+            value = _fmt(series.quantile(q) / 1000)
+            lines.append(f"{name}{_labels(**base, quantile=str(q))} {value}")
+
+    name = "rpg_http_requests_total"
+    lines.append(f"# HELP {name} Finished requests by route and status code.")
+    lines.append(f"# TYPE {name} counter")
+    for (method, blueprint, route), series in series_by_key:
+        for code, n in sorted(series.statuses.items()):
+            labels = _labels(method=method, blueprint=blueprint, route=route, status=code)
+            lines.append(f"{name}{labels} {n}")
+
+    for counter, (help_text, value) in (extra_counters or {}).items():
+        lines.append(f"# HELP {counter} {help_text}")
+        lines.append(f"# TYPE {counter} counter")
+        lines.append(f"{counter} {_fmt(value)}")
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,151 @@
+"""OpenAPI spec — rendered once at build time, served as a static file.
+
+Flasgger builds the spec by parsing the YAML docstring of every view,
+which costs import time (flasgger pulls in jsonschema, yaml and mistune)
+and CPU on each uncached request. Instead, ``flask build-openapi`` renders
+the spec into OPENAPI_SPEC_FILE as part of the deploy build, and workers
+serve those bytes from ``/api/openapi.json`` with an ETag and pre-compressed
+bodies (see response_cache).
+
+Workers only import flasgger when:
+
+- SWAGGER_UI is on, to mount the interactive docs at ``/api/docs``;
+- the spec file is missing, so the spec is rendered on first request
+  (logged as a warning) and kept in memory;
+- the app runs in debug mode, where the spec is re-rendered on every
+  request so docstring edits show up without a rebuild.
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Any
+
+from flask import Flask, Response, current_app
+
+from app.utils.response_cache import cached_body_response
+
+logger = logging.getLogger(__name__)
+
+SPEC_ROUTE = "/api/openapi.json"
+
+SWAGGER_CONFIG = {
+    "headers": [],
+    "specs": [
+        {
+            "endpoint": "openapi",
+            "route": SPEC_ROUTE,
+        }
+    ],
+    "static_url_path": "/flasgger_static",
+    "swagger_ui": True,
+    "specs_route": "/api/docs",
+}
+
+SWAGGER_TEMPLATE = {
+    "openapi": "3.0.3",
+    "info": {
+        "title": "RPG Platform API",
+        "version": "1.0.0",
+        "description": "Tabletop RPG campaign management API",
+    },
+    "servers": [{"url": "/"}],
+    "components": {
+        "securitySchemes": {
+            "bearerAuth": {
+                "type": "http",
+                "scheme": "bearer",
+                "bearerFormat": "JWT",
+            }
+        }
+    },
+}
+
+_lock = threading.Lock()
+_spec: bytes | None = None
+
+
+def render_spec(app: Flask) -> bytes:
+    """Build the OpenAPI document from the view docstrings.
+
+    Uses a detached flasgger instance, so nothing is registered on the app.
+
+    Returns:
+        The spec as compact JSON with sorted keys, so identical docstrings
+        always give identical bytes (and the same ETag).
+    """
+    from flasgger import Swagger
+
+    swagger = Swagger(config=SWAGGER_CONFIG, template=SWAGGER_TEMPLATE)
+    swagger.app = app
+    swagger.load_config(app)
+    with app.app_context():
+        spec: dict[str, Any] = swagger.get_apispecs("openapi")
+    return json.dumps(spec, sort_keys=True, separators=(",", ":")).encode()
+
+
+def write_spec(app: Flask, path: str | None = None) -> str:
+    """Render the spec into a file, atomically.
+
+    Args:
+        app: Application whose routes are documented.
+        path: Output file (default: OPENAPI_SPEC_FILE).
+
+    Returns:
+        Path of the written file.
+    """
+    path = path or app.config["OPENAPI_SPEC_FILE"]
+    body = render_spec(app)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(body)
+    os.replace(tmp, path)
+    return path
+
+
+def _load_spec(app: Flask) -> bytes:
+    global _spec
+    if app.debug:
+        return render_spec(app)
+    if _spec is None:
+        with _lock:
+            if _spec is None:
+                path = app.config.get("OPENAPI_SPEC_FILE", "")
+                try:
+                    with open(path, "rb") as f:
+                        _spec = f.read()
+                except OSError:
+                    logger.warning(
+                        "OpenAPI spec file %r not found; rendering it in-process. "
+                        "Run `flask build-openapi` at build time.", path,
+                    )
+                    _spec = render_spec(app)
+    return _spec
+
+
+def reset_spec() -> None:
+    """Forget the loaded spec, so the next request reads the file again."""
+    global _spec
+    _spec = None
+
+
+def _serve_spec() -> Response:
+    return cached_body_response("openapi", "spec", _load_spec(current_app))
+
+
+def init_openapi(app: Flask) -> None:
+    """Serve the prebuilt spec and, with SWAGGER_UI, mount the docs UI.
+
+    Called by create_app().
+    """
+    if app.config.get("SWAGGER_UI"):
+        from flasgger import Swagger
+
+        Swagger(app, config=SWAGGER_CONFIG, template=SWAGGER_TEMPLATE)
+        # The UI fetches flasgger's spec endpoint; answer it from the file
+        app.view_functions["flasgger.openapi"] = _serve_spec
+    else:
+        app.add_url_rule(SPEC_ROUTE, "openapi", _serve_spec)
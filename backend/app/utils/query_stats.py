@@ -0,0 +1,74 @@
+"""Per-request SQL statement counting and timing via SQLAlchemy engine events.
+
+Counters live on ``flask.g`` so each request (or CLI app context) starts at
+zero. The access log middleware reads them to extend the log line, emit a
+``Server-Timing`` header and enforce the per-route query budget.
+"""
+
+import logging
+import time
+
+from flask import Flask, current_app, g, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger("app.sql")
+
+_listening = False
+
+
+# The start time rides on the statement's execution context, not the
+# connection: a statement that fails never reaches after_cursor_execute, and
+# a per-connection stack would leak an entry into the next statement's timing.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None:
+        context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    start = getattr(context, "_query_start", None)
+    elapsed_ms = (time.perf_counter() - start) * 1000 if start is not None else 0.0
+    if has_app_context():
+        g.sql_query_count = g.get("sql_query_count", 0) + 1
+        g.sql_query_ms = g.get("sql_query_ms", 0.0) + elapsed_ms
+
+
+def init_query_stats(app: Flask) -> None:
+    """Attach statement counters to every SQLAlchemy engine (once per process)."""
+    global _listening
+    if _listening:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    _listening = True
+
+
+def reset_query_stats() -> None:
+    """Zero the counters — called at request start, since an app context may be reused."""
+    g.sql_query_count = 0
+    g.sql_query_ms = 0.0
+
+
+def get_query_stats() -> tuple[int, float]:
+    """Return (statement count, total statement ms) for the current app context."""
+    return g.get("sql_query_count", 0), g.get("sql_query_ms", 0.0)
+
+
+def check_query_budget(query_count: int) -> None:
+    """Warn when the current request ran more statements than its route allows.
+
+    The budget for an endpoint (e.g. ``rulesets.get_entity``) comes from
+    SQL_QUERY_BUDGETS, falling back to SQL_QUERY_BUDGET. A budget of 0
+    disables the check.
+    """
+    endpoint = request.endpoint or ""
+    budgets = current_app.config.get("SQL_QUERY_BUDGETS", {})
+    budget = budgets.get(endpoint, current_app.config.get("SQL_QUERY_BUDGET", 0))
+    if budget and query_count > budget:
+        logger.warning(
+            "Query budget exceeded: %s %s ran %d queries (budget %d)",
+            request.method,
+            endpoint or request.path,
+            query_count,
+            budget,
+        )
@@ -0,0 +1,232 @@
+"""Pre-compressed response bodies for static content, keyed by content version.
+
+Responses whose body only changes when the underlying row does (a base
+ruleset entity, say) are compressed once at the best level per encoding
+and served from cache afterwards. Entries are keyed by
+(namespace, key, version, encoding), so a reseed that changes an entity
+simply misses and old versions age out; nothing has to be invalidated.
+
+The version is either stored with the row (``versioned_response``: a hit
+then never renders, hashes or compresses the body) or a hash of the
+rendered body (``cached_response``). Bodies too small to compress are
+kept under the ``identity`` encoding.
+
+Two tiers:
+
+- An in-process LRU bounded by RESPONSE_CACHE_MB of compressed bytes.
+- With RESPONSE_CACHE_DIR set, a directory shared by every worker and
+  filled at seed time (see ``warm``), laid out as
+  ``<dir>/<namespace>/<key>/<version>.<encoding>``.
+
+The version doubles as a weak ETag, so clients revalidating an unchanged
+entity get a 304 without any body.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable
+
+from flask import Flask, Response, current_app, request
+
+from app.utils import compression
+from app.utils.json_provider import raw_dumps
+
+CacheKey = tuple[str, str, str, str]  # (namespace, key, version, encoding)
+
+IDENTITY = "identity"
+
+
+def content_version(body: bytes) -> str:
+    """Short stable hash of an uncompressed response body."""
+    return hashlib.blake2b(body, digest_size=12).hexdigest()
+
+
+class ResponseCache:
+    """Thread-safe LRU of compressed bodies with an optional shared directory."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[CacheKey, bytes] = OrderedDict()
+        self._size = 0
+        self._max_bytes = 64 * 1024 * 1024
+        self._directory = ""
+
+    def configure(self, max_bytes: int, directory: str) -> None:
+        """Set the memory budget and shared directory ('' disables it)."""
+        self._max_bytes = max_bytes
+        self._directory = directory
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def clear(self) -> None:
+        """Drop every in-memory entry (the directory is left alone)."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _path(self, cache_key: CacheKey) -> str:
+        namespace, key, version, encoding = cache_key
+        return os.path.join(self._directory, namespace, key, f"{version}.{encoding}")
+
+    def _remember(self, cache_key: CacheKey, body: bytes) -> None:
+        if len(body) > self._max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(cache_key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[cache_key] = body
+            self._size += len(body)
+            while self._size > self._max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def get(self, cache_key: CacheKey) -> bytes | None:
+        """Compressed body from memory, then the shared directory."""
+        with self._lock:
+            body = self._entries.get(cache_key)
+            if body is not None:
+                self._entries.move_to_end(cache_key)
+                return body
+        if not self._directory:
+            return None
+        try:
+            with open(self._path(cache_key), "rb") as f:
+                body = f.read()
+        except OSError:
+            return None
+        self._remember(cache_key, body)
+        return body
+
+    def put(self, cache_key: CacheKey, body: bytes) -> None:
+        """Store a compressed body, replacing older versions on disk."""
+        self._remember(cache_key, body)
+        if not self._directory:
+            return
+        path = self._path(cache_key)
+        folder = os.path.dirname(path)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(folder, exist_ok=True)
+            with open(tmp, "wb") as f:
+                f.write(body)
+            os.replace(tmp, path)
+            stale = [
+                name for name in os.listdir(folder)
+                if name.endswith(f".{cache_key[3]}") and name != os.path.basename(path)
+            ]
+            for name in stale:
+                os.remove(os.path.join(folder, name))
+        except OSError:
+            pass  # the memory tier still has it; another worker may own the file
+
+    def compressed(
+        self, namespace: str, key: str, version: str, body: bytes, encoding: str
+    ) -> bytes:
+        """Cached best-level compression of body, computing it on a miss."""
+        cache_key = (namespace, key, version, encoding)
+        cached = self.get(cache_key)
+        if cached is None:
+            cached = compression.compress(body, encoding, compression.BEST)
+            self.put(cache_key, cached)
+        return cached
+
+    def stats(self) -> dict[str, int]:
+        """Entry count and bytes held in memory."""
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._size}
+
+
+# Module-level singleton — shared by every request in the process
+cache = ResponseCache()
+
+
+def init_response_cache(app: Flask) -> None:
+    """Configure the response cache from app config. Called by create_app()."""
+    cache.configure(
+        int(app.config.get("RESPONSE_CACHE_MB", 64) * 1024 * 1024),
+        app.config.get("RESPONSE_CACHE_DIR", ""),
+    )
+
+
+def cached_response(namespace: str, key: str, payload: Any) -> Response:
+    """JSON response for static content, pre-compressed and revalidatable.
+
+    The payload is serialized with raw_dumps (RawJSON is spliced in), its
+    hash becomes a weak ETag, and the compressed body for the negotiated
+    encoding comes from the cache.
+
+    Args:
+        namespace: Kind of content, e.g. ``"entity"``.
+        key: Id of the item within the namespace.
+        payload: JSON-serializable response payload.
+    """
+    return cached_body_response(namespace, key, raw_dumps(payload).encode())
+
+
+def cached_body_response(namespace: str, key: str, body: bytes) -> Response:
+    """Like cached_response, for a body that is already serialized JSON."""
+    return versioned_response(namespace, key, content_version(body), lambda: body)
+
+
+def versioned_response(
+    namespace: str, key: str, version: str, render: Callable[[], bytes]
+) -> Response:
+    """JSON response for content whose version is known without rendering it.
+
+    A revalidation with a matching ETag is a 304, and a cached body for
+    the negotiated encoding is served as is; ``render`` only runs on a
+    miss.
+
+    Args:
+        namespace: Kind of content, e.g. ``"entity"``.
+        key: Id of the item within the namespace.
+        version: Changes whenever the body does; also the weak ETag.
+        render: Returns the serialized JSON body.
+    """
+    response = current_app.response_class(mimetype=current_app.json.mimetype)
+    response.set_etag(version, weak=True)
+    compression.add_vary(response)
+    if request.if_none_match.contains_weak(version):
+        response.status_code = 304
+        return response
+
+    encoding = compression.negotiate()
+    body = cache.get((namespace, key, version, encoding)) if encoding else None
+    if body is not None:
+        response.set_data(body)
+        response.headers["Content-Encoding"] = encoding
+        return response
+    body = cache.get((namespace, key, version, IDENTITY))
+    if body is not None:
+        response.set_data(body)
+        return response
+
+    body = render()
+    small = len(body) < current_app.config.get("COMPRESS_MIN_BYTES", 1024)
+    if small:
+        cache.put((namespace, key, version, IDENTITY), body)
+    if encoding is None or small:
+        response.set_data(body)
+        return response
+    response.set_data(cache.compressed(namespace, key, version, body, encoding))
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def warm(namespace: str, key: str, payload: Any, version: str | None = None) -> None:
+    """Pre-compress a payload in every available encoding.
+
+    Needs an app context; the body matches what cached_response (or
+    versioned_response, given the same version) produces under the same
+    app config. Bodies too small to compress are stored uncompressed.
+    """
+    body = raw_dumps(payload).encode()
+    version = version or content_version(body)
+    if len(body) < current_app.config.get("COMPRESS_MIN_BYTES", 1024):
+        cache.put((namespace, key, version, IDENTITY), body)
+        return
+    for encoding in compression.ENCODINGS:
+        cache.compressed(namespace, key, version, body, encoding)
@@ -0,0 +1,10 @@
+"""Benchmark suite for hot service-layer calls.
+
+Run from ``backend/``::
+
+    python -m benchmarks run --entities 50000 --output results.json
+
+Each run builds a throwaway SQLite database filled by the synthetic
+generator (``app.seed.synthetic``), times every case in
+``benchmarks.cases`` and emits JSON results. No network access is needed.
+"""
@@ -0,0 +1,550 @@
+"""Benchmark CLI — ``python -m benchmarks <command>`` from ``backend/``."""
+
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+import click
+import sqlalchemy
+from flask import Flask
+from sqlalchemy import func
+
+from config import Config
+
+if TYPE_CHECKING:
+    from benchmarks.harness import BenchContext
+
+
+@click.group()
+def cli() -> None:
+    """Benchmark the service layer against synthetic data."""
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def _build_context(ruleset_key: str) -> "BenchContext":
+    """Pick the user, campaign and entity with the most overlays as case targets."""
+    from app.extensions import db
+    from app.models.overlay import UserOverlay
+    from app.models.ruleset import Ruleset, RulesetEntity
+    from benchmarks.harness import BenchContext
+
+    ruleset = Ruleset.query.filter_by(key=ruleset_key).one()
+    user_id, _ = (
+        db.session.query(UserOverlay.user_id, func.count())
+        .filter(UserOverlay.ruleset_id == ruleset.id)
+        .group_by(UserOverlay.user_id)
+        .order_by(func.count().desc())
+        .first()
+    )
+    overlay = (
+        UserOverlay.query.filter_by(ruleset_id=ruleset.id, user_id=user_id)
+        .filter(UserOverlay.campaign_id.isnot(None))
+        .first()
+    )
+    entity = RulesetEntity.query.filter_by(
+        ruleset_id=ruleset.id,
+        entity_type=overlay.entity_type,
+        source_key=overlay.source_key,
+    ).one()
+    return BenchContext(
+        ruleset_id=ruleset.id,
+        user_id=user_id,
+        campaign_id=overlay.campaign_id,
+        entity_id=entity.id,
+        source_key=entity.source_key,
+        entity_type="creature",
+    )
+
+
+@contextlib.contextmanager
+def bench_app(
+    entities: int,
+    database_url: str | None,
+    generate: bool,
+    overrides: dict[str, Any] | None = None,
+) -> Iterator[tuple[Flask, "BenchContext", str]]:
+    """Create the app on a benchmark database and yield it inside an app context.
+
+    Yields (app, context, workdir). Without ``database_url`` a throwaway
+    SQLite file is created in ``workdir``, which is removed on exit.
+    ``overrides`` are extra config values.
+    """
+    from app import create_app
+    from app.extensions import db
+    from app.seed.synthetic import generate_synthetic
+
+    workdir = tempfile.mkdtemp(prefix="rpg-bench-")
+    url = database_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = url
+        SQL_QUERY_BUDGET = 0
+
+    for key, value in (overrides or {}).items():
+        setattr(BenchConfig, key, value)
+    app = create_app(BenchConfig)
+    try:
+        with app.app_context():
+            db.create_all()
+            if generate:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    generate_synthetic(entities=entities)
+            yield app, _build_context("synthetic"), workdir
+            for engine in db.engines.values():
+                engine.dispose()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def run_benchmarks(
+    entities: int,
+    repeat: int,
+    warmup: int,
+    database_url: str | None,
+    generate: bool,
+    recordings: str | None,
+    seed_items: int,
+    only: tuple[str, ...] = (),
+    runs: int = 1,
+) -> dict[str, Any]:
+    """Build the app and dataset, run every registered case and return results.
+
+    With ``runs`` > 1 the whole case list is repeated in rounds and each
+    case's samples are pooled, so slow drift (thermal, background load)
+    spreads across all cases instead of biasing whichever ran last.
+    """
+    from benchmarks import cases  # noqa: F401 — registers cases
+    from benchmarks.harness import CASES, measure, summarize
+    from benchmarks.recordings import replay_fetcher, write_synthetic_pages
+
+    dataset = {"entities": entities, "ruleset_key": "synthetic"}
+    with bench_app(entities, database_url, generate) as (app, ctx, workdir):
+        if not recordings:
+            recordings = os.path.join(workdir, "open5e")
+            write_synthetic_pages(recordings, seed_items)
+            dataset["open5e_pages"] = f"synthetic ({seed_items} per type)"
+        else:
+            dataset["open5e_pages"] = recordings
+        ctx.extra["open5e_fetch"] = replay_fetcher(recordings)
+
+        selected = [
+            bench for bench in CASES
+            if not only or any(pattern in bench.name for pattern in only)
+        ]
+        samples: dict[str, list[float]] = {bench.name: [] for bench in selected}
+        for round_no in range(1, runs + 1):
+            for bench in selected:
+                click.echo(f"  [{round_no}/{runs}] {bench.name} ...", err=True, nl=False)
+                round_samples = measure(
+                    lambda bench=bench: bench.fn(ctx), bench.repeat or repeat, warmup
+                )
+                samples[bench.name].extend(round_samples)
+                click.echo(f" {statistics.median(round_samples):.2f}ms", err=True)
+        results = {name: summarize(values) for name, values in samples.items()}
+        url = app.config["SQLALCHEMY_DATABASE_URI"]
+
+    return {
+        "schema": 1,
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "platform": platform.platform(),
+            "database": url.split(":", 1)[0],
+            "repeat": repeat,
+            "warmup": warmup,
+            "runs": runs,
+            "dataset": dataset,
+        },
+        "results": results,
+    }
+
+
+def _run_options(fn: Callable) -> Callable:
+    """Options shared by every command that executes the suite."""
+    options = [
+        click.option("--entities", default=10000, show_default=True,
+                     help="Synthetic entity count (10k-500k)"),
+        click.option("--repeat", default=20, show_default=True,
+                     help="Timed samples per case per run"),
+        click.option("--warmup", default=2, show_default=True,
+                     help="Untimed calls per case per run"),
+        click.option("--runs", default=1, show_default=True,
+                     help="Rounds over the whole suite; samples are pooled"),
+        click.option("--database-url", default=None,
+                     help="Use this database instead of a throwaway SQLite file"),
+        click.option("--no-generate", is_flag=True,
+                     help="Reuse an existing 'synthetic' ruleset in --database-url"),
+        click.option("--recordings", type=click.Path(file_okay=False), default=None,
+                     help="Directory of recorded Open5e pages (default: synthetic pages)"),
+        click.option("--seed-items", default=200, show_default=True,
+                     help="Items per entity type when synthesizing Open5e pages"),
+        click.option("-k", "only", multiple=True,
+                     help="Only run cases whose name contains this"),
+    ]
+    for option in reversed(options):
+        fn = option(fn)
+    return fn
+
+
+def _execute(options: dict[str, Any]) -> dict[str, Any]:
+    return run_benchmarks(
+        options["entities"], options["repeat"], options["warmup"],
+        options["database_url"], not options["no_generate"], options["recordings"],
+        options["seed_items"], options["only"], options["runs"],
+    )
+
+
+@cli.command("run")
+@_run_options
+@click.option("--output", "-o", type=click.Path(dir_okay=False), default=None,
+              help="Write JSON here instead of stdout")
+def run(output: str | None, **options: Any) -> None:
+    """Time the hot service functions and emit JSON results."""
+    result = _execute(options)
+    text = json.dumps(result, indent=2)
+    if output:
+        with open(output, "w") as f:
+            f.write(text + "\n")
+        click.echo(f"Wrote {output}", err=True)
+    else:
+        click.echo(text)
+
+
+@cli.command("baseline")
+@_run_options
+@click.option("--name", default="default", show_default=True,
+              help="Baseline name under benchmarks/baselines/, or a .json path")
+@click.option("--from", "from_file", type=click.Path(exists=True, dir_okay=False),
+              default=None, help="Store an existing results file instead of running")
+def baseline(name: str, from_file: str | None, **options: Any) -> None:
+    """Run the suite (or take --from) and store it as a versioned baseline."""
+    from benchmarks.compare import load_results, save_baseline
+
+    result = load_results(from_file) if from_file else _execute(options)
+    path = save_baseline(result, name)
+    click.echo(f"Saved baseline {path} — commit it alongside the change it measures.")
+
+
+@cli.command("compare")
+@_run_options
+@click.option("--baseline", "baseline_name", default="default", show_default=True,
+              help="Baseline name under benchmarks/baselines/, or a .json path")
+@click.option("--results", "results_file", type=click.Path(exists=True, dir_okay=False),
+              default=None, help="Compare this results file instead of running now")
+@click.option("--threshold", default=0.25, show_default=True,
+              help="Relative median slowdown tolerated (0.25 = 25%)")
+@click.option("--track", multiple=True,
+              help="Gate only on cases containing this substring (repeatable)")
+def compare(baseline_name: str, results_file: str | None, threshold: float,
+            track: tuple[str, ...], **options: Any) -> None:
+    """Compare against a baseline; exit 1 if a tracked case regressed or is missing.
+
+    Exits 2 without comparing if the dataset, database or platform differ
+    from the baseline's. A run narrowed with -k is gated on those cases only.
+    """
+    from benchmarks.compare import (
+        FAILING,
+        baseline_path,
+        compare_results,
+        format_report,
+        load_results,
+    )
+
+    base = load_results(baseline_path(baseline_name))
+    current = load_results(results_file) if results_file else _execute(options)
+    try:
+        comparisons = compare_results(base, current, threshold, track or options["only"])
+    except ValueError as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(2)
+    click.echo(format_report(comparisons))
+
+    failed = [c for c in comparisons if c.status in FAILING]
+    if failed:
+        click.echo(f"\n{len(failed)} case(s) regressed beyond {threshold:.0%} or missing: "
+                   + ", ".join(f"{c.name} ({c.status})" for c in failed), err=True)
+        sys.exit(1)
+    click.echo(f"\nNo regressions beyond {threshold:.0%}.", err=True)
+
+
+def _replay_pools(ctx: "BenchContext") -> dict[str, list[str]]:
+    """Ids of the benchmark user's rows, keyed by URL parameter name."""
+    from app.models.campaign import Campaign
+    from app.models.character import Character
+    from app.models.overlay import UserOverlay
+    from app.models.ruleset import RulesetEntity
+
+    def ids(query: Any) -> list[str]:
+        return [row[0] for row in query]
+
+    return {
+        "ruleset_id": [ctx.ruleset_id],
+        "entity_id": ids(
+            RulesetEntity.query.with_entities(RulesetEntity.id)
+            .filter_by(ruleset_id=ctx.ruleset_id)
+            .order_by(RulesetEntity.id)
+            .limit(5000)
+        ),
+        "campaign_id": ids(
+            Campaign.query.with_entities(Campaign.id).filter_by(user_id=ctx.user_id)
+        ),
+        "character_id": ids(
+            Character.query.with_entities(Character.id).filter_by(user_id=ctx.user_id)
+        ),
+        "overlay_id": ids(
+            UserOverlay.query.with_entities(UserOverlay.id).filter_by(user_id=ctx.user_id)
+        ),
+    }
+
+
+@cli.command("replay")
+@click.argument("logfile", type=click.File("r"))
+@click.option("--concurrency", "-c", default=8, show_default=True, help="Worker threads")
+@click.option("--speed", default=0.0, show_default=True,
+              help="Multiplier on original request spacing; 0 = as fast as possible")
+@click.option("--limit", default=0, help="Replay at most this many log entries")
+@click.option("--url", default=None,
+              help="Replay against a running server instead of the in-process test client")
+@click.option("--entities", default=10000, show_default=True,
+              help="Synthetic entity count when generating a dataset")
+@click.option("--database-url", default=None,
+              help="Database holding the dataset (required with --url)")
+@click.option("--no-generate", is_flag=True,
+              help="Reuse an existing 'synthetic' ruleset in --database-url")
+@click.option("--output", "-o", type=click.Path(dir_okay=False), default=None,
+              help="Write the JSON report here instead of stdout")
+def replay_cmd(logfile: Any, concurrency: int, speed: float, limit: int, url: str | None,
+               entities: int, database_url: str | None, no_generate: bool,
+               output: str | None) -> None:
+    """Replay an access log (plain or NDJSON) and report throughput and latency."""
+    from app.models.user import User
+    from app.utils.auth import create_access_token
+    from benchmarks.replay import (
+        IdMapper,
+        client_sender,
+        http_sender,
+        parse_log,
+        replay,
+        route_labeler,
+    )
+
+    if url and not database_url:
+        raise click.UsageError("--url needs --database-url pointing at the server's database")
+
+    entries = parse_log(logfile)
+    if limit:
+        entries = entries[:limit]
+    click.echo(f"Parsed {len(entries)} access log entries", err=True)
+
+    with bench_app(entities, database_url, not no_generate) as (app, ctx, _):
+        mapper = IdMapper(app, _replay_pools(ctx))
+        if url:
+            import requests
+            user = User.query.get(ctx.user_id)
+            resp = requests.post(
+                f"{url.rstrip('/')}/api/auth/login",
+                json={"username": user.username, "password": "synthetic"},
+                timeout=30,
+            )
+            resp.raise_for_status()
+            sender = http_sender(url, resp.json()["access_token"])
+        else:
+            sender = client_sender(app, create_access_token(ctx.user_id))
+        report = replay(entries, mapper, sender, route_labeler(app), concurrency, speed)
+
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w") as f:
+            f.write(text + "\n")
+        click.echo(f"Wrote {output}", err=True)
+    else:
+        click.echo(text)
+    click.echo(
+        f"{report['requests']} requests in {report['elapsed_s']}s "
+        f"({report['throughput_rps']} req/s), p50 {report['latency_ms']['p50']}ms "
+        f"p95 {report['latency_ms']['p95']}ms p99 {report['latency_ms']['p99']}ms",
+        err=True,
+    )
+
+
+@cli.command("concurrency")
+@click.option("--entities", default=10000, show_default=True,
+              help="Synthetic entity count")
+@click.option("--readers", default=8, show_default=True, help="Reader threads")
+@click.option("--writers", default=2, show_default=True, help="Writer threads")
+@click.option("--duration", default=5.0, show_default=True, help="Seconds per profile")
+@click.option("--profile", "profiles", multiple=True, type=click.Choice(["default", "production"]),
+              help="SQLITE_PROFILE to measure (repeatable; default: both)")
+@click.option("--output", "-o", type=click.Path(dir_okay=False), default=None,
+              help="Write the JSON report here instead of stdout")
+def concurrency_cmd(entities: int, readers: int, writers: int, duration: float,
+                    profiles: tuple[str, ...], output: str | None) -> None:
+    """Concurrent read/write throughput per SQLite profile."""
+    from app.models.character import Character
+    from app.models.ruleset import RulesetEntity
+    from app.utils.auth import create_access_token
+    from benchmarks.concurrency import run_mixed
+
+    reports = {}
+    for profile in profiles or ("default", "production"):
+        overrides = {"SQLITE_PROFILE": "" if profile == "default" else profile}
+        with bench_app(entities, None, True, overrides) as (app, ctx, _):
+            entity_ids = [
+                row[0] for row in RulesetEntity.query.with_entities(RulesetEntity.id)
+                .filter_by(ruleset_id=ctx.ruleset_id).limit(2000)
+            ]
+            character_ids = [
+                row[0] for row in Character.query.with_entities(Character.id)
+                .filter_by(user_id=ctx.user_id)
+            ]
+            click.echo(f"  {profile} ...", err=True, nl=False)
+            report = run_mixed(
+                app, create_access_token(ctx.user_id), ctx.ruleset_id, entity_ids,
+                character_ids, readers, writers, duration,
+            )
+            reports[profile] = report
+            click.echo(
+                f" read {report['read']['throughput_rps']} req/s "
+                f"(p95 {report['read']['latency_ms']['p95']}ms, "
+                f"{report['read']['failures']} failed), "
+                f"write {report['write']['throughput_rps']} req/s "
+                f"(p95 {report['write']['latency_ms']['p95']}ms, "
+                f"{report['write']['failures']} failed)",
+                err=True,
+            )
+
+    text = json.dumps({"entities": entities, "profiles": reports}, indent=2)
+    if output:
+        with open(output, "w") as f:
+            f.write(text + "\n")
+        click.echo(f"Wrote {output}", err=True)
+    else:
+        click.echo(text)
+
+
+def _env_pairs(pairs: tuple[str, ...]) -> dict[str, str]:
+    env = {"DATABASE_URL": "sqlite://"}
+    for pair in pairs:
+        key, sep, value = pair.partition("=")
+        if not sep:
+            raise click.BadParameter(f"expected KEY=VALUE, got {pair!r}", param_hint="--env")
+        env[key] = value
+    return env
+
+
+@cli.command("imports")
+@click.option("--top", default=20, show_default=True, help="Packages to list")
+@click.option("--code", default=None,
+              help="Python code to profile (default: import the app and call create_app())")
+@click.option("--env", "env_pairs", multiple=True,
+              help="KEY=VALUE for the child process, e.g. SWAGGER_UI=1 (repeatable)")
+@click.option("--output", "-o", type=click.Path(dir_okay=False), default=None,
+              help="Write the JSON report here instead of stdout")
+def imports_cmd(top: int, code: str | None, env_pairs: tuple[str, ...],
+                output: str | None) -> None:
+    """Import-time profile of app startup (-X importtime), by package."""
+    from benchmarks.startup import CREATE_APP, import_profile
+
+    report = import_profile(code or CREATE_APP, _env_pairs(env_pairs), top)
+    click.echo(f"{report['total_ms']}ms importing {report['modules']} modules", err=True)
+    for entry in report["packages"]:
+        via = f"  <- {entry['imported_by']}" if entry["imported_by"] else ""
+        click.echo(
+            f"  {entry['ms']:8.1f}ms  {entry['package']:<24} {entry['modules']:>4} modules{via}",
+            err=True,
+        )
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w") as f:
+            f.write(text + "\n")
+        click.echo(f"Wrote {output}", err=True)
+    else:
+        click.echo(text)
+
+
+@cli.command("startup")
+@click.option("--repeat", default=5, show_default=True, help="Fresh processes to time")
+@click.option("--env", "env_pairs", multiple=True,
+              help="KEY=VALUE for the child processes, e.g. SWAGGER_UI=1 (repeatable)")
+@click.option("--max-ms", default=0.0,
+              help="Exit 1 if the median process time exceeds this; 0 = no gate")
+def startup_cmd(repeat: int, env_pairs: tuple[str, ...], max_ms: float) -> None:
+    """Cold-start time: app import, create_app() and the first request."""
+    from benchmarks.startup import measure_startup
+
+    report = measure_startup(repeat, _env_pairs(env_pairs))
+    click.echo(json.dumps(report, indent=2))
+    median = report["process_ms"]["median"]
+    click.echo(
+        f"process {median}ms (import {report['import_ms']['median']}ms, "
+        f"create_app {report['create_app_ms']['median']}ms, "
+        f"first request {report['first_request_ms']['median']}ms)",
+        err=True,
+    )
+    if max_ms and median > max_ms:
+        click.echo(f"Median startup {median}ms exceeds {max_ms}ms", err=True)
+        sys.exit(1)
+
+
+@cli.command("explain")
+@click.option("--entities", default=2000, show_default=True,
+              help="Synthetic entity count")
+@click.option("--database-url", default=None,
+              help="SQLite database to check instead of a throwaway file")
+@click.option("--no-generate", is_flag=True,
+              help="Reuse an existing 'synthetic' ruleset in --database-url")
+@click.option("--verbose", "-v", is_flag=True, help="Print every statement's plan")
+def explain_cmd(entities: int, database_url: str | None, no_generate: bool,
+                verbose: bool) -> None:
+    """Check query plans of the indexed access paths; exit 1 on a full scan."""
+    from benchmarks.plans import TRACKED_TABLES, check_plans
+
+    with bench_app(entities, database_url, not no_generate) as (_, ctx, _):
+        results = check_plans(ctx)
+
+    failures = 0
+    for name, plans in results.items():
+        scans = [scan for plan in plans for scan in plan.full_scans]
+        failures += bool(scans)
+        click.echo(f"{'FAIL' if scans else 'ok  '}  {name} ({len(plans)} statements)")
+        for plan in plans:
+            if verbose or plan.full_scans:
+                click.echo(f"        {' '.join(plan.sql.split())[:160]}")
+                for line in plan.plan:
+                    click.echo(f"          {line}")
+    if failures:
+        click.echo(f"\n{failures} case(s) scan one of: {', '.join(TRACKED_TABLES)}", err=True)
+        sys.exit(1)
+
+
+@cli.command("record-open5e")
+@click.argument("directory", type=click.Path(file_okay=False))
+def record_open5e(directory: str) -> None:
+    """Capture live Open5e pages into DIRECTORY for offline seed benchmarks."""
+    from benchmarks.recordings import record_pages
+    record_pages(directory)
+
+
+if __name__ == "__main__":
+    sys.exit(cli())
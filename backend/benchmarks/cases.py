@@ -0,0 +1,272 @@
+"""Benchmark cases — one per hot service call.
+
+Case names are stable ids (``<module>.<function>[<variant>]``) used to match
+results against stored baselines; rename them only together with the
+baseline files.
+"""
+
+import contextlib
+import functools
+import io
+import json
+from typing import Any, Iterator
+
+from flask import current_app, jsonify
+
+from app.extensions import db
+from app.models.ruleset import RulesetEntity, entity_content_hash
+from app.seed.open5e import seed_open5e
+from app.services import (
+    campaign_service,
+    character_service,
+    effective_service,
+    ruleset_service,
+)
+from app.utils import compression
+from app.utils.deep_merge import deep_merge, deep_merge_all
+from app.utils.json_provider import (
+    OrjsonProvider, StdlibJSONProvider, orjson, raw_dumps, raw_jsonify,
+)
+from app.utils.response_cache import cache as response_cache, versioned_response
+from benchmarks.harness import BenchContext, case
+
+
+@contextlib.contextmanager
+def materialized(ctx: BenchContext) -> Iterator[None]:
+    """Run with MATERIALIZE_OVERLAYS on, backfilling the rows on first use."""
+    if not ctx.extra.get("materialized"):
+        effective_service.rebuild(ctx.ruleset_id)
+        db.session.commit()
+        ctx.extra["materialized"] = True
+    previous = current_app.config["MATERIALIZE_OVERLAYS"]
+    current_app.config["MATERIALIZE_OVERLAYS"] = True
+    try:
+        yield
+    finally:
+        current_app.config["MATERIALIZE_OVERLAYS"] = previous
+
+
+@case("ruleset_service.list_entities[default]")
+def list_entities_default(ctx: BenchContext) -> None:
+    ruleset_service.list_entities(ctx.ruleset_id, entity_type=ctx.entity_type)
+
+
+@case("ruleset_service.list_entities[all]")
+def list_entities_all(ctx: BenchContext) -> None:
+    ruleset_service.list_entities(ctx.ruleset_id, entity_type=ctx.entity_type, source="all")
+
+
+@case("ruleset_service.list_entities[source]")
+def list_entities_source(ctx: BenchContext) -> None:
+    ruleset_service.list_entities(ctx.ruleset_id, entity_type=ctx.entity_type, source="srd-2014")
+
+
+@case("ruleset_service.list_entities[default+search]")
+def list_entities_search(ctx: BenchContext) -> None:
+    ruleset_service.list_entities(ctx.ruleset_id, search="drake")
+
+
+@case("ruleset_service.list_entities[campaign]")
+def list_entities_campaign(ctx: BenchContext) -> None:
+    ruleset_service.list_entities(
+        ctx.ruleset_id, entity_type=ctx.entity_type,
+        user_id=ctx.user_id, campaign_id=ctx.campaign_id,
+    )
+
+
+@case("ruleset_service.get_entity[effective]")
+def get_entity_effective(ctx: BenchContext) -> None:
+    ruleset_service.get_entity(
+        ctx.ruleset_id, ctx.entity_id,
+        user_id=ctx.user_id, campaign_id=ctx.campaign_id, effective=True,
+    )
+
+
+@case("ruleset_service.apply_overlays")
+def apply_overlays(ctx: BenchContext) -> None:
+    entity = RulesetEntity.query.get(ctx.entity_id)
+    ruleset_service.apply_overlays(entity, ctx.user_id, ctx.campaign_id)
+
+
+@case("ruleset_service.apply_overlays[materialized]")
+def apply_overlays_materialized(ctx: BenchContext) -> None:
+    entity = RulesetEntity.query.get(ctx.entity_id)
+    with materialized(ctx):
+        ruleset_service.apply_overlays(entity, ctx.user_id, ctx.campaign_id)
+
+
+# Micro-benchmarks time this many calls per sample, so samples stay well
+# above timer resolution
+_MERGE_CALLS = 100
+
+
+def _merge_inputs(ctx: BenchContext, count: int) -> tuple[dict, list[dict]]:
+    """The context creature blob, grown to ~20 actions, and count DM-style overlays."""
+    cache = ctx.extra.setdefault("merge_inputs", {})
+    if count not in cache:
+        base = RulesetEntity.query.get(ctx.entity_id).get_entity_data()
+        actions = base.get("actions") or [{"name": "Strike", "desc": "strike"}]
+        base["actions"] = [
+            {**actions[i % len(actions)], "name": f"Action {i}"} for i in range(20)
+        ]
+        cache[count] = base, [
+            {
+                "hit_points": 100 + i,
+                "ability_scores": {"str": 10 + i},
+                "speed": {"fly": 30 * i},
+                "resistances_and_immunities": {"damage_immunities": ["fire"]},
+                "notes": {f"layer_{i}": {"by": "dm", "rev": i}},
+            }
+            for i in range(count)
+        ]
+    return cache[count]
+
+
+@case("deep_merge.fold[2]")
+def deep_merge_fold_2(ctx: BenchContext) -> None:
+    base, overlays = _merge_inputs(ctx, 2)
+    for _ in range(_MERGE_CALLS):
+        functools.reduce(deep_merge, overlays, base)
+
+
+@case("deep_merge.deep_merge_all[2]")
+def deep_merge_all_2(ctx: BenchContext) -> None:
+    base, overlays = _merge_inputs(ctx, 2)
+    for _ in range(_MERGE_CALLS):
+        deep_merge_all(base, overlays)
+
+
+@case("deep_merge.fold[8]")
+def deep_merge_fold_8(ctx: BenchContext) -> None:
+    base, overlays = _merge_inputs(ctx, 8)
+    for _ in range(_MERGE_CALLS):
+        functools.reduce(deep_merge, overlays, base)
+
+
+@case("deep_merge.deep_merge_all[8]")
+def deep_merge_all_8(ctx: BenchContext) -> None:
+    base, overlays = _merge_inputs(ctx, 8)
+    for _ in range(_MERGE_CALLS):
+        deep_merge_all(base, overlays)
+
+
+@case("deep_merge.deep_merge_all[directives]")
+def deep_merge_all_directives(ctx: BenchContext) -> None:
+    base, overlays = _merge_inputs(ctx, 2)
+    layers: list[dict[str, Any]] = [
+        *overlays,
+        {
+            "actions": {"$merge": [
+                {"name": "Action 3", "desc": "rewritten"},
+                {"name": "Action 7", "$delete": True},
+                {"name": "Tail Sweep", "desc": "new"},
+            ]},
+            "traits": {"$append": [{"name": "Homebrew Aura"}]},
+            "hit_dice": {"$delete": True},
+        },
+    ]
+    for _ in range(_MERGE_CALLS):
+        deep_merge_all(base, layers)
+
+
+def _entity_row(ctx: BenchContext) -> RulesetEntity:
+    """A transient copy of the context creature carrying the 20-action blob."""
+    if "entity_row" not in ctx.extra:
+        entity = RulesetEntity.query.get(ctx.entity_id)
+        base, _ = _merge_inputs(ctx, 0)
+        ctx.extra["entity_row"] = RulesetEntity(
+            id=entity.id, ruleset_id=entity.ruleset_id, entity_type=entity.entity_type,
+            source_key=entity.source_key, name=entity.name,
+            document_key=entity.document_key, entity_data=json.dumps(base),
+        )
+    return ctx.extra["entity_row"]
+
+
+@contextlib.contextmanager
+def _provider(provider_class: type) -> Iterator[None]:
+    app = current_app._get_current_object()
+    previous = app.json
+    app.json = provider_class(app)
+    try:
+        yield
+    finally:
+        app.json = previous
+
+
+@case("json.entity_response[parsed]")
+def entity_response_parsed(ctx: BenchContext) -> None:
+    entity = _entity_row(ctx)
+    with _provider(StdlibJSONProvider):
+        for _ in range(_MERGE_CALLS):
+            jsonify({"entity": entity.to_dict(include_data=True)})
+
+
+@case("json.entity_response[raw]")
+def entity_response_raw(ctx: BenchContext) -> None:
+    entity = _entity_row(ctx)
+    with _provider(StdlibJSONProvider):
+        for _ in range(_MERGE_CALLS):
+            raw_jsonify({"entity": entity.to_dict(include_data=True, raw_data=True)})
+
+
+if orjson is not None:
+    @case("json.entity_response[orjson]")
+    def entity_response_orjson(ctx: BenchContext) -> None:
+        entity = _entity_row(ctx)
+        with _provider(OrjsonProvider):
+            for _ in range(_MERGE_CALLS):
+                jsonify({"entity": entity.to_dict(include_data=True)})
+
+
+@case("compression.entity_response[gzip]")
+def entity_response_gzip(ctx: BenchContext) -> None:
+    entity = _entity_row(ctx)
+    with current_app.test_request_context(headers={"Accept-Encoding": "gzip"}):
+        for _ in range(_MERGE_CALLS):
+            response = raw_jsonify({"entity": entity.to_dict(include_data=True, raw_data=True)})
+            compression.compress(response.get_data(), "gzip")
+
+
+@case("compression.entity_response[cached]")
+def entity_response_cached(ctx: BenchContext) -> None:
+    entity = _entity_row(ctx)
+    response_cache.clear()
+
+    def render() -> bytes:
+        return raw_dumps({"entity": entity.to_dict(include_data=True, raw_data=True)}).encode()
+
+    # The route reads this from the row (one indexed single-column lookup)
+    version = entity_content_hash(
+        entity.entity_type, entity.source_key, entity.name, entity.document_key,
+        entity.entity_data,
+    )
+    with current_app.test_request_context(headers={"Accept-Encoding": "gzip"}):
+        for _ in range(_MERGE_CALLS):
+            # Rendered and compressed on the first call only
+            versioned_response("entity", entity.id, version, render)
+
+
+@case("ruleset_service.get_sources")
+def get_sources(ctx: BenchContext) -> None:
+    ruleset_service.get_sources(ctx.ruleset_id, entity_type=ctx.entity_type)
+
+
+@case("campaign_service.list_campaigns")
+def list_campaigns(ctx: BenchContext) -> None:
+    campaign_service.list_campaigns(ctx.user_id)
+
+
+@case("character_service.list_all_characters")
+def list_all_characters(ctx: BenchContext) -> None:
+    character_service.list_all_characters(ctx.user_id)
+
+
+@case("character_service.list_character_summaries")
+def list_character_summaries(ctx: BenchContext) -> None:
+    character_service.list_character_summaries(ctx.user_id)
+
+
+@case("seed.seed_open5e[replay]", repeat=3)
+def seed_replay(ctx: BenchContext) -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        seed_open5e(ctx.extra["open5e_fetch"])
@@ -0,0 +1,151 @@
+"""Baseline storage and regression detection for benchmark results.
+
+Baselines are ordinary result files kept under ``benchmarks/baselines/`` and
+committed with the code they describe, so a diff shows when expectations
+changed and why.
+
+A tracked case counts as regressed only when both hold:
+
+- its median slowed by more than ``threshold`` (e.g. 0.25 = 25%), and
+- the interquartile ranges do not overlap (new Q1 > baseline Q3).
+
+The second test filters out noisy cases whose spread covers the change.
+Improvements use the mirror-image rule. A tracked case that is in the
+baseline but missing from the results also fails the gate, so deleting a
+slow case cannot hide its regression.
+
+Timings are only comparable on the same dataset, database and platform;
+compare_results refuses results whose meta differs from the baseline's.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Any
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+
+# Meta fields that must match for timings to be comparable
+COMPARABLE_META = ("dataset", "database", "platform")
+
+# Statuses that fail the gate
+FAILING = ("regressed", "missing")
+
+
+@dataclass
+class Comparison:
+    name: str
+    status: str  # ok, regressed, improved, new, missing (see FAILING)
+    base_median: float | None = None
+    new_median: float | None = None
+
+    @property
+    def ratio(self) -> float | None:
+        if not self.base_median or self.new_median is None:
+            return None
+        return self.new_median / self.base_median
+
+
+def baseline_path(name: str) -> str:
+    """Resolve a baseline name (or explicit .json path) to a file path."""
+    if name.endswith(".json"):
+        return name
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def load_results(path: str) -> dict[str, Any]:
+    """Load a results or baseline file, checking the schema version."""
+    with open(path) as f:
+        data = json.load(f)
+    if data.get("schema") != 1:
+        raise ValueError(f"{path}: unsupported benchmark schema {data.get('schema')!r}")
+    return data
+
+
+def save_baseline(results: dict[str, Any], name: str) -> str:
+    """Write results as a baseline file and return its path."""
+    path = baseline_path(name)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+    return path
+
+
+def _tracked(name: str, track: tuple[str, ...]) -> bool:
+    return not track or any(pattern in name for pattern in track)
+
+
+def check_comparable(baseline: dict[str, Any], current: dict[str, Any]) -> None:
+    """Raise ValueError if the two files were measured on different setups."""
+    base_meta = baseline.get("meta", {})
+    new_meta = current.get("meta", {})
+    diffs = [
+        f"{key}: baseline {base_meta.get(key)!r}, current {new_meta.get(key)!r}"
+        for key in COMPARABLE_META
+        if base_meta.get(key) != new_meta.get(key)
+    ]
+    if diffs:
+        raise ValueError(
+            "results are not comparable with the baseline ("
+            + "; ".join(diffs)
+            + "). Re-record the baseline on this setup."
+        )
+
+
+def compare_results(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    threshold: float,
+    track: tuple[str, ...] = (),
+) -> list[Comparison]:
+    """Compare current results against a baseline, case by case.
+
+    Args:
+        baseline: Loaded baseline file.
+        current: Loaded or freshly produced results.
+        threshold: Relative median slowdown tolerated before flagging.
+        track: Substrings selecting which cases to gate on (empty = all).
+
+    Returns:
+        One Comparison per tracked case found in either file.
+
+    Raises:
+        ValueError: If the dataset, database or platform differ (see
+            check_comparable).
+    """
+    check_comparable(baseline, current)
+    base_results = baseline["results"]
+    new_results = current["results"]
+    out = []
+    for name in sorted(set(base_results) | set(new_results)):
+        if not _tracked(name, track):
+            continue
+        base = base_results.get(name)
+        new = new_results.get(name)
+        if base is None:
+            out.append(Comparison(name, "new", new_median=new["median"]))
+            continue
+        if new is None:
+            out.append(Comparison(name, "missing", base_median=base["median"]))
+            continue
+
+        status = "ok"
+        if new["median"] > base["median"] * (1 + threshold) and new["q1"] > base["q3"]:
+            status = "regressed"
+        elif new["median"] < base["median"] / (1 + threshold) and new["q3"] < base["q1"]:
+            status = "improved"
+        out.append(Comparison(name, status, base["median"], new["median"]))
+    return out
+
+
+def format_report(comparisons: list[Comparison]) -> str:
+    """Render comparisons as a fixed-width text table."""
+    width = max((len(c.name) for c in comparisons), default=4)
+    lines = [f"{'case':<{width}}  {'base ms':>10}  {'new ms':>10}  {'ratio':>6}  status"]
+    for c in comparisons:
+        base = f"{c.base_median:.2f}" if c.base_median is not None else "-"
+        new = f"{c.new_median:.2f}" if c.new_median is not None else "-"
+        ratio = f"{c.ratio:.2f}x" if c.ratio is not None else "-"
+        lines.append(f"{c.name:<{width}}  {base:>10}  {new:>10}  {ratio:>6}  {c.status}")
+    return "\n".join(lines)
@@ -0,0 +1,124 @@
+"""Mixed read/write load — how the database setup holds up under concurrent writes.
+
+Reader threads browse the ruleset (entity list pages and entity detail)
+while writer threads update characters, all in-process through the Flask
+test client for a fixed duration. The report gives per-kind throughput,
+latency percentiles and failures; "database is locked" shows up as 500s
+on the default SQLite setup and should disappear with
+SQLITE_PROFILE=production.
+"""
+
+import random
+import threading
+import time
+from typing import Any, Callable
+
+from flask import Flask
+
+from benchmarks.replay import _latency_summary
+
+# (method, path, json body) -> status
+Request = Callable[[str, str, dict | None], int]
+
+
+def _client_request(app: Flask, token: str) -> Request:
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    def send(method: str, path: str, body: dict | None) -> int:
+        return client.open(path, method=method, json=body, headers=headers).status_code
+    return send
+
+
+def run_mixed(
+    app: Flask,
+    token: str,
+    ruleset_id: str,
+    entity_ids: list[str],
+    character_ids: list[str],
+    readers: int = 8,
+    writers: int = 2,
+    duration: float = 5.0,
+    seed: int = 1,
+) -> dict[str, Any]:
+    """Run readers and writers concurrently for ``duration`` seconds.
+
+    Each writer owns a disjoint slice of ``character_ids`` so optimistic
+    version checks do not turn the run into a conflict benchmark.
+
+    Returns:
+        Report dict with elapsed time and, per kind ("read", "write"),
+        request count, throughput, latency percentiles (ms), failures
+        (5xx or exceptions) and status counts.
+    """
+    if writers and len(character_ids) < writers:
+        raise ValueError(f"need at least {writers} characters, have {len(character_ids)}")
+    lock = threading.Lock()
+    stats: dict[str, dict[str, Any]] = {
+        kind: {"latencies": [], "statuses": {}, "failures": 0} for kind in ("read", "write")
+    }
+    deadline = time.perf_counter() + duration
+
+    def record(kind: str, status: str, elapsed_ms: float) -> None:
+        with lock:
+            entry = stats[kind]
+            entry["latencies"].append(elapsed_ms)
+            entry["statuses"][status] = entry["statuses"].get(status, 0) + 1
+            if status == "error" or status.startswith("5"):
+                entry["failures"] += 1
+
+    def loop(kind: str, next_request: Callable[[random.Random], tuple[str, str, dict | None]],
+             rng: random.Random) -> None:
+        send = _client_request(app, token)
+        while time.perf_counter() < deadline:
+            method, path, body = next_request(rng)
+            start = time.perf_counter()
+            try:
+                status = str(send(method, path, body))
+            except Exception:  # noqa: BLE001 — count it and keep the load going
+                status = "error"
+            record(kind, status, (time.perf_counter() - start) * 1000)
+
+    def read_request(rng: random.Random) -> tuple[str, str, dict | None]:
+        if rng.random() < 0.5:
+            page = rng.randint(1, 20)
+            return "GET", f"/api/rulesets/{ruleset_id}/entities?page={page}&per_page=50", None
+        return "GET", f"/api/rulesets/{ruleset_id}/entities/{rng.choice(entity_ids)}", None
+
+    def writer_request(owned: list[str]) -> Callable[[random.Random], tuple[str, str, dict]]:
+        def next_request(rng: random.Random) -> tuple[str, str, dict]:
+            return "PUT", f"/api/characters/{rng.choice(owned)}", {"level": rng.randint(1, 20)}
+        return next_request
+
+    threads = [
+        threading.Thread(target=loop, args=("read", read_request, random.Random(seed + i)))
+        for i in range(readers)
+    ] + [
+        threading.Thread(
+            target=loop,
+            args=("write", writer_request(character_ids[i::writers]), random.Random(-seed - i)),
+        )
+        for i in range(writers)
+    ]
+    began = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed_s = time.perf_counter() - began
+
+    report: dict[str, Any] = {
+        "readers": readers,
+        "writers": writers,
+        "elapsed_s": round(elapsed_s, 3),
+    }
+    for kind, entry in stats.items():
+        count = len(entry["latencies"])
+        report[kind] = {
+            "requests": count,
+            "throughput_rps": round(count / elapsed_s, 2) if elapsed_s else 0.0,
+            "failures": entry["failures"],
+            "latency_ms": _latency_summary(entry["latencies"]),
+            "status": dict(sorted(entry["statuses"].items())),
+        }
+    return report
@@ -0,0 +1,79 @@
+"""Timing primitives and the case registry."""
+
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from app.extensions import db
+
+
+@dataclass
+class BenchContext:
+    """Ids and objects from the generated dataset that cases operate on."""
+
+    ruleset_id: str
+    user_id: str
+    campaign_id: str
+    entity_id: str
+    source_key: str
+    entity_type: str
+    extra: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Case:
+    name: str
+    fn: Callable[[BenchContext], Any]
+    repeat: int | None = None  # overrides the run-wide repeat count
+
+
+CASES: list[Case] = []
+
+
+def case(name: str, repeat: int | None = None) -> Callable:
+    """Register a benchmark case. ``name`` is the stable id used in baselines."""
+    def decorator(fn: Callable[[BenchContext], Any]) -> Callable[[BenchContext], Any]:
+        CASES.append(Case(name, fn, repeat))
+        return fn
+    return decorator
+
+
+def measure(fn: Callable[[], Any], repeat: int, warmup: int) -> list[float]:
+    """Call ``fn`` warmup + repeat times and return the timed samples in ms.
+
+    The ORM session is cleared after every call so each sample pays for its
+    own queries instead of hitting the identity map.
+    """
+    samples: list[float] = []
+    for i in range(warmup + repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        db.session.remove()
+        if i >= warmup:
+            samples.append(elapsed)
+    return samples
+
+
+def summarize(samples: list[float]) -> dict[str, Any]:
+    """Summary statistics for one case's samples (all values in ms).
+
+    Quartiles use the inclusive method so they stay within the sample range
+    for small sample counts.
+    """
+    if len(samples) > 1:
+        q1, _, q3 = statistics.quantiles(samples, n=4, method="inclusive")
+    else:
+        q1 = q3 = samples[0]
+    return {
+        "unit": "ms",
+        "samples": [round(s, 4) for s in samples],
+        "median": round(statistics.median(samples), 4),
+        "mean": round(statistics.fmean(samples), 4),
+        "min": round(min(samples), 4),
+        "max": round(max(samples), 4),
+        "q1": round(q1, 4),
+        "q3": round(q3, 4),
+        "iqr": round(q3 - q1, 4),
+    }
@@ -0,0 +1,164 @@
+"""Query-plan checks for the indexed access paths (SQLite ``EXPLAIN QUERY PLAN``).
+
+Each plan case calls real service functions and captures the SQL they emit,
+so the check follows the code rather than a hand-copied query. A statement
+fails when SQLite plans a full table scan (``SCAN <table>`` without an
+index) of a tracked table.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models.ruleset import RulesetEntity
+from app.services import (
+    campaign_service,
+    character_service,
+    overlay_service,
+    ruleset_service,
+    stats_service,
+)
+from benchmarks.cases import materialized
+from benchmarks.harness import BenchContext
+
+# Tables whose full scans grow with users and content
+TRACKED_TABLES = ("user_overlays", "characters", "campaigns", "effective_entities")
+
+
+@dataclass
+class PlanCase:
+    name: str
+    fn: Callable[[BenchContext], Any]
+
+
+@dataclass
+class StatementPlan:
+    sql: str
+    plan: list[str]
+    full_scans: list[str] = field(default_factory=list)
+
+
+PLAN_CASES: list[PlanCase] = []
+
+
+def plan_case(name: str) -> Callable:
+    """Register a function as a plan case."""
+    def register(fn: Callable[[BenchContext], Any]) -> Callable:
+        PLAN_CASES.append(PlanCase(name, fn))
+        return fn
+    return register
+
+
+@plan_case("ruleset_service.apply_overlays")
+def _apply_overlays(ctx: BenchContext) -> None:
+    entity = db.session.get(RulesetEntity, ctx.entity_id)
+    ruleset_service.apply_overlays(entity, ctx.user_id, ctx.campaign_id)
+
+
+@plan_case("ruleset_service.apply_overlays[materialized]")
+def _apply_overlays_materialized(ctx: BenchContext) -> None:
+    entity = db.session.get(RulesetEntity, ctx.entity_id)
+    with materialized(ctx):
+        ruleset_service.apply_overlays(entity, ctx.user_id, ctx.campaign_id)
+
+
+@plan_case("ruleset_service.list_entities[campaign]")
+def _list_entities_campaign(ctx: BenchContext) -> None:
+    ruleset_service.list_entities(
+        ctx.ruleset_id, entity_type=ctx.entity_type,
+        user_id=ctx.user_id, campaign_id=ctx.campaign_id,
+    )
+
+
+@plan_case("overlay_service.list_overlays[ruleset]")
+def _list_overlays_ruleset(ctx: BenchContext) -> None:
+    overlay_service.list_overlays(ctx.user_id, ruleset_id=ctx.ruleset_id)
+
+
+@plan_case("overlay_service.list_overlays[campaign]")
+def _list_overlays_campaign(ctx: BenchContext) -> None:
+    overlay_service.list_overlays(ctx.user_id, campaign_id=ctx.campaign_id)
+
+
+@plan_case("overlay_service.list_overlays[campaign+type]")
+def _list_overlays_campaign_type(ctx: BenchContext) -> None:
+    overlay_service.list_overlays(
+        ctx.user_id, ruleset_id=ctx.ruleset_id, campaign_id=ctx.campaign_id,
+        entity_type=ctx.entity_type,
+    )
+
+
+@plan_case("campaign_service.list_campaigns")
+def _list_campaigns(ctx: BenchContext) -> None:
+    campaign_service.list_campaigns(ctx.user_id)
+
+
+@plan_case("campaign_service.get_dashboard")
+def _dashboard(ctx: BenchContext) -> None:
+    campaign_service.get_dashboard(ctx.campaign_id, ctx.user_id)
+
+
+@plan_case("character_service.list_by_campaign")
+def _list_by_campaign(ctx: BenchContext) -> None:
+    character_service.list_by_campaign(ctx.campaign_id, ctx.user_id)
+
+
+@plan_case("character_service.list_all_characters")
+def _list_all_characters(ctx: BenchContext) -> None:
+    character_service.list_all_characters(ctx.user_id)
+
+
+@plan_case("character_service.list_character_summaries")
+def _list_character_summaries(ctx: BenchContext) -> None:
+    character_service.list_character_summaries(ctx.user_id)
+
+
+@plan_case("stats_service.get_party_stats")
+def _party_stats(ctx: BenchContext) -> None:
+    stats_service.get_party_stats(ctx.campaign_id, ctx.user_id)
+
+
+def capture(fn: Callable[[], Any]) -> list[tuple[str, Any]]:
+    """Run fn and return the (sql, params) of every statement it executed."""
+    statements: list[tuple[str, Any]] = []
+
+    def record(conn: Any, cursor: Any, statement: str, parameters: Any, *_: Any) -> None:
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        fn()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+    return statements
+
+
+def explain(sql: str, params: Any) -> StatementPlan:
+    """EXPLAIN QUERY PLAN one statement and flag full scans of tracked tables."""
+    cursor = db.session.connection().connection.cursor()
+    try:
+        rows = cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    finally:
+        cursor.close()
+    plan = [row[-1] for row in rows]
+    scans = [
+        line for line in plan
+        if line.startswith("SCAN ") and " USING " not in line
+        and line.split()[1] in TRACKED_TABLES
+    ]
+    return StatementPlan(sql, plan, scans)
+
+
+def check_plans(ctx: BenchContext) -> dict[str, list[StatementPlan]]:
+    """Capture and explain every plan case's statements."""
+    if db.engine.dialect.name != "sqlite":
+        raise RuntimeError("Plan checks use SQLite's EXPLAIN QUERY PLAN")
+    results = {}
+    for case in PLAN_CASES:
+        statements = capture(lambda case=case: case.fn(ctx))
+        results[case.name] = [explain(sql, params) for sql, params in statements]
+        db.session.remove()
+    return results
@@ -0,0 +1,79 @@
+"""Recorded Open5e pages for benchmarking ``seed_open5e`` offline.
+
+A recording directory holds one ``<endpoint>.json`` file per entity endpoint
+(e.g. ``spells.json``), each a list of raw API pages exactly as Open5e
+returned them. ``record_pages`` captures them once (needs network);
+``write_synthetic_pages`` produces look-alike pages when no capture exists.
+"""
+
+import json
+import os
+import random
+from typing import Callable
+
+import click
+import requests
+
+from app.seed.open5e import ENTITY_CONFIGS, OPEN5E_BASE
+from app.seed.synthetic import _document, _entity_data, _name
+
+
+def _path(directory: str, endpoint: str) -> str:
+    return os.path.join(directory, f"{endpoint.strip('/')}.json")
+
+
+def record_pages(directory: str, limit: int = 100) -> None:
+    """Fetch every Open5e page used by the seed and save them to ``directory``."""
+    os.makedirs(directory, exist_ok=True)
+    for config in ENTITY_CONFIGS:
+        pages = []
+        url: str | None = f"{OPEN5E_BASE}{config['endpoint']}?format=json&limit={limit}"
+        while url:
+            click.echo(f"  Recording: {url}")
+            resp = requests.get(url, timeout=30)
+            resp.raise_for_status()
+            page = resp.json()
+            pages.append(page)
+            url = page.get("next")
+        with open(_path(directory, config["endpoint"]), "w") as f:
+            json.dump(pages, f)
+
+
+def write_synthetic_pages(directory: str, per_type: int, seed: int = 1) -> None:
+    """Write Open5e-shaped pages of synthetic items, 100 results per page."""
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    docs = [
+        _document("srd-2024", "System Reference Document 5.2", "Wizards of the Coast"),
+        _document("srd-2014", "System Reference Document 5.1", "Wizards of the Coast"),
+        _document("synth-doc-2", "Synthetic Compendium 2", "Publisher 2"),
+    ]
+    for config in ENTITY_CONFIGS:
+        items = []
+        for i in range(per_type):
+            doc = rng.choice(docs)
+            key = f"{doc['key']}_{config['type']}_{i}"
+            items.append(_entity_data(rng, config["type"], key, _name(rng, i), doc))
+        pages = [
+            {"count": per_type, "next": None, "results": items[start:start + 100]}
+            for start in range(0, per_type, 100)
+        ]
+        with open(_path(directory, config["endpoint"]), "w") as f:
+            json.dump(pages, f)
+
+
+def replay_fetcher(directory: str) -> Callable[[str], list[dict]]:
+    """Return a ``fetch`` callable for ``seed_open5e`` that reads recorded pages."""
+    cache: dict[str, list[dict]] = {}
+
+    def fetch(endpoint: str) -> list[dict]:
+        if endpoint not in cache:
+            path = _path(directory, endpoint)
+            if not os.path.exists(path):
+                cache[endpoint] = []
+            else:
+                with open(path) as f:
+                    cache[endpoint] = [r for page in json.load(f) for r in page["results"]]
+        return cache[endpoint]
+
+    return fetch
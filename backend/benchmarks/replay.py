@@ -0,0 +1,238 @@
+"""Replay captured access logs against the app to load-test with real traffic.
+
+Two input formats are accepted, detected per line:
+
+- Plain ``app.access`` log lines::
+
+    [2026-02-11 10:00:44] INFO app.access: GET /api/campaigns 200 25ms db=3q/2ms
+
+- NDJSON written by ``ACCESS_LOG_CAPTURE`` (adds query strings and
+  sub-second timestamps)::
+
+    {"ts": 1770804044.5, "method": "GET", "path": "/api/campaigns", "query": "", ...}
+
+Ids in paths and query strings are mapped onto the synthetic dataset by
+URL rule parameter name (``ruleset_id``, ``entity_id``, ``campaign_id`` ...),
+so the same production id always lands on the same synthetic row. Only GET
+requests are replayed — the log does not record request bodies.
+"""
+
+import json
+import re
+import statistics
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Iterable
+from urllib.parse import parse_qsl, urlencode
+
+from flask import Flask
+from werkzeug.exceptions import HTTPException
+
+_LINE_RE = re.compile(
+    r"^\[(?P<ts>\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)\] \w+ app\.access: "
+    r"(?P<method>[A-Z]+) (?P<path>\S+) (?P<status>\d{3}) "
+)
+
+Sender = Callable[[str, str, dict[str, str]], int]
+
+
+@dataclass
+class LogEntry:
+    ts: float | None
+    method: str
+    path: str
+    query: str = ""
+
+
+def parse_log(lines: Iterable[str]) -> list[LogEntry]:
+    """Parse plain or NDJSON access log lines, ignoring anything else."""
+    entries = []
+    for line in lines:
+        line = line.strip()
+        if line.startswith("{"):
+            try:
+                rec = json.loads(line)
+                entries.append(
+                    LogEntry(rec.get("ts"), rec["method"], rec["path"], rec.get("query", ""))
+                )
+            except (ValueError, KeyError):
+                continue
+            continue
+        m = _LINE_RE.match(line)
+        if m:
+            ts = datetime.strptime(m["ts"], "%Y-%m-%d %H:%M:%S").timestamp()
+            entries.append(LogEntry(ts, m["method"], m["path"]))
+    return entries
+
+
+class IdMapper:
+    """Rewrites ids in replayed URLs onto rows that exist in the target dataset.
+
+    Args:
+        app: Flask app whose URL map is used to recognise path parameters.
+        pools: Parameter name -> candidate ids in the target dataset.
+    """
+
+    def __init__(self, app: Flask, pools: dict[str, list[str]]) -> None:
+        self._adapter = app.url_map.bind("localhost")
+        self._pools = {k: v for k, v in pools.items() if v}
+
+    def _map(self, name: str, value: str) -> str:
+        pool = self._pools.get(name)
+        if not pool:
+            return value
+        return pool[zlib.crc32(value.encode()) % len(pool)]
+
+    def map(self, entry: LogEntry) -> tuple[str, dict[str, str]]:
+        """Return (path, query params) with ids replaced."""
+        path = entry.path
+        try:
+            endpoint, args = self._adapter.match(entry.path, method=entry.method)
+            mapped = {k: self._map(k, v) if isinstance(v, str) else v for k, v in args.items()}
+            path = self._adapter.build(endpoint, mapped, method=entry.method)
+        except HTTPException:
+            pass  # unknown route — replay verbatim, it 404s like the original
+        query = {k: self._map(k, v) for k, v in parse_qsl(entry.query)}
+        return path, query
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(q * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _latency_summary(values: list[float]) -> dict[str, float]:
+    values = sorted(values)
+    return {
+        "count": len(values),
+        "mean": round(statistics.fmean(values), 3) if values else 0.0,
+        "p50": round(_percentile(values, 0.50), 3),
+        "p95": round(_percentile(values, 0.95), 3),
+        "p99": round(_percentile(values, 0.99), 3),
+        "max": round(values[-1], 3) if values else 0.0,
+    }
+
+
+def replay(
+    entries: list[LogEntry],
+    mapper: IdMapper,
+    make_sender: Callable[[], Sender],
+    route_of: Callable[[str, str], str],
+    concurrency: int = 8,
+    speed: float = 0.0,
+) -> dict[str, Any]:
+    """Replay entries and report throughput and latency.
+
+    Args:
+        entries: Parsed log entries, in log order.
+        mapper: Id mapper for the target dataset.
+        make_sender: Factory for a per-thread ``send(method, path, query) -> status``.
+        route_of: Maps (method, path) to a route label for per-route stats.
+        concurrency: Worker threads issuing requests.
+        speed: Time multiplier for the original inter-arrival gaps (2.0 = twice
+            as fast). 0 replays back-to-back as fast as workers allow.
+
+    Returns:
+        Report dict with totals, throughput, overall and per-route latency
+        percentiles (ms) and status code counts.
+    """
+    local = threading.local()
+    lock = threading.Lock()
+    latencies: list[float] = []
+    by_route: dict[str, list[float]] = {}
+    statuses: dict[str, int] = {}
+    errors = 0
+
+    def work(method: str, path: str, query: dict[str, str]) -> None:
+        nonlocal errors
+        if not hasattr(local, "send"):
+            local.send = make_sender()
+        start = time.perf_counter()
+        try:
+            status = str(local.send(method, path, query))
+        except Exception:  # noqa: BLE001 — count transport failures, keep replaying
+            status = "error"
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            if status == "error":
+                errors += 1
+            latencies.append(elapsed)
+            by_route.setdefault(route_of(method, path), []).append(elapsed)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    reads = [e for e in entries if e.method == "GET"]
+    first_ts = next((e.ts for e in reads if e.ts is not None), None)
+    began = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for entry in reads:
+            if speed > 0 and first_ts is not None and entry.ts is not None:
+                due = began + (entry.ts - first_ts) / speed
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            path, query = mapper.map(entry)
+            pool.submit(work, entry.method, path, query)
+    elapsed_s = time.perf_counter() - began
+
+    return {
+        "requests": len(latencies),
+        "skipped_non_get": len(entries) - len(reads),
+        "errors": errors,
+        "concurrency": concurrency,
+        "speed": speed,
+        "elapsed_s": round(elapsed_s, 3),
+        "throughput_rps": round(len(latencies) / elapsed_s, 2) if elapsed_s else 0.0,
+        "latency_ms": _latency_summary(latencies),
+        "status": dict(sorted(statuses.items())),
+        "routes": {r: _latency_summary(v) for r, v in sorted(by_route.items())},
+    }
+
+
+def client_sender(app: Flask, token: str) -> Callable[[], Sender]:
+    """Sender factory that calls the app in-process through the Flask test client."""
+    headers = {"Authorization": f"Bearer {token}"}
+
+    def factory() -> Sender:
+        client = app.test_client()
+
+        def send(method: str, path: str, query: dict[str, str]) -> int:
+            response = client.open(path, method=method, query_string=query, headers=headers)
+            return response.status_code
+        return send
+    return factory
+
+
+def http_sender(base_url: str, token: str) -> Callable[[], Sender]:
+    """Sender factory that calls a running server over HTTP with keep-alive sessions."""
+    import requests
+
+    def factory() -> Sender:
+        session = requests.Session()
+        session.headers["Authorization"] = f"Bearer {token}"
+
+        def send(method: str, path: str, query: dict[str, str]) -> int:
+            url = f"{base_url.rstrip('/')}{path}"
+            if query:
+                url = f"{url}?{urlencode(query)}"
+            return session.request(method, url, timeout=60).status_code
+        return send
+    return factory
+
+
+def route_labeler(app: Flask) -> Callable[[str, str], str]:
+    """Map (method, path) to ``METHOD rule`` for per-route stats."""
+    adapter = app.url_map.bind("localhost")
+
+    def label(method: str, path: str) -> str:
+        try:
+            rule, _ = adapter.match(path, method=method, return_rule=True)
+            return f"{method} {rule.rule}"
+        except HTTPException:
+            return f"{method} <unmatched>"
+    return label
@@ -0,0 +1,152 @@
+"""Worker cold start — import-time profile and startup timings.
+
+Each measurement runs in a fresh interpreter, since a warm process has
+every module cached. Two reports:
+
+- ``import_profile`` runs the target under ``python -X importtime`` and
+  rolls the per-module self times up by top-level package. For each
+  package it names the first ``app.*`` module on the import chain, i.e.
+  the line of our code that pulled it in.
+- ``measure_startup`` times interpreter start to ``create_app()`` returning
+  and to the first response (``GET /api/health``), over several runs.
+"""
+
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Builds the app the way run.py does (no click context, as under gunicorn)
+CREATE_APP = "from app import create_app; create_app()"
+
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+_STARTUP_PROBE = """
+import json, time
+t0 = time.perf_counter()
+from app import create_app
+t1 = time.perf_counter()
+app = create_app()
+t2 = time.perf_counter()
+status = app.test_client().get("/api/health").status_code
+t3 = time.perf_counter()
+print(json.dumps({"import_ms": (t1 - t0) * 1000, "create_app_ms": (t2 - t1) * 1000,
+                  "first_request_ms": (t3 - t2) * 1000, "status": status}))
+"""
+
+
+@dataclass
+class ImportRow:
+    """One ``-X importtime`` line: times in microseconds, depth 0 = top level."""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> list[ImportRow]:
+    """Parse ``-X importtime`` output (children are listed before parents)."""
+    rows = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match:
+            rows.append(ImportRow(
+                module=match.group(4),
+                self_us=int(match.group(1)),
+                cumulative_us=int(match.group(2)),
+                depth=len(match.group(3)) // 2,
+            ))
+    return rows
+
+
+def _importer(rows: list[ImportRow], index: int) -> str | None:
+    """First app.* module above rows[index] on its import chain."""
+    depth = rows[index].depth
+    for row in rows[index + 1:]:
+        if row.depth < depth:
+            if row.module == "app" or row.module.startswith("app."):
+                return row.module
+            depth = row.depth
+    return None
+
+
+def summarize_imports(rows: list[ImportRow], top: int = 20) -> dict[str, Any]:
+    """Roll import self times up by top-level package.
+
+    Returns:
+        Dict with the total import time, module count, and the ``top``
+        packages by time, each with its module count and the app module
+        that first imported it (None for interpreter/site imports).
+    """
+    packages: dict[str, dict[str, Any]] = {}
+    for index, row in enumerate(rows):
+        name = row.module.split(".")[0]
+        entry = packages.setdefault(name, {"ms": 0.0, "modules": 0, "imported_by": None})
+        entry["ms"] += row.self_us / 1000
+        entry["modules"] += 1
+        if entry["imported_by"] is None and name != "app":
+            entry["imported_by"] = _importer(rows, index)
+    ranked = sorted(packages.items(), key=lambda item: item[1]["ms"], reverse=True)
+    return {
+        "total_ms": round(sum(row.self_us for row in rows) / 1000, 1),
+        "modules": len(rows),
+        "packages": [
+            {"package": name, "ms": round(entry["ms"], 1), "modules": entry["modules"],
+             "imported_by": entry["imported_by"]}
+            for name, entry in ranked[:top]
+        ],
+    }
+
+
+def _run(
+    code: str,
+    env: dict[str, str] | None,
+    importtime: bool = False,
+) -> subprocess.CompletedProcess:
+    args = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    return subprocess.run(
+        args, cwd=BACKEND_DIR, env={**os.environ, **(env or {})},
+        capture_output=True, text=True, check=True,
+    )
+
+
+def import_profile(code: str = CREATE_APP, env: dict[str, str] | None = None,
+                   top: int = 20) -> dict[str, Any]:
+    """Profile the imports of ``code`` in a fresh interpreter."""
+    result = _run(code, env, importtime=True)
+    return summarize_imports(parse_importtime(result.stderr), top)
+
+
+def measure_startup(repeat: int = 5, env: dict[str, str] | None = None) -> dict[str, Any]:
+    """Time app import, create_app() and the first request over ``repeat`` runs.
+
+    Returns:
+        Per phase (plus ``process_ms``, the wall time of the whole child
+        process including interpreter start), the median, min and max in ms.
+    """
+    samples: dict[str, list[float]] = {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = _run(_STARTUP_PROBE, env)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        timings = json.loads(result.stdout.strip().splitlines()[-1])
+        if timings.pop("status") != 200:
+            raise RuntimeError("GET /api/health did not return 200")
+        timings["process_ms"] = elapsed_ms
+        for phase, value in timings.items():
+            samples.setdefault(phase, []).append(value)
+    return {
+        phase: {
+            "median": round(statistics.median(values), 1),
+            "min": round(min(values), 1),
+            "max": round(max(values), 1),
+        }
+        for phase, values in samples.items()
+    }
@@ -1,3 +1,4 @@
+import json
 import os
 
 basedir = os.path.abspath(os.path.dirname(__file__))
@@ -19,8 +20,50 @@ class Config:
         JWT_ACCESS_TOKEN_EXPIRES  Access token lifetime in seconds (default: 900)
         JWT_REFRESH_TOKEN_EXPIRES Refresh token lifetime in seconds (default: 2592000)
         DATABASE_URL            SQLAlchemy DB URI (default: sqlite:///rpg.db)
+        SQLITE_PROFILE          "production" enables WAL, tuned pragmas and the read pool
+                                for SQLite files (default: unset)
+        SQLITE_CACHE_MB         Page cache per connection (default: 64)
+        SQLITE_MMAP_MB          Memory-mapped I/O size per connection (default: 256)
+        SQLITE_BUSY_TIMEOUT_MS  How long a writer waits for the lock (default: 5000)
+        SQLITE_READ_POOL_SIZE   Read-only connections for GET requests; 0 = off (default: 8)
+        DB_POOL_SIZE            Pooled connections per worker for PostgreSQL/MySQL (default: 5)
+        DB_MAX_OVERFLOW         Extra connections allowed past the pool under bursts (default: 10)
+        DB_POOL_TIMEOUT         Seconds to wait for a free pooled connection (default: 30)
+        DB_POOL_RECYCLE         Reopen connections older than this many seconds (default: 1800)
+        DATABASE_REPLICA_URL    Lagging read replica for browsing/list reads (default: unset)
+        REPLICA_STICKY_SECONDS  Primary-only reads for a user after a write (default: 10)
         MAX_CONTENT_LENGTH      Max request body in bytes (default: 2097152)
+        JSON_PROVIDER           auto (orjson if installed), orjson or default (default: auto)
+        COMPRESS_RESPONSES      gzip/br/zstd-compress JSON responses per
+                                Accept-Encoding (default: on)
+        COMPRESS_MIN_BYTES      Smallest body worth compressing (default: 1024)
+        RESPONSE_CACHE_MB       In-process budget for pre-compressed entity bodies (default: 64)
+        RESPONSE_CACHE_DIR      Shared dir of pre-compressed bodies, filled by `flask seed`
+                                and `flask warm-responses` (default: unset)
+        OPENAPI_SPEC_FILE       Spec rendered by `flask build-openapi`, served at
+                                /api/openapi.json (default: backend/openapi.json)
+        SWAGGER_UI              Mount the interactive API docs at /api/docs (default: off)
         LOG_LEVEL               Python log level name (default: INFO)
+        LOG_QUEUE_SIZE          Max log records buffered for the listener thread (default: 10000)
+        ACCESS_LOG_CAPTURE      File to append NDJSON access records to, for replay (default: off)
+        LOG_VIEWER              Serve the live log viewer (/api/logs) and feed it every
+                                record; 0 = off (default: on)
+        METRICS_DIR             Shared dir for merging per-worker metrics (default: unset)
+        METRICS_FLUSH_INTERVAL  Seconds between per-worker metrics snapshots (default: 5)
+        SQL_QUERY_BUDGET        Max SQL statements per request before a warning;
+                                0 = off (default: 25)
+        SQL_QUERY_BUDGETS       JSON map of endpoint -> budget overrides (default: {})
+        MATERIALIZE_OVERLAYS    Store overlay-merged entities per user/campaign; run
+                                `flask materialize-overlays` before enabling (default: off)
+        WEB_BIND                gunicorn listen address (default: 0.0.0.0:5000)
+        WEB_WORKERS             gunicorn worker processes (default: 2 x CPUs + 1, at most 8)
+        WEB_THREADS             Request threads per worker (default: 4)
+        WEB_MAX_REQUESTS        Recycle a worker after this many requests; 0 = never
+                                (default: 2000)
+        WEB_MAX_REQUESTS_JITTER Random extra requests so workers recycle apart (default: 200)
+        WEB_TIMEOUT             Kill a worker silent for this many seconds (default: 30)
+        WEB_GRACEFUL_TIMEOUT    Seconds a recycled worker gets to finish requests (default: 30)
+        WEB_KEEPALIVE           Seconds to hold an idle keep-alive connection (default: 5)
         SEED_USERNAME           Initial admin username (default: dm)
         SEED_PASSWORD           Initial admin password (default: dungeon_master_2025)
         SEED_EMAIL              Initial admin email (default: dm@rpg.local)
@@ -36,10 +79,52 @@ class Config:
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    SQLITE_PROFILE = os.environ.get("SQLITE_PROFILE", "")
+    SQLITE_CACHE_MB = float(os.environ.get("SQLITE_CACHE_MB", 64))
+    SQLITE_MMAP_MB = float(os.environ.get("SQLITE_MMAP_MB", 256))
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", 5000))
+    SQLITE_READ_POOL_SIZE = int(os.environ.get("SQLITE_READ_POOL_SIZE", 8))
+
+    DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", 1800))
+
+    DATABASE_REPLICA_URL = os.environ.get("DATABASE_REPLICA_URL", "")
+    REPLICA_STICKY_SECONDS = int(os.environ.get("REPLICA_STICKY_SECONDS", 10))
+
+    LOG_VIEWER = os.environ.get("LOG_VIEWER", "1").lower() in ("1", "true")
+
+    METRICS_DIR = os.environ.get("METRICS_DIR", "")
+    METRICS_FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL", 5))
+
+    SQL_QUERY_BUDGET = int(os.environ.get("SQL_QUERY_BUDGET", 25))
+    SQL_QUERY_BUDGETS = json.loads(os.environ.get("SQL_QUERY_BUDGETS", "{}"))
+
+    MATERIALIZE_OVERLAYS = os.environ.get("MATERIALIZE_OVERLAYS", "").lower() in ("1", "true")
+
+    # Production server (gunicorn.conf.py); read at server start, not by the app
+    WEB_BIND = os.environ.get("WEB_BIND", "0.0.0.0:5000")
+    WEB_WORKERS = int(os.environ.get("WEB_WORKERS", min(2 * (os.cpu_count() or 1) + 1, 8)))
+    WEB_THREADS = int(os.environ.get("WEB_THREADS", 4))
+    WEB_MAX_REQUESTS = int(os.environ.get("WEB_MAX_REQUESTS", 2000))
+    WEB_MAX_REQUESTS_JITTER = int(os.environ.get("WEB_MAX_REQUESTS_JITTER", 200))
+    WEB_TIMEOUT = int(os.environ.get("WEB_TIMEOUT", 30))
+    WEB_GRACEFUL_TIMEOUT = int(os.environ.get("WEB_GRACEFUL_TIMEOUT", 30))
+    WEB_KEEPALIVE = int(os.environ.get("WEB_KEEPALIVE", 5))
+
     SEED_USERNAME = os.environ.get("SEED_USERNAME", "dm")
     SEED_PASSWORD = os.environ.get("SEED_PASSWORD", "dungeon_master_2025")
     SEED_EMAIL = os.environ.get("SEED_EMAIL", "dm@rpg.local")
 
     MAX_CONTENT_LENGTH = int(os.environ.get("MAX_CONTENT_LENGTH", 2 * 1024 * 1024))
+    JSON_PROVIDER = os.environ.get("JSON_PROVIDER", "auto")
+
+    COMPRESS_RESPONSES = os.environ.get("COMPRESS_RESPONSES", "1").lower() in ("1", "true")
+    COMPRESS_MIN_BYTES = int(os.environ.get("COMPRESS_MIN_BYTES", 1024))
+    RESPONSE_CACHE_MB = float(os.environ.get("RESPONSE_CACHE_MB", 64))
+    RESPONSE_CACHE_DIR = os.environ.get("RESPONSE_CACHE_DIR", "")
 
+    OPENAPI_SPEC_FILE = os.environ.get("OPENAPI_SPEC_FILE", os.path.join(basedir, "openapi.json"))
+    SWAGGER_UI = os.environ.get("SWAGGER_UI", "").lower() in ("1", "true")
     SWAGGER = {"openapi": "3.0.3"}
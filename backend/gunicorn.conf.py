@@ -0,0 +1,107 @@
+"""Production server settings — ``gunicorn`` from ``backend/`` picks this up.
+
+Sizing and recycling come from Config (WEB_* environment variables), so
+every deployment launches the same way:
+
+    cd backend && gunicorn
+
+- Workers use threads (gthread). Flask views spend most of their time in
+  SQLite or the network, so threads per worker add throughput cheaply.
+- The app is preloaded in the master and workers are forked from it.
+  Imports and create_app() run once; a recycled worker starts in
+  milliseconds and shares the master's memory pages.
+- Workers are recycled after WEB_MAX_REQUESTS (plus jitter, so they do
+  not all restart at once). DrainingThreadWorker stops accepting and
+  serves every connection it already took before it exits.
+"""
+
+import gc
+import sys
+import time
+
+from gunicorn.workers.gthread import ThreadWorker
+
+from config import Config
+
+
+class DrainingThreadWorker(ThreadWorker):
+    """gthread worker whose max-requests recycling drops no connections.
+
+    The stock worker leaves its event loop as soon as the limit is hit and
+    closes connections it accepted but had not read yet; clients see an
+    empty reply. This one counts requests itself and, at the limit, stops
+    accepting and stops keep-alive, then exits once every accepted
+    connection is closed (or after graceful_timeout). The other workers
+    take new connections from the shared socket meanwhile.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.recycle_after = self.max_requests
+        self.max_requests = sys.maxsize  # disable the stock check
+        self.drain_deadline = None
+
+    def handle_request(self, req, conn):
+        keepalive = super().handle_request(req, conn)
+        if self.nr >= self.recycle_after and self.drain_deadline is None:
+            self.drain_deadline = time.monotonic() + self.cfg.graceful_timeout
+            self.log.info("Recycling worker after %d requests; draining.", self.nr)
+            self.max_keepalived = 0  # close every later response
+            with self._lock:
+                for sock in self.sockets:
+                    self.poller.unregister(sock)
+        return keepalive
+
+    def murder_keepalived(self):
+        super().murder_keepalived()  # runs once per event-loop turn
+        if self.drain_deadline is not None and (
+            self.nr_conns == 0 or time.monotonic() > self.drain_deadline
+        ):
+            self.alive = False
+
+wsgi_app = "run:app"
+
+bind = Config.WEB_BIND
+workers = Config.WEB_WORKERS
+threads = Config.WEB_THREADS
+worker_class = DrainingThreadWorker
+preload_app = True
+
+max_requests = Config.WEB_MAX_REQUESTS
+max_requests_jitter = Config.WEB_MAX_REQUESTS_JITTER
+timeout = Config.WEB_TIMEOUT
+graceful_timeout = Config.WEB_GRACEFUL_TIMEOUT
+keepalive = Config.WEB_KEEPALIVE
+
+# The app writes its own access log (app.access); skip gunicorn's
+accesslog = None
+errorlog = "-"
+
+
+def on_starting(server):
+    from app.utils.metrics import clear_snapshots
+
+    removed = clear_snapshots(Config.METRICS_DIR)
+    if removed:
+        server.log.info("Cleared %d stale metrics snapshots from %s", removed, Config.METRICS_DIR)
+
+
+def child_exit(server, worker):
+    # The worker's atexit flush is on disk; fold it so recycled workers
+    # leave one aggregate file instead of a snapshot each
+    from app.utils.metrics import fold_snapshots
+
+    fold_snapshots(Config.METRICS_DIR, worker.pid)
+
+
+def when_ready(server):
+    # Move everything built at startup out of the collector's reach: forked
+    # workers stop touching (and copying) those pages during collections,
+    # and exiting workers skip a full collection of them.
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    from app.utils.database import dispose_after_fork
+
+    dispose_after_fork(server.app.wsgi())
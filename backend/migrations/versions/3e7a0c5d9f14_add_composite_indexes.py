@@ -0,0 +1,42 @@
+"""add composite indexes for overlay and character access paths
+
+Revision ID: 3e7a0c5d9f14
+Revises: 9d4b2f61a8c3
+Create Date: 2026-10-19 12:10:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3e7a0c5d9f14'
+down_revision = '9d4b2f61a8c3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('campaigns', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_campaigns_user_id'), ['user_id'], unique=False)
+
+    with op.batch_alter_table('characters', schema=None) as batch_op:
+        batch_op.create_index('ix_characters_campaign_id_user_id',
+                              ['campaign_id', 'user_id'], unique=False)
+        batch_op.create_index('ix_characters_user_id_name_id',
+                              ['user_id', 'name', 'id'], unique=False)
+
+    with op.batch_alter_table('user_overlays', schema=None) as batch_op:
+        batch_op.create_index('ix_user_overlays_user_id_campaign_id_entity_type',
+                              ['user_id', 'campaign_id', 'entity_type'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('user_overlays', schema=None) as batch_op:
+        batch_op.drop_index('ix_user_overlays_user_id_campaign_id_entity_type')
+
+    with op.batch_alter_table('characters', schema=None) as batch_op:
+        batch_op.drop_index('ix_characters_user_id_name_id')
+        batch_op.drop_index('ix_characters_campaign_id_user_id')
+
+    with op.batch_alter_table('campaigns', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_campaigns_user_id'))
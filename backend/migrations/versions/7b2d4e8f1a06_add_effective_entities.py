@@ -0,0 +1,53 @@
+"""add materialized effective entities
+
+Revision ID: 7b2d4e8f1a06
+Revises: 3e7a0c5d9f14
+Create Date: 2026-10-19 14:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b2d4e8f1a06'
+down_revision = '3e7a0c5d9f14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('effective_entities',
+    sa.Column('id', sa.Text(), nullable=False),
+    sa.Column('user_id', sa.Text(), nullable=False),
+    sa.Column('entity_id', sa.Text(), nullable=False),
+    sa.Column('campaign_id', sa.Text(), nullable=True),
+    sa.Column('ruleset_id', sa.Text(), nullable=False),
+    sa.Column('entity_type', sa.String(length=50), nullable=False),
+    sa.Column('source_key', sa.String(length=200), nullable=False),
+    sa.Column('entity_data', sa.Text(), nullable=False),
+    sa.Column('is_disabled', sa.Boolean(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.id'], ),
+    sa.ForeignKeyConstraint(['entity_id'], ['ruleset_entities.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'entity_id', 'campaign_id', name='uq_effective_entity')
+    )
+    with op.batch_alter_table('effective_entities', schema=None) as batch_op:
+        batch_op.create_index('ix_effective_entities_overlay_key',
+                              ['ruleset_id', 'entity_type', 'source_key'], unique=False)
+
+    with op.batch_alter_table('user_overlays', schema=None) as batch_op:
+        batch_op.create_index('ix_user_overlays_entity',
+                              ['ruleset_id', 'entity_type', 'source_key'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('user_overlays', schema=None) as batch_op:
+        batch_op.drop_index('ix_user_overlays_entity')
+
+    with op.batch_alter_table('effective_entities', schema=None) as batch_op:
+        batch_op.drop_index('ix_effective_entities_overlay_key')
+
+    op.drop_table('effective_entities')
@@ -0,0 +1,28 @@
+"""add derived stats cache to characters
+
+Revision ID: 9d4b2f61a8c3
+Revises: 5c1e9a7d3b42
+Create Date: 2026-10-19 11:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4b2f61a8c3'
+down_revision = '5c1e9a7d3b42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('characters', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('derived_stats', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('derived_version', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('characters', schema=None) as batch_op:
+        batch_op.drop_column('derived_version')
+        batch_op.drop_column('derived_stats')
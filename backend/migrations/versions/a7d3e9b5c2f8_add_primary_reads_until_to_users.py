@@ -0,0 +1,29 @@
+"""add primary_reads_until to users
+
+Read-your-writes after a write is keyed on the user instead of a cookie,
+which bearer-token clients on another origin never send back.
+
+Revision ID: a7d3e9b5c2f8
+Revises: f2c6a8e4b1d7
+Create Date: 2026-10-19 19:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d3e9b5c2f8'
+down_revision = 'f2c6a8e4b1d7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('primary_reads_until', sa.Float(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('primary_reads_until')
@@ -0,0 +1,63 @@
+"""store JSON documents as jsonb on postgresql, with GIN and trigram indexes
+
+On SQLite the JSON columns stay TEXT and this revision does nothing.
+
+Revision ID: c4a8e2f07b19
+Revises: 7b2d4e8f1a06
+Create Date: 2026-10-19 15:40:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4a8e2f07b19'
+down_revision = '7b2d4e8f1a06'
+branch_labels = None
+depends_on = None
+
+JSON_COLUMNS = {
+    'rulesets': ['source_config', 'entity_types'],
+    'ruleset_entities': ['entity_data'],
+    'campaigns': ['settings'],
+    'characters': ['core_data', 'class_data', 'equipment', 'spells', 'derived_stats'],
+    'user_overlays': ['overlay_data'],
+    'effective_entities': ['entity_data'],
+}
+
+
+def _is_postgresql():
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def upgrade():
+    if not _is_postgresql():
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table, columns in JSON_COLUMNS.items():
+        for column in columns:
+            op.execute(
+                f'ALTER TABLE {table} ALTER COLUMN {column} TYPE jsonb USING {column}::jsonb'
+            )
+    # Containment filters (entity_data @> '{...}') on entity attributes
+    op.execute(
+        'CREATE INDEX ix_ruleset_entities_entity_data_gin '
+        'ON ruleset_entities USING gin (entity_data jsonb_path_ops)'
+    )
+    # ILIKE '%term%' name search
+    op.execute(
+        'CREATE INDEX ix_ruleset_entities_name_trgm '
+        'ON ruleset_entities USING gin (name gin_trgm_ops)'
+    )
+
+
+def downgrade():
+    if not _is_postgresql():
+        return
+    op.execute('DROP INDEX IF EXISTS ix_ruleset_entities_name_trgm')
+    op.execute('DROP INDEX IF EXISTS ix_ruleset_entities_entity_data_gin')
+    for table, columns in JSON_COLUMNS.items():
+        for column in columns:
+            op.execute(
+                f'ALTER TABLE {table} ALTER COLUMN {column} TYPE text USING {column}::text'
+            )
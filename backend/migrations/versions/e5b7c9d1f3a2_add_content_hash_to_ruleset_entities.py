@@ -0,0 +1,57 @@
+"""add content_hash to ruleset_entities
+
+Versions the cached base entity responses, so a cache hit needs neither
+the entity data nor a hash of the rendered body.
+
+Revision ID: e5b7c9d1f3a2
+Revises: c4a8e2f07b19
+Create Date: 2026-10-19 16:30:00.000000
+
+"""
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b7c9d1f3a2'
+down_revision = 'c4a8e2f07b19'
+branch_labels = None
+depends_on = None
+
+_BATCH = 1000
+
+
+def _content_hash(entity_type, source_key, name, document_key, entity_data):
+    # Same as app.models.ruleset.entity_content_hash at this revision
+    content = "\x1f".join(
+        (entity_type, source_key, name, document_key or "", entity_data or "{}")
+    )
+    return hashlib.blake2b(content.encode(), digest_size=12).hexdigest()
+
+
+def upgrade():
+    with op.batch_alter_table('ruleset_entities', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=24), nullable=True))
+
+    connection = op.get_bind()
+    rows = connection.execute(sa.text(
+        "SELECT id, entity_type, source_key, name, document_key, "
+        "CAST(entity_data AS TEXT) FROM ruleset_entities"
+    )).fetchall()
+    update = sa.text("UPDATE ruleset_entities SET content_hash = :h WHERE id = :id")
+    for start in range(0, len(rows), _BATCH):
+        connection.execute(update, [
+            {"id": row[0], "h": _content_hash(*row[1:])}
+            for row in rows[start:start + _BATCH]
+        ])
+
+    with op.batch_alter_table('ruleset_entities', schema=None) as batch_op:
+        batch_op.alter_column('content_hash', existing_type=sa.String(length=24),
+                              nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('ruleset_entities', schema=None) as batch_op:
+        batch_op.drop_column('content_hash')
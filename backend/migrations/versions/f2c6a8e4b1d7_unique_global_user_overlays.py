@@ -0,0 +1,44 @@
+"""make global user overlays unique
+
+uq_user_overlay_entity includes campaign_id, and NULLs never compare
+equal, so two global overlays on one entity were both accepted. Existing
+duplicates are collapsed to the most recently updated one first.
+
+Revision ID: f2c6a8e4b1d7
+Revises: e5b7c9d1f3a2
+Create Date: 2026-10-19 18:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c6a8e4b1d7'
+down_revision = 'e5b7c9d1f3a2'
+branch_labels = None
+depends_on = None
+
+_GLOBAL = sa.text('campaign_id IS NULL')
+
+
+def upgrade():
+    op.execute(
+        "DELETE FROM user_overlays WHERE campaign_id IS NULL AND EXISTS ("
+        " SELECT 1 FROM user_overlays AS newer"
+        " WHERE newer.campaign_id IS NULL"
+        " AND newer.user_id = user_overlays.user_id"
+        " AND newer.ruleset_id = user_overlays.ruleset_id"
+        " AND newer.entity_type = user_overlays.entity_type"
+        " AND newer.source_key = user_overlays.source_key"
+        " AND (newer.updated_at > user_overlays.updated_at"
+        " OR (newer.updated_at = user_overlays.updated_at"
+        " AND newer.id > user_overlays.id)))"
+    )
+    op.create_index('uq_user_overlay_entity_global', 'user_overlays',
+                    ['user_id', 'ruleset_id', 'entity_type', 'source_key'],
+                    unique=True, sqlite_where=_GLOBAL, postgresql_where=_GLOBAL)
+
+
+def downgrade():
+    op.drop_index('uq_user_overlay_entity_global', table_name='user_overlays')
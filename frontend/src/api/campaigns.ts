@@ -1,5 +1,6 @@
 import client from './client';
-import type { Campaign } from '../types';
+import type { Campaign, RulesetSource } from '../types';
+import type { CharacterSummary } from './characters';
 
 export async function listCampaigns() {
   const res = await client.get('/campaigns');
@@ -11,6 +12,32 @@ export async function getCampaign(id: string) {
   return res.data.campaign as Campaign;
 }
 
+export interface CampaignDashboard {
+  campaign: Campaign;
+  ruleset: {
+    id: string;
+    key: string;
+    name: string;
+    source_type: string;
+    entity_types: string[];
+    sources: RulesetSource[];
+  };
+  characters: CharacterSummary[];
+  next_cursor: string | null;
+  overlays: {
+    total: number;
+    campaign: Record<string, number>;
+    global: Record<string, number>;
+    by_entity_type: Record<string, number>;
+  };
+}
+
+/** Campaign page data (campaign, ruleset, characters, overlay counts) in one request. */
+export async function getCampaignDashboard(id: string) {
+  const res = await client.get(`/campaigns/${id}/dashboard`);
+  return res.data as CampaignDashboard;
+}
+
 export async function createCampaign(data: {
   ruleset_id: string;
   name: string;
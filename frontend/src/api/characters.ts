@@ -1,5 +1,5 @@
 import client from './client';
-import type { Character } from '../types';
+import type { Character, CharacterStats, RulesetEntity } from '../types';
 
 export interface CharacterWithCampaign extends Character {
   campaign_name: string;
@@ -10,11 +10,66 @@ export async function listAllCharacters() {
   return res.data.characters as CharacterWithCampaign[];
 }
 
+export interface CharacterSummary {
+  id: string;
+  name: string;
+  level: number;
+  character_type: 'pc' | 'npc';
+  version: number;
+  campaign_id: string;
+  campaign_name: string;
+  updated_at: string | null;
+  class_name: string | null;
+  hp_current: number | null;
+  hp_max: number | null;
+  ac: number | null;
+  species: string | null;
+}
+
+export interface CharacterSummaryPage {
+  characters: CharacterSummary[];
+  next_cursor: string | null;
+}
+
+export interface CharacterSummaryQuery {
+  campaign_id?: string;
+  sort?: 'name' | 'level' | 'updated_at' | 'campaign';
+  order?: 'asc' | 'desc';
+  limit?: number;
+  cursor?: string;
+}
+
+export async function listCharacterSummaries(query: CharacterSummaryQuery = {}) {
+  const res = await client.get('/characters/summaries', { params: query });
+  return res.data as CharacterSummaryPage;
+}
+
 export async function listCharacters(campaignId: string) {
   const res = await client.get(`/campaigns/${campaignId}/characters`);
   return res.data.characters as Character[];
 }
 
+export interface HydratedEntity extends RulesetEntity {
+  is_disabled: boolean;
+  has_overlay: boolean;
+}
+
+/** Character with side-load keys for each equipment and spell entry. */
+export interface HydratedCharacter extends Character {
+  hydrated: { equipment: (string | null)[]; spells: (string | null)[] };
+}
+
+/** Characters in a campaign with referenced items and spells side-loaded. */
+export async function listCharactersHydrated(campaignId: string) {
+  const res = await client.get(`/campaigns/${campaignId}/characters`, {
+    params: { hydrate: true },
+  });
+  return res.data as {
+    characters: HydratedCharacter[];
+    entities: Record<string, HydratedEntity>;
+  };
+}
+
 export async function getCharacter(id: string) {
   const res = await client.get(`/characters/${id}`);
   return res.data.character as Character;
@@ -33,6 +88,61 @@ export async function updateCharacter(id: string, data: Partial<Character>) {
   return res.data.character as Character;
 }
 
+export interface CharacterPatchResult {
+  id: string;
+  version: number;
+  updated_at: string | null;
+  changed: Record<string, unknown>;
+}
+
+/**
+ * Apply a JSON Merge Patch (RFC 7396): null removes a key, arrays replace.
+ * Pass the version the edit is based on to get a 412 instead of overwriting
+ * someone else's change.
+ */
+export async function patchCharacter(
+  id: string,
+  patch: Record<string, unknown>,
+  version?: number
+) {
+  const headers: Record<string, string> = {
+    'Content-Type': 'application/merge-patch+json',
+  };
+  if (version !== undefined) headers['If-Match'] = `"${version}"`;
+  const res = await client.patch(`/characters/${id}`, patch, { headers });
+  return res.data as CharacterPatchResult;
+}
+
+export interface CharacterStatsResult {
+  character_id: string;
+  version: number;
+  stats: CharacterStats;
+}
+
+export interface PartyMember {
+  id: string;
+  name: string;
+  character_type: 'pc' | 'npc';
+  level: number;
+  version: number;
+  hp_current: number | null;
+  hp_max: number | null;
+  stats: CharacterStats;
+}
+
+export async function getCharacterStats(id: string, refresh = false) {
+  const res = await client.get(`/characters/${id}/stats`, {
+    params: refresh ? { refresh: true } : undefined,
+  });
+  return res.data as CharacterStatsResult;
+}
+
+/** Party members with derived stats, sorted by initiative. */
+export async function getParty(campaignId: string) {
+  const res = await client.get(`/campaigns/${campaignId}/party`);
+  return res.data.party as PartyMember[];
+}
+
 export async function deleteCharacter(id: string) {
   await client.delete(`/characters/${id}`);
 }
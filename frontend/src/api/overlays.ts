@@ -33,3 +33,39 @@ export async function updateOverlay(
 export async function deleteOverlay(id: string) {
   await client.delete(`/overlays/${id}`);
 }
+
+export type OverlayInput = Pick<
+  Overlay,
+  'ruleset_id' | 'entity_type' | 'source_key' | 'overlay_type' | 'overlay_data'
+> & { campaign_id?: string | null };
+
+export interface OverlayBatchResult {
+  created: number;
+  updated: number;
+  deleted: number;
+  overlays: Overlay[];
+}
+
+export async function batchOverlays(data: { upsert?: OverlayInput[]; delete?: string[] }) {
+  const res = await client.post('/overlays/batch', data);
+  return res.data as OverlayBatchResult;
+}
+
+export async function exportOverlays(params?: {
+  ruleset_id?: string;
+  campaign_id?: string;
+  entity_type?: string;
+}) {
+  const res = await client.get('/overlays/export', { params });
+  return res.data as { overlays: OverlayInput[] };
+}
+
+export async function importOverlays(
+  overlays: OverlayInput[],
+  campaignId?: string | null
+) {
+  const body: { overlays: OverlayInput[]; campaign_id?: string | null } = { overlays };
+  if (campaignId !== undefined) body.campaign_id = campaignId;
+  const res = await client.post('/overlays/import', body);
+  return res.data as OverlayBatchResult;
+}
@@ -13,7 +13,14 @@ export async function getRuleset(id: string) {
 
 export async function listEntities(
   rulesetId: string,
-  params: { type?: string; search?: string; source?: string; page?: number; per_page?: number }
+  params: {
+    type?: string;
+    search?: string;
+    source?: string;
+    page?: number;
+    per_page?: number;
+    campaign_id?: string;
+  }
 ) {
   const res = await client.get(`/rulesets/${rulesetId}/entities`, { params });
   return res.data as PaginatedResponse<RulesetEntity>;
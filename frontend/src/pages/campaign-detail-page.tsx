@@ -3,24 +3,19 @@ import { useParams, Link, useNavigate } from 'react-router-dom';
 import { Plus, Trash2, Users } from 'lucide-react';
 import ConfirmDialog from '../components/confirm-dialog';
 import Spinner from '../components/spinner';
-import { getCampaign, deleteCampaign } from '../api/campaigns';
-import { listCharacters } from '../api/characters';
+import { getCampaignDashboard, deleteCampaign } from '../api/campaigns';
 import { useApiCache, invalidateCache } from '../hooks/use-api-cache';
-import type { Character } from '../types';
 
 export default function CampaignDetailPage() {
   const { id } = useParams<{ id: string }>();
   const navigate = useNavigate();
-  const { data: campaign, loading: loadingCampaign } = useApiCache(
-    getCampaign,
-    [id!],
-    { enabled: !!id },
-  );
-  const { data: characters, loading: loadingChars } = useApiCache<Character[]>(
-    listCharacters,
+  const { data: dashboard, loading } = useApiCache(
+    getCampaignDashboard,
     [id!],
     { enabled: !!id },
   );
+  const campaign = dashboard?.campaign;
+  const characters = dashboard?.characters;
 
   const [confirmOpen, setConfirmOpen] = useState(false);
 
@@ -28,10 +23,11 @@ export default function CampaignDetailPage() {
     if (!id) return;
     await deleteCampaign(id);
     invalidateCache('listCampaigns');
+    invalidateCache('getCampaignDashboard');
     navigate('/campaigns');
   }, [id, navigate]);
 
-  if (loadingCampaign || loadingChars) return <Spinner />;
+  if (loading) return <Spinner />;
   if (!campaign) return <div className="p-8 text-danger">Campaign not found</div>;
 
   return (
@@ -90,8 +86,7 @@ export default function CampaignDetailPage() {
               <div>
                 <span className="font-medium text-heading">{c.name}</span>
                 <span className="ml-3 text-sm text-muted">
-                  Level {c.level} {c.core_data?.species || ''}{' '}
-                  {c.class_data?.name ? String(c.class_data.name) : ''}
+                  Level {c.level} {c.species || ''} {c.class_name || ''}
                 </span>
               </div>
               <span className="text-xs text-muted uppercase">{c.character_type}</span>
@@ -101,6 +101,8 @@ export default function CharacterDetailPage() {
     });
     invalidateCache('getCharacter');
     invalidateCache('listCharacters');
+    invalidateCache('listCharacterSummaries');
+    invalidateCache('getCampaignDashboard');
     refetch();
     setEditing(false);
   };
@@ -116,6 +118,8 @@ export default function CharacterDetailPage() {
     await deleteCharacter(characterId);
     invalidateCache('listCharacters');
     invalidateCache('listAllCharacters');
+    invalidateCache('listCharacterSummaries');
+    invalidateCache('getCampaignDashboard');
     navigate(`/campaigns/${character?.campaign_id}`);
   }, [characterId, character?.campaign_id, navigate]);
 
@@ -1,26 +1,39 @@
+import { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import { Users } from 'lucide-react';
 import Spinner from '../components/spinner';
-import { listAllCharacters } from '../api/characters';
+import { listCharacterSummaries } from '../api/characters';
+import type { CharacterSummary } from '../api/characters';
 import { useApiCache } from '../hooks/use-api-cache';
 
+const PAGE_SIZE = 50;
+
 export default function CharactersPage() {
-  const { data: characters, loading } = useApiCache(listAllCharacters);
+  const [cursor, setCursor] = useState<string | undefined>(undefined);
+  const [characters, setCharacters] = useState<CharacterSummary[]>([]);
+  const { data: page, loading } = useApiCache(listCharacterSummaries, [
+    { limit: PAGE_SIZE, cursor },
+  ]);
+
+  useEffect(() => {
+    if (!page) return;
+    setCharacters((prev) => (cursor ? [...prev, ...page.characters] : page.characters));
+  }, [page, cursor]);
 
-  if (loading) return <Spinner />;
+  if (loading && characters.length === 0) return <Spinner />;
 
   return (
     <div className="p-4 sm:p-8 max-w-4xl">
       <h1 className="text-2xl font-bold text-heading mb-6">All Characters</h1>
 
-      {(characters ?? []).length === 0 ? (
+      {characters.length === 0 ? (
         <div className="text-center py-12 text-muted">
           <Users className="mx-auto mb-3 opacity-50" size={40} />
           <p>No characters yet. Create a campaign first, then add characters.</p>
         </div>
       ) : (
         <div className="space-y-2">
-          {(characters ?? []).map((c) => (
+          {characters.map((c) => (
             <Link
               key={c.id}
               to={`/characters/${c.id}`}
@@ -36,6 +49,16 @@ export default function CharactersPage() {
               </div>
             </Link>
           ))}
+          {page?.next_cursor && (
+            <button
+              type="button"
+              onClick={() => setCursor(page.next_cursor ?? undefined)}
+              disabled={loading}
+              className="w-full p-3 text-sm text-muted border border-edge rounded-lg hover:border-edge-hover transition-colors"
+            >
+              {loading ? 'Loading…' : 'Load more'}
+            </button>
+          )}
         </div>
       )}
     </div>
@@ -96,13 +96,13 @@ export default function NewCharacterPage() {
 
   const { data: speciesData } = useApiCache<PaginatedResponse<RulesetEntity>>(
     listEntities,
-    [campaign?.ruleset_id!, { type: 'species', per_page: 100 }],
+    [campaign?.ruleset_id!, { type: 'species', per_page: 100, campaign_id: campaignId }],
     { enabled: !!campaign?.ruleset_id },
   );
 
   const { data: classData } = useApiCache<PaginatedResponse<RulesetEntity>>(
     listEntities,
-    [campaign?.ruleset_id!, { type: 'class', per_page: 100 }],
+    [campaign?.ruleset_id!, { type: 'class', per_page: 100, campaign_id: campaignId }],
     { enabled: !!campaign?.ruleset_id },
   );
 
@@ -146,6 +146,8 @@ export default function NewCharacterPage() {
     });
     invalidateCache('listCharacters');
     invalidateCache('listAllCharacters');
+    invalidateCache('listCharacterSummaries');
+    invalidateCache('getCampaignDashboard');
     navigate(`/characters/${character.id}`);
   };
 
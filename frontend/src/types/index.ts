@@ -28,6 +28,8 @@ export interface RulesetEntity {
   name: string;
   document_key?: string;
   entity_data?: EntityData;
+  /** Homebrew-only entry (campaign listings); id is the overlay id */
+  homebrew?: boolean;
 }
 
 export interface RulesetSource {
@@ -75,6 +77,7 @@ export interface Character {
   name: string;
   character_type: 'pc' | 'npc';
   level: number;
+  version: number;
   core_data: CoreData;
   class_data: ClassData;
   equipment: EquipmentItem[];
@@ -104,6 +107,26 @@ export interface AbilityScores {
   cha: number;
 }
 
+/** Server-derived stats (GET /characters/:id/stats). */
+export interface CharacterStats {
+  ability_modifiers: AbilityScores;
+  proficiency_bonus: number;
+  saving_throws: AbilityScores;
+  armor_class: number;
+  initiative: number;
+  passive_perception: number;
+  speed: number;
+  hit_dice: string | null;
+  spellcasting: {
+    ability: keyof AbilityScores;
+    caster_type: 'full' | 'half' | 'pact';
+    save_dc: number;
+    attack_bonus: number;
+  } | null;
+  spell_slots: Record<string, number>;
+  pact_slots: { count: number; level: number } | null;
+}
+
 export interface Overlay {
   id: string;
   user_id: string;